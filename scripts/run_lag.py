@@ -7,6 +7,8 @@ Usage:
 """
 from __future__ import annotations
 
+import logging
+import os
 import sys
 from pathlib import Path
 
@@ -18,6 +20,12 @@ from src.strategies.lag.monitor import LagMonitor
 
 
 def main():
+    # Hot-path diagnostics go through logging; set LOG_LEVEL=DEBUG to see them.
+    logging.basicConfig(
+        level=os.environ.get("LOG_LEVEL", "INFO").upper(),
+        format="%(asctime)s [%(levelname)s] %(message)s",
+        datefmt="%H:%M:%S",
+    )
     config = load_config()
 
     if "--report" in sys.argv:
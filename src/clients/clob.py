@@ -4,9 +4,14 @@ Consolidates CLOB calls from rebalance_monitor.py (verify_opportunity, seed_best
 """
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable
+
 import httpx
 
+from src.clients.http import make_client
 from src.config import CLOBConfig
+from src.shared.json_utils import loads
 
 _DEFAULT_HEADERS = {"User-Agent": "Mozilla/5.0"}
 
@@ -14,6 +19,13 @@ _DEFAULT_HEADERS = {"User-Agent": "Mozilla/5.0"}
 class CLOBClient:
     def __init__(self, config: CLOBConfig | None = None):
         self.config = config or CLOBConfig()
+        self._client: httpx.Client | None = None
+
+    @property
+    def client(self) -> httpx.Client:
+        if self._client is None or self._client.is_closed:
+            self._client = make_client(self.config.timeout, headers=_DEFAULT_HEADERS)
+        return self._client
 
     def get_orderbook(self, token_id: str) -> dict:
         """Fetch the full orderbook for a token.
@@ -21,14 +33,12 @@ class CLOBClient:
         Returns:
             {"asks": [...], "bids": [...]}
         """
-        resp = httpx.get(
+        resp = self.client.get(
             f"{self.config.base_url}/book",
             params={"token_id": token_id},
-            timeout=self.config.timeout,
-            headers=_DEFAULT_HEADERS,
         )
         resp.raise_for_status()
-        return resp.json()
+        return loads(resp.content)
 
     def get_price(self, token_id: str, side: str = "sell") -> float | None:
         """Fetch the current price for a token.
@@ -41,14 +51,35 @@ class CLOBClient:
             Price as float, or None on failure.
         """
         try:
-            resp = httpx.get(
+            resp = self.client.get(
                 f"{self.config.base_url}/price",
                 params={"token_id": token_id, "side": side},
-                timeout=self.config.timeout,
-                headers=_DEFAULT_HEADERS,
             )
             resp.raise_for_status()
-            price = float(resp.json().get("price", 0))
+            price = float(loads(resp.content).get("price", 0))
             return price if price > 0 else None
         except Exception:
             return None
+
+    def get_prices(
+        self,
+        token_ids: Iterable[str],
+        side: str = "sell",
+        max_workers: int = 8,
+    ) -> dict[str, float | None]:
+        """Fetch prices for many tokens concurrently over the shared client.
+
+        Returns:
+            {token_id: price or None}, in input order.
+        """
+        token_ids = list(token_ids)
+        if len(token_ids) <= 1 or max_workers <= 1:
+            return {tid: self.get_price(tid, side) for tid in token_ids}
+        _ = self.client  # create the shared client before fanning out
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(token_ids))) as pool:
+            prices = pool.map(lambda tid: self.get_price(tid, side), token_ids)
+            return dict(zip(token_ids, prices))
+
+    def close(self) -> None:
+        if self._client and not self._client.is_closed:
+            self._client.close()
@@ -8,18 +8,28 @@ import time
 
 import httpx
 
+from src.clients.http import make_client
 from src.config import DataAPIConfig
+from src.shared.json_utils import loads
 
 
 class DataAPIClient:
     def __init__(self, config: DataAPIConfig | None = None):
         self.config = config or DataAPIConfig()
+        self._client: httpx.Client | None = None
+
+    @property
+    def client(self) -> httpx.Client:
+        if self._client is None or self._client.is_closed:
+            self._client = make_client(self.config.timeout)
+        return self._client
 
     def get_recent_activity(
         self,
         user_address: str,
         hours: int = 24,
         limit: int = 100,
+        since: int | None = None,
     ) -> list[dict]:
         """Fetch recent trade activity for a wallet address.
 
@@ -27,12 +37,16 @@ class DataAPIClient:
             user_address: Ethereum address
             hours: Lookback period in hours
             limit: Max results
+            since: Optional unix timestamp of the last trade already seen;
+                narrows the window (never beyond `hours`)
 
         Returns:
             List of trade activity records.
         """
         now_ts = int(time.time())
         start_ts = now_ts - hours * 3600
+        if since is not None:
+            start_ts = max(start_ts, since)
 
         params = {
             "user": user_address,
@@ -45,13 +59,16 @@ class DataAPIClient:
         }
 
         try:
-            resp = httpx.get(
+            resp = self.client.get(
                 f"{self.config.base_url}/activity",
                 params=params,
-                timeout=self.config.timeout,
             )
             resp.raise_for_status()
-            result = resp.json()
+            result = loads(resp.content)
             return result if isinstance(result, list) else []
         except Exception:
             return []
+
+    def close(self) -> None:
+        if self._client and not self._client.is_closed:
+            self._client.close()
@@ -4,13 +4,32 @@ Consolidates Gamma API calls from snapshot.py and rebalance_monitor.py.
 """
 from __future__ import annotations
 
-import json
 import time
-from typing import Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator
 
 import httpx
 
+from src.clients.http import make_client
 from src.config import GammaConfig
+from src.shared.json_utils import loads
+
+
+_MAX_RATE_LIMIT_WAIT = 60.0
+
+
+def _header_seconds(resp: httpx.Response, name: str, default: float) -> float:
+    """Seconds to wait from a Retry-After / X-RateLimit-Reset header.
+
+    Accepts a delay in seconds or an epoch timestamp; capped at one minute.
+    """
+    try:
+        value = float(resp.headers[name])
+    except (KeyError, ValueError):
+        return default
+    if value > 1e9:  # epoch seconds rather than a delay
+        value -= time.time()
+    return min(max(value, 0.0), _MAX_RATE_LIMIT_WAIT)
 
 
 class GammaClient:
@@ -21,7 +40,7 @@ class GammaClient:
     @property
     def client(self) -> httpx.Client:
         if self._client is None or self._client.is_closed:
-            self._client = httpx.Client(timeout=self.config.timeout)
+            self._client = make_client(self.config.timeout)
         return self._client
 
     def get_event_by_slug(self, slug: str) -> list[dict]:
@@ -35,47 +54,119 @@ class GammaClient:
                 params={"slug": slug},
             )
             resp.raise_for_status()
-            return resp.json()
+            return loads(resp.content)
         except Exception:
             return []
 
+    def get_events_by_slugs(self, slugs: list[str]) -> dict[str, dict]:
+        """Fetch many events with repeated ?slug= params, chunked by slug_batch_size.
+
+        Multiple chunks are fetched concurrently over the shared client.
+
+        Returns:
+            {event_slug: event} for the events Gamma returned. Slugs from a
+            chunk whose request failed map to None, so callers can tell a
+            failed lookup (retry soon) from an event Gamma doesn't have
+            (missing from the result).
+        """
+        batch_size = self.config.slug_batch_size
+        batches = [slugs[i : i + batch_size] for i in range(0, len(slugs), batch_size)]
+        if len(batches) > 1:
+            workers = min(len(batches), self.config.max_workers)
+            _ = self.client  # create the shared client before fanning out
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                responses = list(pool.map(self._fetch_slug_batch, batches))
+        else:
+            responses = [self._fetch_slug_batch(b) for b in batches]
+
+        result: dict[str, dict | None] = {}
+        for batch, events in zip(batches, responses):
+            if events is None:
+                result.update(dict.fromkeys(batch))
+                continue
+            for event in events:
+                slug = event.get("slug")
+                if slug and slug not in result:
+                    result[slug] = event
+        return result
+
+    def _fetch_slug_batch(self, slugs: list[str]) -> list[dict] | None:
+        """One multi-slug /events request; None if it failed or the body
+        isn't an event list (e.g. an {"error": ...} object)."""
+        try:
+            resp = self.client.get(
+                f"{self.config.base_url}/events",
+                params=[("slug", s) for s in slugs],
+            )
+            resp.raise_for_status()
+            result = loads(resp.content)
+            return result if isinstance(result, list) else None
+        except Exception:
+            return None
+
     def get_all_active_events(self) -> list[dict]:
         """Fetch all active events with pagination.
 
         Used by rebalance monitor to discover negativeRisk events.
         """
-        all_events: list[dict] = []
-        offset = 0
-
-        while True:
-            params = {
-                "closed": "false",
-                "active": "true",
-                "limit": self.config.fetch_limit,
-                "offset": offset,
-            }
-            try:
-                resp = self.client.get(
-                    f"{self.config.base_url}/events",
-                    params=params,
-                )
-                resp.raise_for_status()
-                events = resp.json()
-            except Exception:
-                break
+        return list(self.iter_active_events())
 
-            if not events:
-                break
+    def iter_active_events(self) -> Iterator[dict]:
+        """Yield active events page by page, fetching the next page in the
+        background while the caller processes the current one.
 
-            all_events.extend(events)
+        Pages are requested back to back; the server's rate-limit signals
+        decide when to pause (see _get_paced).
+        """
+        limit = self.config.fetch_limit
+        _ = self.client  # create the shared client before handing it to the worker
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            future = pool.submit(self._fetch_events_page, 0)
+            offset = 0
+            while True:
+                events = future.result()
+                if not events:
+                    return
+                if len(events) < limit:
+                    yield from events
+                    return
+                offset += limit
+                future = pool.submit(self._fetch_events_page, offset)
+                yield from events
+
+    def _fetch_events_page(self, offset: int) -> list[dict]:
+        params = {
+            "closed": "false",
+            "active": "true",
+            "limit": self.config.fetch_limit,
+            "offset": offset,
+        }
+        try:
+            resp = self._get_paced(f"{self.config.base_url}/events", params)
+            resp.raise_for_status()
+            return loads(resp.content)
+        except Exception:
+            return []
 
-            if len(events) < self.config.fetch_limit:
-                break
+    def _get_paced(self, url: str, params: dict) -> httpx.Response:
+        """GET that only waits when the server asks for it.
 
-            offset += self.config.fetch_limit
-            time.sleep(self.config.fetch_delay)
+        A 429 is retried after Retry-After (or fetch_delay if absent), up to
+        rate_limit_retries times. When X-RateLimit-Remaining runs out, sleeps
+        until X-RateLimit-Reset before returning so the next call goes through.
+        """
+        for _ in range(self.config.rate_limit_retries):
+            resp = self.client.get(url, params=params)
+            if resp.status_code != 429:
+                break
+            time.sleep(_header_seconds(resp, "Retry-After", self.config.fetch_delay))
+        else:
+            resp = self.client.get(url, params=params)
 
-        return all_events
+        remaining = resp.headers.get("X-RateLimit-Remaining")
+        if remaining is not None and remaining.isdigit() and int(remaining) == 0:
+            time.sleep(_header_seconds(resp, "X-RateLimit-Reset", self.config.fetch_delay))
+        return resp
 
     def get_market_tokens(
         self,
@@ -91,11 +182,34 @@ class GammaClient:
         Returns:
             List of {"token_id", "market_type", "outcome", "market_slug"}
         """
-        events = self.get_event_by_slug(slug)
-        if not events:
-            return []
+        return self.get_market_tokens_many([slug], classify_fn).get(slug, [])
+
+    def get_market_tokens_many(
+        self,
+        slugs: list[str],
+        classify_fn=None,
+    ) -> dict[str, list[dict]]:
+        """Batch version of get_market_tokens: {event_slug: tokens}.
+
+        Every slug Gamma answered for is in the result, mapped to an empty
+        list when the event is unknown or all its markets are closed. Slugs
+        whose lookup failed are left out.
+
+        Not cached: callers poll to notice markets closing, so each call
+        needs Gamma's current view.
+        """
+        events = self.get_events_by_slugs(slugs)
+        result: dict[str, list[dict]] = {}
+        for slug in slugs:
+            if slug not in events:
+                result[slug] = []
+                continue
+            event = events[slug]
+            if event is not None:
+                result[slug] = self._extract_market_tokens(event, classify_fn)
+        return result
 
-        event = events[0]
+    def _extract_market_tokens(self, event: dict, classify_fn=None) -> list[dict]:
         tokens: list[dict] = []
 
         for m in event.get("markets", []):
@@ -114,13 +228,13 @@ class GammaClient:
 
             clob_token_ids = m.get("clobTokenIds")
             if isinstance(clob_token_ids, str):
-                clob_token_ids = json.loads(clob_token_ids)
+                clob_token_ids = loads(clob_token_ids)
             if not clob_token_ids:
                 continue
 
             outcomes = m.get("outcomes", [])
             if isinstance(outcomes, str):
-                outcomes = json.loads(outcomes)
+                outcomes = loads(outcomes)
 
             for i, token_id in enumerate(clob_token_ids):
                 outcome = outcomes[i] if i < len(outcomes) else f"outcome_{i}"
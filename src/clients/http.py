@@ -0,0 +1,21 @@
+"""Shared httpx client construction for the REST API clients."""
+from __future__ import annotations
+
+import importlib.util
+
+import httpx
+
+# HTTP/2 needs the optional h2 package (pip install "httpx[http2]").
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+_LIMITS = httpx.Limits(max_keepalive_connections=20, keepalive_expiry=60)
+
+
+def make_client(timeout: float, headers: dict[str, str] | None = None) -> httpx.Client:
+    """Create a pooled keep-alive client, using HTTP/2 when h2 is installed."""
+    return httpx.Client(
+        timeout=timeout,
+        headers=headers,
+        http2=HTTP2_AVAILABLE,
+        limits=_LIMITS,
+    )
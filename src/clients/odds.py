@@ -6,12 +6,21 @@ from __future__ import annotations
 
 import httpx
 
+from src.clients.http import make_client
 from src.config import OddsAPIConfig
+from src.shared.json_utils import loads
 
 
 class OddsClient:
     def __init__(self, config: OddsAPIConfig):
         self.config = config
+        self._client: httpx.Client | None = None
+
+    @property
+    def client(self) -> httpx.Client:
+        if self._client is None or self._client.is_closed:
+            self._client = make_client(self.config.timeout)
+        return self._client
 
     def get_odds(
         self,
@@ -33,7 +42,7 @@ class OddsClient:
             "bookmakers": self.config.bookmaker,
             "oddsFormat": "decimal",
         }
-        resp = httpx.get(url, params=params, timeout=self.config.timeout)
+        resp = self.client.get(url, params=params)
         resp.raise_for_status()
 
         credits = {
@@ -41,7 +50,7 @@ class OddsClient:
             "remaining": resp.headers.get("x-requests-remaining", "?"),
         }
 
-        return resp.json(), credits
+        return loads(resp.content), credits
 
     def get_event_odds(
         self,
@@ -68,7 +77,7 @@ class OddsClient:
             "bookmakers": self.config.bookmaker,
             "oddsFormat": "decimal",
         }
-        resp = httpx.get(url, params=params, timeout=self.config.timeout)
+        resp = self.client.get(url, params=params)
         resp.raise_for_status()
 
         credits = {
@@ -76,4 +85,8 @@ class OddsClient:
             "remaining": resp.headers.get("x-requests-remaining", "?"),
         }
 
-        return resp.json(), credits
+        return loads(resp.content), credits
+
+    def close(self) -> None:
+        if self._client and not self._client.is_closed:
+            self._client.close()
@@ -10,11 +10,15 @@ Supports all observed message formats:
 """
 from __future__ import annotations
 
-import json
+import bisect
+import queue
+import socket
 import threading
 import time
+from array import array
 from collections import defaultdict
-from typing import Any, Callable, Dict, List, Optional
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Set
 
 try:
     import websocket
@@ -22,6 +26,20 @@ except ImportError:
     raise ImportError("websocket-client required: pip install websocket-client")
 
 from src.config import WebSocketConfig
+from src.shared.json_utils import dumps, loads
+
+
+@dataclass(slots=True)
+class WSStats:
+    """Live PolyWebSocket counters (attribute access, no per-read copy)."""
+    messages_received: int = 0
+    price_updates: int = 0
+    book_updates: int = 0
+    reconnects: int = 0
+    errors: int = 0
+    parse_errors: int = 0
+    dropped_messages: int = 0
+    last_message_time: Optional[float] = None
 
 
 class PolyWebSocket:
@@ -35,6 +53,9 @@ class PolyWebSocket:
         ws.run_forever(background=True)
     """
 
+    # Seconds an idle dispatch worker waits before re-checking for stop().
+    _DISPATCH_POLL = 0.5
+
     def __init__(self, config: WebSocketConfig | None = None):
         self.config = config or WebSocketConfig()
         self.ws: Optional[websocket.WebSocketApp] = None
@@ -44,8 +65,8 @@ class PolyWebSocket:
         self._reconnect_delay = self.config.reconnect_initial
 
         # Subscription management
-        self._subscribed_assets: List[str] = []
-        self._pending_subscribe: List[str] = []
+        self._subscribed_assets: Set[str] = set()
+        self._pending_subscribe: Set[str] = set()
 
         # Callbacks
         self._price_callbacks: List[Callable[[str, Dict], None]] = []
@@ -56,19 +77,24 @@ class PolyWebSocket:
 
         # Price cache (asset_id -> last_price)
         self._price_cache: Dict[str, float] = {}
+        # Raw price strings last seen per asset, to skip re-parsing duplicates
+        self._raw_price: Dict[str, str] = {}
 
         # Stats
-        self._stats = {
-            "messages_received": 0,
-            "price_updates": 0,
-            "book_updates": 0,
-            "reconnects": 0,
-            "errors": 0,
-            "parse_errors": 0,
-            "last_message_time": None,
-        }
+        self._stats = WSStats()
 
         self._lock = threading.Lock()
+        # Set by stop(); wakes the reconnect backoff immediately and tells
+        # the dispatch worker to exit once the queue is drained
+        self._stop_event = threading.Event()
+
+        # Raw frames handed from the reader thread to the dispatch worker, so
+        # slow callbacks don't stall socket reads. None = dispatch inline.
+        self._rx_queue: Optional[queue.Queue] = (
+            queue.Queue(maxsize=self.config.dispatch_queue_size)
+            if self.config.dispatch_queue_size > 0 else None
+        )
+        self._worker: Optional[threading.Thread] = None
 
     # ── Callback registration ─────────────────────────────
 
@@ -99,15 +125,19 @@ class PolyWebSocket:
     def subscribe(self, asset_ids: List[str]) -> None:
         """Subscribe to market data for given token IDs."""
         with self._lock:
-            new_assets = [a for a in asset_ids if a not in self._subscribed_assets]
+            subscribed, pending = self._subscribed_assets, self._pending_subscribe
+            new_assets = [
+                a for a in dict.fromkeys(asset_ids)
+                if a not in subscribed and a not in pending
+            ]
             if not new_assets:
                 return
 
             if self._connected and self.ws:
                 self._send_subscribe(new_assets)
-                self._subscribed_assets.extend(new_assets)
+                self._subscribed_assets.update(new_assets)
             else:
-                self._pending_subscribe.extend(new_assets)
+                self._pending_subscribe.update(new_assets)
 
     def unsubscribe(self, asset_ids: List[str]) -> None:
         """Unsubscribe from market data."""
@@ -115,30 +145,56 @@ class PolyWebSocket:
             if self._connected and self.ws:
                 msg = {"type": "unsubscribe", "channel": "market", "assets_ids": asset_ids}
                 try:
-                    self.ws.send(json.dumps(msg))
+                    self.ws.send(dumps(msg))
                 except Exception:
                     pass
-            for a in asset_ids:
-                if a in self._subscribed_assets:
-                    self._subscribed_assets.remove(a)
+            self._subscribed_assets.difference_update(asset_ids)
+            self._pending_subscribe.difference_update(asset_ids)
+
+    def refresh_subscriptions(self, asset_ids: Set[str]) -> tuple[List[str], List[str]]:
+        """Make the subscription set equal asset_ids, sending only the delta.
+
+        Returns:
+            (added, removed) asset IDs; both empty when nothing changed, in
+            which case no frame is sent.
+        """
+        with self._lock:
+            current = self._subscribed_assets | self._pending_subscribe
+            added = [a for a in asset_ids if a not in current]
+            removed = [a for a in current if a not in asset_ids]
+        if added:
+            self.subscribe(added)
+        if removed:
+            self.unsubscribe(removed)
+        return added, removed
 
     def _send_subscribe(self, asset_ids: List[str]) -> None:
-        """Send subscription in batches."""
+        """Send one subscription frame, halving it only if it exceeds subscribe_max_bytes."""
         if not asset_ids:
             return
-        batch_size = self.config.subscribe_batch_size
-        for i in range(0, len(asset_ids), batch_size):
-            batch = asset_ids[i : i + batch_size]
-            msg = json.dumps({"type": "market", "assets_ids": batch})
-            try:
-                self.ws.send(msg)
-            except Exception as e:
-                self._handle_error(e)
+        msg = dumps({"type": "market", "assets_ids": asset_ids})
+        if len(msg) > self.config.subscribe_max_bytes and len(asset_ids) > 1:
+            mid = len(asset_ids) // 2
+            self._send_subscribe(asset_ids[:mid])
+            self._send_subscribe(asset_ids[mid:])
+            return
+        try:
+            self.ws.send(msg)
+        except Exception as e:
+            self._handle_error(e)
 
     # ── Lifecycle ─────────────────────────────────────────
 
     def run_forever(self, background: bool = True) -> None:
+        if self._worker is not None and self._stop_event.is_set():
+            # A stopped worker drains what is queued, then exits; wait for
+            # it so clearing the stop event below can't keep it alive.
+            self._worker.join()
         self._running = True
+        self._stop_event.clear()
+        if self._rx_queue is not None and not (self._worker and self._worker.is_alive()):
+            self._worker = threading.Thread(target=self._dispatch_loop, daemon=True)
+            self._worker.start()
         if background:
             self._thread = threading.Thread(target=self._run_loop, daemon=True)
             self._thread.start()
@@ -147,6 +203,7 @@ class PolyWebSocket:
 
     def stop(self) -> None:
         self._running = False
+        self._stop_event.set()
         if self.ws:
             try:
                 self.ws.close()
@@ -156,8 +213,12 @@ class PolyWebSocket:
     def is_connected(self) -> bool:
         return self._connected
 
-    def get_stats(self) -> Dict[str, Any]:
-        return dict(self._stats)
+    def queue_depth(self) -> int:
+        return self._rx_queue.qsize() if self._rx_queue is not None else 0
+
+    def get_stats(self) -> WSStats:
+        """Return the live counters; read fields directly, don't hold for snapshots."""
+        return self._stats
 
     def get_cached_price(self, asset_id: str) -> Optional[float]:
         return self._price_cache.get(asset_id)
@@ -174,12 +235,13 @@ class PolyWebSocket:
             if not self._running:
                 break
 
-            time.sleep(self._reconnect_delay)
+            if self._stop_event.wait(self._reconnect_delay):
+                break
             self._reconnect_delay = min(
                 self._reconnect_delay * self.config.reconnect_multiplier,
                 self.config.reconnect_max,
             )
-            self._stats["reconnects"] += 1
+            self._stats.reconnects += 1
 
     def _connect(self) -> None:
         self.ws = websocket.WebSocketApp(
@@ -189,9 +251,17 @@ class PolyWebSocket:
             on_error=self._on_error,
             on_close=self._on_close,
         )
+        # Options are applied before connect (websocket-client already sets
+        # TCP_NODELAY). Frames are JSON-decoded anyway, so skip the separate
+        # UTF-8 validation pass.
+        sockopt = []
+        if self.config.recv_buffer_bytes > 0:
+            sockopt.append((socket.SOL_SOCKET, socket.SO_RCVBUF, self.config.recv_buffer_bytes))
         self.ws.run_forever(
+            sockopt=sockopt,
             ping_interval=self.config.ping_interval,
             ping_timeout=self.config.ping_timeout,
+            skip_utf8_validation=True,
         )
 
     # ── WebSocket handlers ────────────────────────────────
@@ -201,26 +271,56 @@ class PolyWebSocket:
         self._reconnect_delay = self.config.reconnect_initial
 
         with self._lock:
-            if self._pending_subscribe:
-                self._send_subscribe(self._pending_subscribe)
-                self._subscribed_assets.extend(self._pending_subscribe)
-                self._pending_subscribe = []
-            if self._subscribed_assets:
-                self._send_subscribe(self._subscribed_assets)
-
-        for cb in self._connect_callbacks:
-            try:
-                cb()
-            except Exception:
-                pass
+            # Re-subscribe everything (previous + pending) in one pass.
+            self._subscribed_assets |= self._pending_subscribe
+            self._pending_subscribe.clear()
+            self._send_subscribe(list(self._subscribed_assets))
+
+        self._dispatch(self._connect_callbacks)
 
     def _on_message(self, ws, message: str) -> None:
-        self._stats["messages_received"] += 1
-        self._stats["last_message_time"] = time.time()
+        self._stats.messages_received += 1
+        self._stats.last_message_time = time.time()
+        if self._rx_queue is None:
+            self._process_message(message)
+        else:
+            self._enqueue(message)
+
+    def _enqueue(self, message: str) -> None:
+        """Queue a frame for the dispatch worker, dropping the oldest when full."""
+        q = self._rx_queue
+        while True:
+            try:
+                q.put_nowait(message)
+                return
+            except queue.Full:
+                try:
+                    q.get_nowait()
+                    self._stats.dropped_messages += 1
+                except queue.Empty:
+                    pass
+
+    def _dispatch_loop(self) -> None:
+        """Process queued frames until stop() and the queue is drained.
+
+        Waits in short slices so a stop is noticed while idle; after stop()
+        it stops waiting and exits once the queue is empty.
+        """
+        q = self._rx_queue
+        stopped = self._stop_event
+        while True:
+            try:
+                message = q.get(block=not stopped.is_set(), timeout=self._DISPATCH_POLL)
+            except queue.Empty:
+                if stopped.is_set():
+                    return
+                continue
+            self._process_message(message)
 
+    def _process_message(self, message: str) -> None:
         try:
-            data = json.loads(message)
-        except json.JSONDecodeError:
+            data = loads(message)
+        except ValueError:
             return
 
         try:
@@ -241,7 +341,7 @@ class PolyWebSocket:
                     self._handle_legacy_price_change(data)
                 # tick_size_change etc. ignored
         except Exception:
-            self._stats["parse_errors"] += 1
+            self._stats.parse_errors += 1
 
     def _on_error(self, ws, error) -> None:
         self._handle_error(
@@ -250,34 +350,54 @@ class PolyWebSocket:
 
     def _on_close(self, ws, close_status_code, close_msg) -> None:
         self._connected = False
-        for cb in self._disconnect_callbacks:
+        self._dispatch(self._disconnect_callbacks)
+
+    # ── Message parsing ───────────────────────────────────
+
+    @staticmethod
+    def _dispatch(callbacks: List[Callable], *args) -> None:
+        """Invoke each callback, swallowing errors; no-op when none registered."""
+        if not callbacks:
+            return
+        for cb in callbacks:
             try:
-                cb()
+                cb(*args)
             except Exception:
                 pass
 
-    # ── Message parsing ───────────────────────────────────
-
     def _handle_batch_price_changes(self, data: Dict) -> None:
         """Handle: {"market":"..","price_changes":[{"asset_id":"..","best_ask":"0.5",...}]}"""
-        for change in data.get("price_changes", []):
+        changes = data.get("price_changes")
+        if not changes:
+            return
+
+        cache = self._price_cache
+        raw_cache = self._raw_price
+        cbs = self._price_callbacks
+        n = 0
+        for change in changes:
             asset_id = change.get("asset_id")
             if not asset_id:
                 continue
 
-            # Update price cache from multiple possible fields
-            price = change.get("price") or change.get("best_ask")
-            if price is not None:
-                self._price_cache[asset_id] = float(price)
+            # Update price cache from multiple possible fields; duplicate
+            # quotes (same raw string) skip the float parse and dict write.
+            raw = change.get("price") or change.get("best_ask")
+            if raw is not None and raw_cache.get(asset_id) != raw:
+                cache[asset_id] = float(raw)
+                raw_cache[asset_id] = raw
 
-            self._stats["price_updates"] += 1
+            n += 1
 
-            for cb in self._price_callbacks:
+            # _dispatch inlined: this loop is the per-message hot path
+            for cb in cbs:
                 try:
                     cb(asset_id, change)
                 except Exception:
                     pass
 
+        self._stats.price_updates += n
+
     def _handle_legacy_price_change(self, data: Dict) -> None:
         """Handle: {"event_type":"price_change","asset_id":"..","price":".."}"""
         asset_id = data.get("asset_id")
@@ -287,14 +407,11 @@ class PolyWebSocket:
         price = data.get("price")
         if price is not None:
             self._price_cache[asset_id] = float(price)
+            self._raw_price[asset_id] = price
 
-        self._stats["price_updates"] += 1
+        self._stats.price_updates += 1
 
-        for cb in self._price_callbacks:
-            try:
-                cb(asset_id, data)
-            except Exception:
-                pass
+        self._dispatch(self._price_callbacks, asset_id, data)
 
     def _handle_book_item(self, item: Dict) -> None:
         """Handle: {"asset_id":"..","asks":[..],"bids":[..]}"""
@@ -302,42 +419,51 @@ class PolyWebSocket:
         if not asset_id:
             return
 
+        # Frames without asks carry nothing the trackers use and are not
+        # counted in book_updates.
         asks = item.get("asks")
         if not asks:
             return
 
-        self._stats["book_updates"] += 1
+        self._stats.book_updates += 1
 
-        for cb in self._book_callbacks:
-            try:
-                cb(asset_id, item)
-            except Exception:
-                pass
+        self._dispatch(self._book_callbacks, asset_id, item)
 
     def _handle_error(self, error: Exception) -> None:
-        self._stats["errors"] += 1
-        for cb in self._error_callbacks:
-            try:
-                cb(error)
-            except Exception:
-                pass
+        self._stats.errors += 1
+        self._dispatch(self._error_callbacks, error)
 
 
 class AssetPriceTracker:
     """Track per-asset price history over a sliding window.
 
     Used by the lag monitor for 5-minute price delta detection.
+
+    Timestamps are time.monotonic() seconds, so clock adjustments can't
+    reorder or expire history. Prices are stored as int32 basis points (price * 10000, clamped to
+    [0, 1]) next to float64 timestamps in compact arrays; values are
+    converted back to floats only when returned.
     """
 
+    _SCALE = 10000
+    # Evicted prefix length at which the arrays are compacted in place.
+    _COMPACT_AT = 256
+
     def __init__(self, window_seconds: int = 300):
         self.window_seconds = window_seconds
-        self._history: Dict[str, List[tuple]] = defaultdict(list)
+        # Parallel per-asset arrays: timestamps (ascending) and prices in bp.
+        # Entries before _head[asset] have been evicted but not yet compacted.
+        self._ts: Dict[str, array] = defaultdict(lambda: array("d"))
+        self._px: Dict[str, array] = defaultdict(lambda: array("i"))
+        self._head: Dict[str, int] = defaultdict(int)
         self._lock = threading.Lock()
 
     def record(self, asset_id: str, price: float, timestamp: float | None = None) -> None:
-        ts = timestamp or time.time()
+        ts = timestamp or time.monotonic()
+        bp = min(max(int(round(price * self._SCALE)), 0), self._SCALE)
         with self._lock:
-            self._history[asset_id].append((ts, price))
+            self._ts[asset_id].append(ts)
+            self._px[asset_id].append(bp)
             self._cleanup(asset_id, ts)
 
     def get_price_delta(
@@ -347,32 +473,37 @@ class AssetPriceTracker:
     ) -> float | None:
         """Price change over window: current - oldest within window."""
         lookback = lookback_seconds or self.window_seconds
-        now = time.time()
+        now = time.monotonic()
         cutoff = now - lookback
 
         with self._lock:
-            history = self._history.get(asset_id, [])
-            if len(history) < 2:
+            prices = self._px.get(asset_id)
+            head = self._head[asset_id] if prices else 0
+            if not prices or len(prices) - head < 2:
                 return None
 
-            old_price = None
-            for ts, price in history:
-                if ts >= cutoff:
-                    break
-                old_price = price
-
-            if old_price is None:
-                old_price = history[0][1]
-
-            return history[-1][1] - old_price
+            # Baseline is the last price recorded before the cutoff, else the oldest.
+            idx = bisect.bisect_left(self._ts[asset_id], cutoff, head)
+            old_price = prices[idx - 1] if idx > head else prices[head]
+            return (prices[-1] - old_price) / self._SCALE
 
     def get_current_price(self, asset_id: str) -> float | None:
         with self._lock:
-            history = self._history.get(asset_id, [])
-            return history[-1][1] if history else None
+            prices = self._px.get(asset_id)
+            if not prices or len(prices) <= self._head[asset_id]:
+                return None
+            return prices[-1] / self._SCALE
 
     def _cleanup(self, asset_id: str, now: float) -> None:
         cutoff = now - self.window_seconds - 60
-        history = self._history[asset_id]
-        while history and history[0][0] < cutoff:
-            history.pop(0)
+        timestamps = self._ts[asset_id]
+        head = self._head[asset_id]
+        # Common case: the oldest live entry is still inside the window.
+        if timestamps[head] >= cutoff:
+            return
+        head = bisect.bisect_left(timestamps, cutoff, head)
+        if head >= self._COMPACT_AT and head * 2 >= len(timestamps):
+            del timestamps[:head]
+            del self._px[asset_id][:head]
+            head = 0
+        self._head[asset_id] = head
@@ -12,21 +12,24 @@ from pathlib import Path
 from dotenv import load_dotenv
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class GammaConfig:
     base_url: str = "https://gamma-api.polymarket.com"
     fetch_limit: int = 100
-    fetch_delay: float = 0.3
+    fetch_delay: float = 0.3  # 429 backoff when the server sends no Retry-After
+    rate_limit_retries: int = 3
     timeout: int = 15
+    slug_batch_size: int = 20
+    max_workers: int = 8
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class CLOBConfig:
     base_url: str = "https://clob.polymarket.com"
     timeout: int = 10
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class OddsAPIConfig:
     key: str = ""
     base_url: str = "https://api.the-odds-api.com/v4"
@@ -35,13 +38,13 @@ class OddsAPIConfig:
     timeout: int = 15
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class DataAPIConfig:
     base_url: str = "https://data-api.polymarket.com"
     timeout: int = 15
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class WebSocketConfig:
     url: str = "wss://ws-subscriptions-clob.polymarket.com/ws/market"
     ping_interval: int = 30
@@ -49,10 +52,12 @@ class WebSocketConfig:
     reconnect_initial: float = 1.0
     reconnect_max: float = 60.0
     reconnect_multiplier: float = 2.0
-    subscribe_batch_size: int = 500
+    subscribe_max_bytes: int = 65536  # split subscribe frames above this size
+    dispatch_queue_size: int = 4096  # 0 = parse/dispatch on the reader thread
+    recv_buffer_bytes: int = 1 << 20  # SO_RCVBUF; 0 = kernel default
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class LagConfig:
     normal_interval: int = 3600
     trigger_interval: int = 900
@@ -65,9 +70,17 @@ class LagConfig:
     bot_check_interval: int = 60
     refresh_interval: int = 600
     status_interval: int = 300
+    gap_check_interval: int = 30
+    poly_lookahead_hours: int = 72
+    poly_lookback_hours: int = 6
+    poly_miss_backoff: int = 600
+    line_zscore_threshold: float = 0.0    # 0 disables the baseline trigger
+    baseline_min_samples: int = 20
+    baseline_persist_every: int = 100
+    baseline_retention_hours: int = 48
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RebalanceConfig:
     threshold: float = 1.0
     strong_threshold: float = 0.995
@@ -79,22 +92,24 @@ class RebalanceConfig:
     seed_workers: int = 50
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class AnomalyConfig:
     price_change_threshold: float = 0.05
     price_window_seconds: int = 300
     bid_ask_spread_threshold: float = 0.05
     yes_no_deviation_threshold: float = 0.03
     pinnacle_cooldown_seconds: int = 1800
+    debounce_seconds: float = 3.0        # skip detector for repeat ticks inside this window...
+    debounce_price_delta: float = 0.005  # ...unless the price moved at least this much
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class HiResConfig:
     offsets: tuple[int, ...] = (3, 10, 30)
     actionable_gap: float = 0.04
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class AppConfig:
     odds: OddsAPIConfig
     gamma: GammaConfig = field(default_factory=GammaConfig)
@@ -110,16 +125,23 @@ class AppConfig:
     alert_file: Path = Path("data/rebalance_alerts.jsonl")
 
 
+# Set after the first default .env search; load_dotenv never overrides
+# variables already in os.environ, so repeating it would only re-stat files.
+_env_searched = False
+
+
 def load_config(env_file: Path | None = None) -> AppConfig:
     """Load configuration from environment variables + defaults.
 
     Args:
         env_file: Path to .env file. If None, searches project root.
     """
+    global _env_searched
     if env_file and env_file.exists():
         load_dotenv(env_file)
-    else:
-        # Search standard locations
+    elif not _env_searched:
+        # Search standard locations (once per process)
+        _env_searched = True
         for candidate in [Path(".env"), Path(__file__).parent.parent / ".env"]:
             if candidate.exists():
                 load_dotenv(candidate)
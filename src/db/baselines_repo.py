@@ -0,0 +1,39 @@
+"""CRUD operations for the line_baselines table."""
+from __future__ import annotations
+
+import sqlite3
+
+_LOAD_ALL_SQL = "SELECT game_id, n, mean, m2 FROM line_baselines"
+
+_UPSERT_SQL = """INSERT INTO line_baselines (game_id, n, mean, m2, updated_at)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT(game_id) DO UPDATE SET
+        n = excluded.n, mean = excluded.mean, m2 = excluded.m2,
+        updated_at = excluded.updated_at"""
+
+_STALE_SQL = "SELECT game_id FROM line_baselines WHERE updated_at < ?"
+
+_DELETE_STALE_SQL = "DELETE FROM line_baselines WHERE updated_at < ?"
+
+
+class BaselinesRepo:
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+    def load_all(self) -> list[tuple]:
+        """Return all (game_id, n, mean, m2) rows."""
+        return self.conn.execute(_LOAD_ALL_SQL).fetchall()
+
+    def upsert_many(self, rows: list[tuple], updated_at: str) -> None:
+        """Insert or replace (game_id, n, mean, m2) rows."""
+        self.conn.executemany(
+            _UPSERT_SQL,
+            [(gid, n, mean, m2, updated_at) for gid, n, mean, m2 in rows],
+        )
+
+    def delete_stale(self, cutoff: str) -> list[str]:
+        """Delete rows last updated before cutoff (ISO UTC); return their game_ids."""
+        stale = [row[0] for row in self.conn.execute(_STALE_SQL, (cutoff,))]
+        if stale:
+            self.conn.execute(_DELETE_STALE_SQL, (cutoff,))
+        return stale
@@ -3,6 +3,14 @@ from __future__ import annotations
 
 import sqlite3
 
+_INSERT_SQL = """INSERT INTO bot_trades
+    (trade_time, game_id, poly_market_slug, condition_id,
+     outcome, side, price, size, tx_hash)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(tx_hash) DO NOTHING"""
+
+_LATEST_TS_SQL = "SELECT CAST(strftime('%s', MAX(trade_time)) AS INTEGER) FROM bot_trades"
+
 
 class BotTradesRepo:
     def __init__(self, conn: sqlite3.Connection):
@@ -21,14 +29,26 @@ class BotTradesRepo:
         tx_hash: str,
     ) -> None:
         """Insert a bot trade (ignore duplicates by tx_hash)."""
-        self.conn.execute(
-            """INSERT OR IGNORE INTO bot_trades
-               (trade_time, game_id, poly_market_slug, condition_id,
-                outcome, side, price, size, tx_hash)
-               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+        self.insert_trades([
             (trade_time, game_id, poly_market_slug, condition_id,
              outcome, side, price, size, tx_hash),
-        )
+        ])
+
+    def insert_trades(self, rows: list[tuple]) -> int:
+        """Bulk-insert bot trades (ignore duplicates by tx_hash).
+
+        Each row is (trade_time, game_id, poly_market_slug, condition_id,
+        outcome, side, price, size, tx_hash).
+
+        Returns:
+            Number of rows actually inserted (duplicates excluded).
+        """
+        return self.conn.executemany(_INSERT_SQL, rows).rowcount
+
+    def get_latest_trade_ts(self) -> int | None:
+        """Most recent recorded trade_time as Unix seconds, or None if empty."""
+        row = self.conn.execute(_LATEST_TS_SQL).fetchone()
+        return row[0] if row else None
 
     def commit(self) -> None:
         self.conn.commit()
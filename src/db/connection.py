@@ -2,9 +2,21 @@
 from __future__ import annotations
 
 import sqlite3
+import zlib
+from contextlib import contextmanager
 from pathlib import Path
+from typing import Iterator
 
 SCHEMA_PATH = Path(__file__).parent / "schema.sql"
+_SCHEMA_SQL = SCHEMA_PATH.read_text()
+# Stamped into PRAGMA user_version after the schema script runs, so reopening
+# an up-to-date database skips the script. Editing schema.sql changes the
+# stamp and the script (all IF NOT EXISTS) is applied again.
+_SCHEMA_VERSION = zlib.crc32(_SCHEMA_SQL.encode()) & 0x7FFFFFFF
+
+# Seconds a connection waits on another connection's write lock before
+# raising "database is locked" (sqlite3 applies it as busy_timeout).
+BUSY_TIMEOUT = 5.0
 
 
 def get_connection(
@@ -18,17 +30,33 @@ def get_connection(
         thread_safe: If True, allow cross-thread usage.
 
     Returns:
-        Initialized connection with WAL mode and schema applied.
+        Initialized connection with WAL mode, tuned pragmas and schema applied.
     """
     db_path.parent.mkdir(parents=True, exist_ok=True)
 
-    conn = sqlite3.connect(str(db_path), check_same_thread=not thread_safe)
+    # Repos bind only str/int/float/None (timestamps are pre-formatted ISO
+    # strings), so no adapters or converters are registered or parsed.
+    conn = sqlite3.connect(
+        str(db_path), timeout=BUSY_TIMEOUT, detect_types=0,
+        check_same_thread=not thread_safe,
+    )
     conn.execute("PRAGMA journal_mode=WAL")
+    # WAL makes NORMAL durable across app crashes; only an OS crash can
+    # lose the last commits, which is acceptable for snapshot data.
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA cache_size=-65536")  # 64MB page cache
+    conn.execute("PRAGMA mmap_size=268435456")  # 256MB
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA wal_autocheckpoint=1000")
+    # foreign_keys stays off: the only FK (gap_series_hi_res -> move events)
+    # is always written with its parent, and enforcement adds a parent
+    # lookup to every insert.
 
-    with open(SCHEMA_PATH) as f:
-        conn.executescript(f.read())
+    if conn.execute("PRAGMA user_version").fetchone()[0] != _SCHEMA_VERSION:
+        conn.executescript(
+            f"BEGIN;\n{_SCHEMA_SQL}\nPRAGMA user_version = {_SCHEMA_VERSION};\nCOMMIT;"
+        )
 
-    conn.commit()
     return conn
 
 
@@ -40,3 +68,76 @@ def get_row_connection(
     conn = get_connection(db_path, thread_safe=thread_safe)
     conn.row_factory = sqlite3.Row
     return conn
+
+
+def get_read_connection(db_path: Path, rows: bool = False) -> sqlite3.Connection:
+    """Open an existing database read-only, for reports and analysis.
+
+    Skips the schema script, so it never takes the write lock;
+    under WAL it reads a consistent snapshot while a monitor keeps writing.
+
+    Args:
+        db_path: Path to an existing database file.
+        rows: If True, use the Row factory for dict-like access.
+    """
+    conn = sqlite3.connect(
+        f"{db_path.resolve().as_uri()}?mode=ro", uri=True, timeout=BUSY_TIMEOUT, detect_types=0,
+    )
+    conn.execute("PRAGMA query_only=ON")
+    conn.execute("PRAGMA mmap_size=268435456")
+    if rows:
+        conn.row_factory = sqlite3.Row
+    return conn
+
+
+def checkpoint(conn: sqlite3.Connection) -> bool:
+    """Checkpoint the WAL into the database file and truncate it to zero bytes.
+
+    Autocheckpoints only copy pages back and leave the -wal file at its
+    high-water size. Call from the writer, outside a transaction.
+
+    Returns:
+        True if the checkpoint completed, False if a reader or writer kept
+        it from finishing (it is simply retried on the next call).
+    """
+    busy, _, _ = conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()
+    return not busy
+
+
+def optimize(conn: sqlite3.Connection) -> None:
+    """Refresh planner statistics for tables whose contents changed enough.
+
+    Runs PRAGMA optimize, which re-ANALYZEs only the tables this connection
+    queried whose stats are missing or stale, sampling at most
+    analysis_limit rows per index. Call periodically on long-lived
+    connections and before closing them, outside a transaction.
+    """
+    conn.execute("PRAGMA analysis_limit=400")
+    conn.execute("PRAGMA optimize")
+
+
+@contextmanager
+def write_transaction(conn: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+    """Run a burst of writes in one BEGIN IMMEDIATE transaction.
+
+    The write lock is taken up front (waiting up to BUSY_TIMEOUT), so the
+    burst never fails halfway on a lock held by another connection.
+    Commits on exit, rolls back on error.
+
+    The connection must not be shared with writers that aren't serialized
+    against the block: if a transaction is already open on it, raises
+    sqlite3.OperationalError rather than joining (and committing) someone
+    else's work.
+
+    Only wrap pure write bursts: network or other slow work inside the
+    block holds the lock for its whole duration.
+    """
+    if conn.in_transaction:
+        raise sqlite3.OperationalError("write_transaction: a transaction is already open")
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.rollback()
+        raise
+    conn.commit()
@@ -5,10 +5,50 @@ import sqlite3
 
 from src.shared.nba import make_poly_slug
 
+_LOAD_SQL = "SELECT odds_api_id, poly_event_slug, poly_event_found FROM game_mapping"
+
+_INSERT_SQL = """INSERT OR IGNORE INTO game_mapping
+    (odds_api_id, home_team, away_team, commence_time, poly_event_slug)
+    VALUES (?, ?, ?, ?, ?)"""
+
+_STORED_SQL = "SELECT poly_event_slug, poly_event_found FROM game_mapping WHERE odds_api_id = ?"
+
+_MARK_FOUND_SQL = "UPDATE game_mapping SET poly_event_found = 1 WHERE odds_api_id = ?"
+
 
 class GameMappingRepo:
     def __init__(self, conn: sqlite3.Connection):
         self.conn = conn
+        self._slug_cache: dict[str, str] | None = None
+        self._game_by_slug: dict[str, str] = {}
+        self._known_ids: set[str] = set()
+        self._found_ids: set[str] = set()
+
+    def _slugs(self) -> dict[str, str]:
+        """Lazily loaded {odds_api_id: poly_event_slug} cache (non-empty slugs only).
+
+        The first load also records every known odds_api_id for upsert and
+        which games are already marked found.
+        """
+        if self._slug_cache is None:
+            rows = self.conn.execute(_LOAD_SQL).fetchall()
+            self._known_ids = {row[0] for row in rows}
+            self._found_ids = {row[0] for row in rows if row[2]}
+            self._slug_cache = {row[0]: row[1] for row in rows if row[1]}
+            self._game_by_slug = {slug: gid for gid, slug in self._slug_cache.items()}
+        return self._slug_cache
+
+    def warm(self) -> None:
+        """Load the slug cache now rather than on the first lookup."""
+        self._slugs()
+
+    def invalidate(self) -> None:
+        """Drop the caches so the next lookup reloads them from the table.
+
+        upsert and mark_found_many update the caches as they write, so call
+        this after rolling back a transaction that contained either.
+        """
+        self._slug_cache = None
 
     def upsert(
         self,
@@ -18,52 +58,61 @@ class GameMappingRepo:
         commence_time: str,
     ) -> None:
         """Insert game mapping if not exists, auto-generate poly slug."""
-        existing = self.conn.execute(
-            "SELECT poly_event_slug FROM game_mapping WHERE odds_api_id = ?",
-            (odds_api_id,),
-        ).fetchone()
-
-        if existing:
+        slugs = self._slugs()
+        if odds_api_id in self._known_ids:
             return
 
         poly_slug = make_poly_slug(away_team, home_team, commence_time)
 
-        self.conn.execute(
-            """INSERT OR IGNORE INTO game_mapping
-               (odds_api_id, home_team, away_team, commence_time, poly_event_slug)
-               VALUES (?, ?, ?, ?, ?)""",
+        cur = self.conn.execute(
+            _INSERT_SQL,
             (odds_api_id, home_team, away_team, commence_time, poly_slug),
         )
+        self._known_ids.add(odds_api_id)
+        if cur.rowcount == 0:
+            # Row was written by another connection since the cache loaded;
+            # cache what is stored rather than the slug computed here.
+            row = self.conn.execute(_STORED_SQL, (odds_api_id,)).fetchone()
+            poly_slug = row[0] if row else None
+            if row and row[1]:
+                self._found_ids.add(odds_api_id)
+        if poly_slug:
+            slugs[odds_api_id] = poly_slug
+            self._game_by_slug[poly_slug] = odds_api_id
 
     def get_slug(self, odds_api_id: str) -> str | None:
-        """Get poly_event_slug for a game."""
-        row = self.conn.execute(
-            "SELECT poly_event_slug FROM game_mapping WHERE odds_api_id = ?",
-            (odds_api_id,),
-        ).fetchone()
-        return row[0] if row and row[0] else None
+        """Get poly_event_slug for a game (served from the in-process cache)."""
+        return self._slugs().get(odds_api_id)
 
     def mark_found(self, odds_api_id: str) -> None:
         """Mark that the Polymarket event was found."""
-        self.conn.execute(
-            "UPDATE game_mapping SET poly_event_found = 1 WHERE odds_api_id = ?",
-            (odds_api_id,),
-        )
+        self.mark_found_many([odds_api_id])
+
+    def mark_found_many(self, odds_api_ids: list[str]) -> None:
+        """Mark several games' Polymarket events as found.
+
+        Games already marked (per the in-process set) are skipped, so the
+        per-cycle call only writes newly found games.
+        """
+        self._slugs()
+        found = self._found_ids
+        new_ids = [gid for gid in dict.fromkeys(odds_api_ids) if gid not in found]
+        if not new_ids:
+            return
+        self.conn.executemany(_MARK_FOUND_SQL, [(gid,) for gid in new_ids])
+        found.update(new_ids)
 
     def get_all_slugs(self) -> list[tuple[str, str]]:
         """Return all (odds_api_id, poly_event_slug) pairs with non-empty slugs."""
-        return self.conn.execute(
-            """SELECT odds_api_id, poly_event_slug
-               FROM game_mapping
-               WHERE poly_event_slug IS NOT NULL AND poly_event_slug != ''"""
-        ).fetchall()
+        return list(self._slugs().items())
 
     def get_slug_to_game_id_map(self) -> dict[str, str]:
-        """Return {poly_event_slug: odds_api_id} mapping."""
-        rows = self.conn.execute(
-            "SELECT odds_api_id, poly_event_slug FROM game_mapping WHERE poly_event_slug IS NOT NULL"
-        ).fetchall()
-        return {row[1]: row[0] for row in rows}
+        """Return {poly_event_slug: odds_api_id} mapping.
+
+        This is the live cache, kept current by upsert; callers must not mutate it.
+        """
+        self._slugs()
+        return self._game_by_slug
 
     def commit(self) -> None:
         self.conn.commit()
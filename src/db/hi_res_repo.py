@@ -1,8 +1,31 @@
-"""CRUD operations for move_events_hi_res and gap_series_hi_res tables."""
+"""CRUD operations for move_events_hi_res and gap_series_hi_res tables.
+
+Like the other repos, writes don't commit; the caller groups them and
+calls commit() once.
+"""
 from __future__ import annotations
 
 import sqlite3
-from typing import Optional
+
+_INSERT_EVENT_SQL = """INSERT INTO move_events_hi_res
+    (game_key, market_type, poly_line, oracle_line, move_ts_unix,
+     oracle_prev_implied, oracle_new_implied, oracle_delta,
+     poly_t0, gap_t0, depth_t0, spread_t0,
+     trigger_source, outcome_name)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"""
+
+_INSERT_GAP_SQL = """INSERT INTO gap_series_hi_res
+    (move_event_id, ts_offset_sec, poly_price, gap, bid, ask, depth)
+    VALUES (?, ?, ?, ?, ?, ?, ?)"""
+
+_LOAD_EVENTS_SQL = """SELECT
+        id, game_key, market_type, poly_line, oracle_line,
+        move_ts_unix, oracle_prev_implied, oracle_new_implied, oracle_delta,
+        poly_t0, poly_t3s, poly_t10s, poly_t30s,
+        gap_t0, gap_t3s, gap_t10s, gap_t30s,
+        depth_t0, spread_t0, trigger_source, outcome_name
+    FROM move_events_hi_res
+    ORDER BY move_ts_unix"""
 
 
 class HiResRepo:
@@ -29,18 +52,12 @@ class HiResRepo:
         """Insert a hi-res move event and return its ID."""
         try:
             cur = self.conn.execute(
-                """INSERT INTO move_events_hi_res
-                   (game_key, market_type, poly_line, oracle_line, move_ts_unix,
-                    oracle_prev_implied, oracle_new_implied, oracle_delta,
-                    poly_t0, gap_t0, depth_t0, spread_t0,
-                    trigger_source, outcome_name)
-                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                _INSERT_EVENT_SQL,
                 (game_key, market_type, poly_line, oracle_line, move_ts_unix,
                  oracle_prev_implied, oracle_new_implied, oracle_delta,
                  poly_t0, gap_t0, depth_t0, spread_t0,
                  trigger_source, outcome_name),
             )
-            self.conn.commit()
             return cur.lastrowid
         except Exception:
             return None
@@ -53,13 +70,22 @@ class HiResRepo:
         gap: float,
     ) -> None:
         """Update poly/gap at a specific time offset (3, 10, 30)."""
-        col_poly = f"poly_t{offset_sec}s"
-        col_gap = f"gap_t{offset_sec}s"
-        self.conn.execute(
-            f"UPDATE move_events_hi_res SET {col_poly} = ?, {col_gap} = ? WHERE id = ?",
-            (poly_price, gap, move_event_id),
-        )
-        self.conn.commit()
+        self.update_capture_many([(move_event_id, offset_sec, poly_price, gap)])
+
+    def update_capture_many(self, rows: list[tuple]) -> None:
+        """Apply (move_event_id, offset_sec, poly_price, gap) updates.
+
+        Rows are grouped by offset so each column pair gets one executemany.
+        """
+        by_offset: dict[int, list[tuple]] = {}
+        for move_event_id, offset_sec, poly_price, gap in rows:
+            by_offset.setdefault(int(offset_sec), []).append((poly_price, gap, move_event_id))
+        for offset_sec, params in by_offset.items():
+            self.conn.executemany(
+                f"UPDATE move_events_hi_res SET poly_t{offset_sec}s = ?, gap_t{offset_sec}s = ? "
+                "WHERE id = ?",
+                params,
+            )
 
     def insert_gap_series(
         self,
@@ -73,34 +99,36 @@ class HiResRepo:
     ) -> None:
         """Insert a gap series data point."""
         self.conn.execute(
-            """INSERT INTO gap_series_hi_res
-               (move_event_id, ts_offset_sec, poly_price, gap, bid, ask, depth)
-               VALUES (?, ?, ?, ?, ?, ?, ?)""",
+            _INSERT_GAP_SQL,
             (move_event_id, ts_offset_sec, poly_price, gap, bid, ask, depth),
         )
-        self.conn.commit()
 
-    def load_all_events(self) -> list[dict]:
-        """Load all hi-res events for analysis."""
-        rows = self.conn.execute(
-            """SELECT
-                id, game_key, market_type, poly_line, oracle_line,
-                move_ts_unix, oracle_prev_implied, oracle_new_implied, oracle_delta,
-                poly_t0, poly_t3s, poly_t10s, poly_t30s,
-                gap_t0, gap_t3s, gap_t10s, gap_t30s,
-                depth_t0, spread_t0, trigger_source, outcome_name
-               FROM move_events_hi_res
-               ORDER BY move_ts_unix"""
-        ).fetchall()
-
-        columns = [
-            "id", "game_key", "market_type", "poly_line", "oracle_line",
-            "move_ts_unix", "oracle_prev_implied", "oracle_new_implied", "oracle_delta",
-            "poly_t0", "poly_t3s", "poly_t10s", "poly_t30s",
-            "gap_t0", "gap_t3s", "gap_t10s", "gap_t30s",
-            "depth_t0", "spread_t0", "trigger_source", "outcome_name",
-        ]
-        return [dict(zip(columns, row)) for row in rows]
+    def insert_gap_series_many(self, rows: list[tuple]) -> None:
+        """Insert (move_event_id, ts_offset_sec, poly_price, gap, bid, ask, depth) rows."""
+        self.conn.executemany(_INSERT_GAP_SQL, rows)
+
+    def load_all_events(self) -> list[sqlite3.Row]:
+        """Load all hi-res events for analysis.
+
+        Rows are sqlite3.Row, indexed by column name like a dict; call
+        dict(row) where a real dict is needed.
+        """
+        cur = self.conn.cursor()
+        cur.row_factory = sqlite3.Row
+        return cur.execute(_LOAD_EVENTS_SQL).fetchall()
+
+    def load_all_events_columnar(self) -> dict[str, tuple]:
+        """Load all hi-res events as one tuple per column, in row order.
+
+        Suited to aggregates over a single series (e.g. statistics.mean of
+        gap_t3s) without walking every row.
+        """
+        cur = self.conn.execute(_LOAD_EVENTS_SQL)
+        names = [d[0] for d in cur.description]
+        rows = cur.fetchall()
+        if not rows:
+            return {name: () for name in names}
+        return dict(zip(names, zip(*rows)))
 
     def commit(self) -> None:
         self.conn.commit()
@@ -2,7 +2,44 @@
 from __future__ import annotations
 
 import sqlite3
-from datetime import datetime, timezone
+
+from src.shared.time_utils import now_utc
+
+_OPEN_SQL = """INSERT INTO paper_trades
+    (game_id, market_type, outcome, signal_time, signal_source,
+     gap_at_signal, entry_time, entry_price, entry_bid, status)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 'open')"""
+
+_ENTRY_SQL = "SELECT entry_price, entry_bid FROM paper_trades WHERE id = ?"
+
+_CLOSE_SQL = """UPDATE paper_trades
+    SET exit_time = ?, exit_price = ?, exit_ask = ?,
+        pnl_gross = ?, pnl_net = ?, slippage = ?, status = 'closed'
+    WHERE id = ?"""
+
+_OPEN_POSITIONS_SQL = """SELECT id, game_id, market_type, outcome, entry_time, entry_price
+    FROM paper_trades WHERE status = 'open'"""
+
+# signal_time is stored as ISO 8601 with a 'T' and 'Z', so the cutoff is
+# formatted the same way for the string comparison to be exact.
+_STATS_SQL = """SELECT
+        COUNT(*) as total,
+        SUM(pnl_net > 0) as wins,
+        AVG(pnl_gross) as avg_pnl_gross,
+        AVG(pnl_net) as avg_pnl_net,
+        AVG(slippage) as avg_slippage,
+        SUM(pnl_net) as total_pnl
+    FROM paper_trades
+    WHERE status = 'closed'
+      AND signal_time > strftime('%Y-%m-%dT%H:%M:%SZ', 'now', ?)"""
+
+_RECENT_SQL = """SELECT id, game_id, market_type, outcome, signal_source,
+        entry_price, exit_price, pnl_gross, pnl_net, slippage,
+        signal_time
+    FROM paper_trades
+    WHERE status = 'closed'
+    ORDER BY id DESC
+    LIMIT ?"""
 
 
 class PaperTradesRepo:
@@ -13,6 +50,12 @@ class PaperTradesRepo:
         self._ensure_table()
 
     def _ensure_table(self):
+        # schema.sql already creates the table for get_connection callers;
+        # skip the DDL and its commit when it is there.
+        if self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'paper_trades'"
+        ).fetchone():
+            return
         self.conn.execute("""
             CREATE TABLE IF NOT EXISTS paper_trades (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -38,8 +81,8 @@ class PaperTradesRepo:
             )
         """)
         self.conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_paper_trades_status
-            ON paper_trades(status, signal_time)
+            CREATE INDEX IF NOT EXISTS idx_paper_trades_stats
+            ON paper_trades(status, signal_time, pnl_net, pnl_gross, slippage)
         """)
         self.conn.commit()
 
@@ -54,14 +97,9 @@ class PaperTradesRepo:
         entry_bid: float,
     ) -> int:
         """Open a new paper trade position."""
-        now = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        now = now_utc()
         cursor = self.conn.execute(
-            """
-            INSERT INTO paper_trades
-            (game_id, market_type, outcome, signal_time, signal_source,
-             gap_at_signal, entry_time, entry_price, entry_bid, status)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 'open')
-            """,
+            _OPEN_SQL,
             (game_id, market_type, outcome, now, signal_source,
              gap_at_signal, now, entry_price, entry_bid),
         )
@@ -76,16 +114,13 @@ class PaperTradesRepo:
         fee_rate: float = 0.02,
     ) -> dict:
         """Close an open position and calculate PnL."""
-        row = self.conn.execute(
-            "SELECT entry_price, entry_bid FROM paper_trades WHERE id = ?",
-            (trade_id,),
-        ).fetchone()
+        row = self.conn.execute(_ENTRY_SQL, (trade_id,)).fetchone()
 
         if not row:
             return None
 
         entry_price, entry_bid = row
-        now = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        now = now_utc()
 
         # PnL calculation
         pnl_gross = (exit_price - entry_price) / entry_price if entry_price > 0 else 0
@@ -93,12 +128,7 @@ class PaperTradesRepo:
         pnl_net = pnl_gross - fee_rate
 
         self.conn.execute(
-            """
-            UPDATE paper_trades
-            SET exit_time = ?, exit_price = ?, exit_ask = ?,
-                pnl_gross = ?, pnl_net = ?, slippage = ?, status = 'closed'
-            WHERE id = ?
-            """,
+            _CLOSE_SQL,
             (now, exit_price, exit_ask, pnl_gross, pnl_net, slippage, trade_id),
         )
         self.conn.commit()
@@ -114,12 +144,7 @@ class PaperTradesRepo:
 
     def get_open_positions(self) -> list[dict]:
         """Get all open positions."""
-        rows = self.conn.execute(
-            """
-            SELECT id, game_id, market_type, outcome, entry_time, entry_price
-            FROM paper_trades WHERE status = 'open'
-            """
-        ).fetchall()
+        rows = self.conn.execute(_OPEN_POSITIONS_SQL).fetchall()
         return [
             {"id": r[0], "game_id": r[1], "market_type": r[2],
              "outcome": r[3], "entry_time": r[4], "entry_price": r[5]}
@@ -128,20 +153,7 @@ class PaperTradesRepo:
 
     def get_stats(self, hours: int = 24) -> dict:
         """Get paper trading statistics."""
-        row = self.conn.execute(
-            f"""
-            SELECT
-                COUNT(*) as total,
-                SUM(CASE WHEN pnl_net > 0 THEN 1 ELSE 0 END) as wins,
-                AVG(pnl_gross) as avg_pnl_gross,
-                AVG(pnl_net) as avg_pnl_net,
-                AVG(slippage) as avg_slippage,
-                SUM(pnl_net) as total_pnl
-            FROM paper_trades
-            WHERE status = 'closed'
-              AND signal_time > datetime('now', '-{hours} hours')
-            """
-        ).fetchone()
+        row = self.conn.execute(_STATS_SQL, (f"-{hours} hours",)).fetchone()
 
         total = row[0] or 0
         wins = row[1] or 0
@@ -158,18 +170,7 @@ class PaperTradesRepo:
 
     def get_recent_trades(self, limit: int = 10) -> list[dict]:
         """Get recent closed trades."""
-        rows = self.conn.execute(
-            """
-            SELECT id, game_id, market_type, outcome, signal_source,
-                   entry_price, exit_price, pnl_gross, pnl_net, slippage,
-                   signal_time
-            FROM paper_trades
-            WHERE status = 'closed'
-            ORDER BY id DESC
-            LIMIT ?
-            """,
-            (limit,),
-        ).fetchall()
+        rows = self.conn.execute(_RECENT_SQL, (limit,)).fetchall()
         return [
             {
                 "id": r[0], "game_id": r[1], "market_type": r[2],
@@ -3,6 +3,29 @@ from __future__ import annotations
 
 import sqlite3
 
+_INSERT_SQL = """INSERT OR IGNORE INTO pinnacle_snapshots
+    (game_id, snapshot_time, total_line, over_price, under_price,
+     over_implied, under_implied)
+    VALUES (?, ?, ?, ?, ?, ?, ?)"""
+
+_PREVIOUS_SQL = """SELECT total_line, over_implied, under_implied, snapshot_time
+    FROM pinnacle_snapshots
+    WHERE game_id = ?
+    ORDER BY snapshot_time DESC
+    LIMIT 2"""
+
+# Per game, a seek on idx_pin_game_time for the second-newest rowid; unlike
+# ROW_NUMBER() over the whole partition, cost doesn't grow with history.
+_PREVIOUS_MANY_SQL = """WITH ids(game_id) AS (VALUES {values})
+    SELECT p.game_id, p.total_line, p.over_implied, p.under_implied, p.snapshot_time
+    FROM ids
+    JOIN pinnacle_snapshots p ON p.rowid = (
+        SELECT s.rowid FROM pinnacle_snapshots s
+        WHERE s.game_id = ids.game_id
+        ORDER BY s.snapshot_time DESC
+        LIMIT 1 OFFSET 1
+    )"""
+
 
 class PinnacleRepo:
     def __init__(self, conn: sqlite3.Connection):
@@ -19,25 +42,34 @@ class PinnacleRepo:
         under_implied: float | None,
     ) -> None:
         """Insert a Pinnacle snapshot (ignore duplicates)."""
-        self.conn.execute(
-            """INSERT OR IGNORE INTO pinnacle_snapshots
-               (game_id, snapshot_time, total_line, over_price, under_price,
-                over_implied, under_implied)
-               VALUES (?, ?, ?, ?, ?, ?, ?)""",
+        self.insert_snapshots([
             (game_id, snapshot_time, total_line, over_price, under_price,
              over_implied, under_implied),
-        )
+        ])
+
+    def insert_snapshots(self, rows: list[tuple]) -> None:
+        """Bulk-insert Pinnacle snapshots (ignore duplicates).
+
+        Each row is (game_id, snapshot_time, total_line, over_price,
+        under_price, over_implied, under_implied).
+        """
+        self.conn.executemany(_INSERT_SQL, rows)
 
     def get_previous(self, game_id: str) -> tuple | None:
         """Get the second-most-recent snapshot for move detection."""
-        return self.conn.execute(
-            """SELECT total_line, over_implied, under_implied, snapshot_time
-               FROM pinnacle_snapshots
-               WHERE game_id = ?
-               ORDER BY snapshot_time DESC
-               LIMIT 1 OFFSET 1""",
-            (game_id,),
-        ).fetchone()
+        rows = self.conn.execute(_PREVIOUS_SQL, (game_id,)).fetchall()
+        return rows[1] if len(rows) > 1 else None
+
+    def get_previous_many(self, game_ids: list[str]) -> dict[str, tuple]:
+        """Batch version of get_previous: {game_id: (line, over_imp, under_imp, time)}."""
+        if not game_ids:
+            return {}
+        game_ids = list(dict.fromkeys(game_ids))
+        rows = self.conn.execute(
+            _PREVIOUS_MANY_SQL.format(values=",".join(["(?)"] * len(game_ids))),
+            game_ids,
+        ).fetchall()
+        return {row[0]: row[1:] for row in rows}
 
     def commit(self) -> None:
         self.conn.commit()
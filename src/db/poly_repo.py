@@ -3,6 +3,32 @@ from __future__ import annotations
 
 import sqlite3
 
+_INSERT_SQL = """INSERT OR IGNORE INTO poly_snapshots
+    (game_id, poly_market_slug, snapshot_time, total_line,
+     over_price, under_price,
+     over_best_bid, over_best_ask, under_best_bid, under_best_ask,
+     market_type)
+    VALUES (?, ?, ?, ?, ?, ?, NULL, NULL, NULL, NULL, ?)"""
+
+# Nearest line on each side of the target, newest snapshot at that line.
+# Each half is a MAX/MIN seek plus a seek on idx_poly_snap_game_mt_line
+# (game_id, market_type, total_line, snapshot_time DESC, ...), so no row
+# is ever sorted by distance.
+_NEIGHBOUR_SQL = """SELECT over_price, under_price, total_line, snapshot_time
+    FROM poly_snapshots
+    WHERE game_id = :game_id AND market_type = :market_type AND total_line = (
+        SELECT {agg}(total_line) FROM poly_snapshots
+        WHERE game_id = :game_id AND market_type = :market_type
+          AND total_line {op} :target)
+    ORDER BY snapshot_time DESC
+    LIMIT 1"""
+
+_CLOSEST_SQL = (
+    "SELECT * FROM (" + _NEIGHBOUR_SQL.format(agg="MAX", op="<=") + ")\n"
+    "UNION ALL\n"
+    "SELECT * FROM (" + _NEIGHBOUR_SQL.format(agg="MIN", op=">=") + ")"
+)
+
 
 class PolyRepo:
     def __init__(self, conn: sqlite3.Connection):
@@ -19,16 +45,18 @@ class PolyRepo:
         market_type: str = "total",
     ) -> None:
         """Insert a Polymarket snapshot (ignore duplicates)."""
-        self.conn.execute(
-            """INSERT OR IGNORE INTO poly_snapshots
-               (game_id, poly_market_slug, snapshot_time, total_line,
-                over_price, under_price,
-                over_best_bid, over_best_ask, under_best_bid, under_best_ask,
-                market_type)
-               VALUES (?, ?, ?, ?, ?, ?, NULL, NULL, NULL, NULL, ?)""",
+        self.insert_snapshots([
             (game_id, poly_market_slug, snapshot_time, total_line,
              over_price, under_price, market_type),
-        )
+        ])
+
+    def insert_snapshots(self, rows: list[tuple]) -> None:
+        """Bulk-insert Polymarket snapshots (ignore duplicates).
+
+        Each row is (game_id, poly_market_slug, snapshot_time, total_line,
+        over_price, under_price, market_type).
+        """
+        self.conn.executemany(_INSERT_SQL, rows)
 
     def get_closest_poly_snap(
         self,
@@ -36,15 +64,23 @@ class PolyRepo:
         target_line: float,
         market_type: str = "total",
     ) -> tuple | None:
-        """Get the poly snapshot closest to a given line."""
-        return self.conn.execute(
-            """SELECT over_price, under_price, total_line
-               FROM poly_snapshots
-               WHERE game_id = ? AND market_type = ?
-               ORDER BY ABS(total_line - ?), snapshot_time DESC
-               LIMIT 1""",
-            (game_id, market_type, target_line),
-        ).fetchone()
+        """Get the poly snapshot closest to a given line.
+
+        Returns (over_price, under_price, total_line) from the newest snapshot
+        at the nearest line; equidistant lines go to the newer snapshot.
+        """
+        rows = self.conn.execute(
+            _CLOSEST_SQL,
+            {"game_id": game_id, "market_type": market_type, "target": target_line},
+        ).fetchall()
+        if not rows:
+            return None
+        best = rows[0]
+        for row in rows[1:]:
+            d, best_d = abs(row[2] - target_line), abs(best[2] - target_line)
+            if d < best_d or (d == best_d and row[3] > best[3]):
+                best = row
+        return best[:3]
 
     def commit(self) -> None:
         self.conn.commit()
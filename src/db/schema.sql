@@ -147,11 +147,27 @@ CREATE TABLE IF NOT EXISTS paper_trades (
     created_at TEXT DEFAULT (datetime('now'))
 );
 
+-- Running Pinnacle total-line baseline per game (Welford count/mean/M2)
+CREATE TABLE IF NOT EXISTS line_baselines (
+    game_id TEXT PRIMARY KEY,
+    n INTEGER NOT NULL,
+    mean REAL NOT NULL,
+    m2 REAL NOT NULL,
+    updated_at TEXT NOT NULL
+);
+
 -- Indexes
 CREATE INDEX IF NOT EXISTS idx_pin_game_time ON pinnacle_snapshots(game_id, snapshot_time);
 CREATE INDEX IF NOT EXISTS idx_poly_game_time ON poly_snapshots(game_id, snapshot_time);
+CREATE INDEX IF NOT EXISTS idx_poly_snap_game_mt_line ON poly_snapshots(
+    game_id, market_type, total_line, snapshot_time DESC, over_price, under_price);
 CREATE INDEX IF NOT EXISTS idx_triggers_game ON triggers(game_id, trigger_time);
+CREATE INDEX IF NOT EXISTS idx_triggers_open ON triggers(gap_closed_time, poly_gap_under);
 CREATE INDEX IF NOT EXISTS idx_bot_trades_time ON bot_trades(trade_time);
 CREATE INDEX IF NOT EXISTS idx_hi_res_game ON move_events_hi_res(game_key, move_ts_unix);
 CREATE INDEX IF NOT EXISTS idx_gap_series_event ON gap_series_hi_res(move_event_id, ts_offset_sec);
-CREATE INDEX IF NOT EXISTS idx_paper_trades_status ON paper_trades(status, signal_time);
+-- Covers PaperTradesRepo.get_stats (index-only scan) and status lookups;
+-- supersedes the old (status, signal_time) index.
+DROP INDEX IF EXISTS idx_paper_trades_status;
+CREATE INDEX IF NOT EXISTS idx_paper_trades_stats
+    ON paper_trades(status, signal_time, pnl_net, pnl_gross, slippage);
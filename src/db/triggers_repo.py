@@ -2,7 +2,43 @@
 from __future__ import annotations
 
 import sqlite3
-from datetime import datetime
+
+_INSERT_SQL = """INSERT INTO triggers
+    (game_id, trigger_time, trigger_type,
+     prev_line, prev_over_implied, prev_under_implied,
+     new_line, new_over_implied, new_under_implied,
+     delta_line, delta_under_implied,
+     poly_over_price, poly_under_price, poly_gap_under, poly_gap_over)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"""
+
+_OPEN_SQL = """SELECT id, game_id, new_line, new_under_implied, new_over_implied, trigger_time
+    FROM triggers
+    WHERE gap_closed_time IS NULL AND poly_gap_under IS NOT NULL"""
+
+_GAP_CLOSED_SQL = "UPDATE triggers SET gap_closed_time = ?, lag_seconds = ? WHERE id = ?"
+
+_CLOSE_CONVERGED_SQL = """WITH closest AS (
+        SELECT t.id, t.new_under_implied, p.under_price,
+               ROW_NUMBER() OVER (
+                   PARTITION BY t.id
+                   ORDER BY ABS(p.total_line - t.new_line), p.snapshot_time DESC
+               ) AS rn
+        FROM triggers t
+        JOIN poly_snapshots p
+          ON p.game_id = t.game_id AND p.market_type = 'total'
+        WHERE t.gap_closed_time IS NULL
+          AND t.poly_gap_under IS NOT NULL
+          AND t.new_under_implied IS NOT NULL
+    )
+    UPDATE triggers
+    SET gap_closed_time = :closed,
+        lag_seconds = CAST(ROUND(
+            (julianday(:closed) - julianday(trigger_time)) * 86400
+        ) AS INTEGER)
+    WHERE id IN (
+        SELECT id FROM closest
+        WHERE rn = 1 AND ABS(new_under_implied - under_price) <= :tolerance
+    )"""
 
 
 class TriggersRepo:
@@ -28,28 +64,21 @@ class TriggersRepo:
         poly_gap_over: float | None,
     ) -> None:
         """Insert a trigger event."""
-        self.conn.execute(
-            """INSERT INTO triggers
-               (game_id, trigger_time, trigger_type,
-                prev_line, prev_over_implied, prev_under_implied,
-                new_line, new_over_implied, new_under_implied,
-                delta_line, delta_under_implied,
-                poly_over_price, poly_under_price, poly_gap_under, poly_gap_over)
-               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+        self.insert_triggers([
             (game_id, trigger_time, trigger_type,
              prev_line, prev_over_implied, prev_under_implied,
              new_line, new_over_implied, new_under_implied,
              delta_line, delta_under,
              poly_over, poly_under, poly_gap_under, poly_gap_over),
-        )
+        ])
+
+    def insert_triggers(self, rows: list[tuple]) -> None:
+        """Bulk-insert trigger events (rows in insert_trigger argument order)."""
+        self.conn.executemany(_INSERT_SQL, rows)
 
     def get_open_triggers(self) -> list[tuple]:
         """Get triggers where gap hasn't closed yet."""
-        return self.conn.execute(
-            """SELECT id, game_id, new_line, new_under_implied, new_over_implied, trigger_time
-               FROM triggers
-               WHERE gap_closed_time IS NULL AND poly_gap_under IS NOT NULL"""
-        ).fetchall()
+        return self.conn.execute(_OPEN_SQL).fetchall()
 
     def update_gap_closed(
         self,
@@ -58,11 +87,23 @@ class TriggersRepo:
         lag_seconds: int,
     ) -> None:
         """Mark a trigger's gap as closed."""
+        self.conn.execute(_GAP_CLOSED_SQL, (closed_time, lag_seconds, trigger_id))
+
+    def close_converged(self, closed_time: str, tolerance: float = 0.01) -> int:
+        """Close every open trigger whose Under gap has converged, in one statement.
+
+        The comparison price is the latest poly total snapshot at the line
+        closest to the trigger's new line (same as PolyRepo.get_closest_poly_snap).
+
+        Returns:
+            Number of triggers closed.
+        """
         self.conn.execute(
-            """UPDATE triggers SET gap_closed_time = ?, lag_seconds = ?
-               WHERE id = ?""",
-            (closed_time, lag_seconds, trigger_id),
+            _CLOSE_CONVERGED_SQL,
+            {"closed": closed_time, "tolerance": tolerance},
         )
+        # cursor.rowcount is -1 for statements that start with WITH
+        return self.conn.execute("SELECT changes()").fetchone()[0]
 
     def commit(self) -> None:
         self.conn.commit()
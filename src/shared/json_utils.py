@@ -0,0 +1,30 @@
+"""Fast JSON encoding/decoding for API and WebSocket payloads.
+
+Uses orjson when installed and falls back to the stdlib json module.
+Decode errors are ValueError subclasses in both cases.
+"""
+from __future__ import annotations
+
+from typing import Any
+
+try:
+    import orjson
+
+    def loads(data: bytes | str) -> Any:
+        """Decode a JSON document from bytes or str."""
+        return orjson.loads(data)
+
+    def dumps(obj: Any) -> str:
+        """Encode obj as a compact JSON str."""
+        return orjson.dumps(obj).decode()
+
+except ImportError:
+    import json
+
+    def loads(data: bytes | str) -> Any:
+        """Decode a JSON document from bytes or str."""
+        return json.loads(data)
+
+    def dumps(obj: Any) -> str:
+        """Encode obj as a compact JSON str."""
+        return json.dumps(obj, separators=(",", ":"))
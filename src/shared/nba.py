@@ -5,13 +5,15 @@ Consolidates duplicated logic from snapshot.py and backtest/poly_fetch.py.
 from __future__ import annotations
 
 import re
-from datetime import datetime
+from functools import lru_cache
 
 try:
     from zoneinfo import ZoneInfo
 except ImportError:
     from backports.zoneinfo import ZoneInfo
 
+from src.shared.time_utils import parse_iso_utc
+
 ET = ZoneInfo("America/New_York")
 
 FULL_TO_POLY_ABBR: dict[str, str] = {
@@ -49,6 +51,21 @@ FULL_TO_POLY_ABBR: dict[str, str] = {
 }
 
 
+_PLAYER_PROP_RE = re.compile("|".join(map(re.escape, (
+    "points o/u", "rebounds o/u", "assists o/u",
+    "threes o/u", "steals o/u", "blocks o/u",
+))))
+_PARTIAL_GAME_RE = re.compile("|".join(map(re.escape, (
+    "1h", "1q", "2q", "3q", "4q", "first half", "first quarter",
+))))
+
+_LINE_PT_RE = re.compile(r"(\d{2,3})pt(\d)")
+_LINE_DEC_RE = re.compile(r"(\d{2,3}\.\d)")
+_SPREAD_PT_RE = re.compile(r"(\d{1,2})pt(\d)")
+_SPREAD_DEC_RE = re.compile(r"(\d{1,2}\.\d)")
+
+
+@lru_cache(maxsize=4096)
 def make_poly_slug(away_team: str, home_team: str, commence_time: str) -> str:
     """Generate a Polymarket event slug from team names and start time.
 
@@ -66,12 +83,13 @@ def make_poly_slug(away_team: str, home_team: str, commence_time: str) -> str:
     if not away_abbr or not home_abbr or not commence_time:
         return ""
 
-    dt_utc = datetime.fromisoformat(commence_time.replace("Z", "+00:00"))
+    dt_utc = parse_iso_utc(commence_time)
     dt_et = dt_utc.astimezone(ET)
     date_str = dt_et.strftime("%Y-%m-%d")
     return f"nba-{away_abbr}-{home_abbr}-{date_str}"
 
 
+@lru_cache(maxsize=8192)
 def classify_market(question: str, slug: str) -> str:
     """Classify a Polymarket market type from its question and slug.
 
@@ -80,17 +98,12 @@ def classify_market(question: str, slug: str) -> str:
     q = question.lower()
     s = slug.lower()
 
-    # Player props
-    if any(kw in q for kw in [
-        "points o/u", "rebounds o/u", "assists o/u",
-        "threes o/u", "steals o/u", "blocks o/u",
-    ]):
+    # Player props (all contain "o/u", so skip the scan when it's absent)
+    if "o/u" in q and _PLAYER_PROP_RE.search(q):
         return "player_prop"
 
     # Half/quarter
-    if any(kw in q for kw in [
-        "1h", "1q", "2q", "3q", "4q", "first half", "first quarter",
-    ]):
+    if _PARTIAL_GAME_RE.search(q):
         return "other"
 
     if "o/u" in q or "total" in s:
@@ -105,29 +118,36 @@ def classify_market(question: str, slug: str) -> str:
     return "other"
 
 
+@lru_cache(maxsize=8192)
 def extract_total_line(text: str) -> float | None:
     """Extract total line from question/slug text.
 
     Examples: "233pt5" -> 233.5, "233.5" -> 233.5
     """
-    m = re.search(r"(\d{2,3})pt(\d)", text)
-    if m:
-        return float(m.group(1)) + float(m.group(2)) / 10
-    m = re.search(r"(\d{2,3}\.\d)", text)
-    if m:
-        return float(m.group(1))
+    # Substring prechecks skip the regex entirely for text that can't match.
+    if "pt" in text:
+        m = _LINE_PT_RE.search(text)
+        if m:
+            return float(m.group(1)) + float(m.group(2)) / 10
+    if "." in text:
+        m = _LINE_DEC_RE.search(text)
+        if m:
+            return float(m.group(1))
     return None
 
 
+@lru_cache(maxsize=8192)
 def extract_spread_line(text: str) -> float:
     """Extract spread line from slug text.
 
     Examples: "home-8pt5" -> 8.5
     """
-    m = re.search(r"(\d{1,2})pt(\d)", text)
-    if m:
-        return float(m.group(1)) + float(m.group(2)) / 10
-    m = re.search(r"(\d{1,2}\.\d)", text)
-    if m:
-        return float(m.group(1))
+    if "pt" in text:
+        m = _SPREAD_PT_RE.search(text)
+        if m:
+            return float(m.group(1)) + float(m.group(2)) / 10
+    if "." in text:
+        m = _SPREAD_DEC_RE.search(text)
+        if m:
+            return float(m.group(1))
     return 0.0
@@ -1,7 +1,9 @@
 """Timezone and active-window utilities."""
 from __future__ import annotations
 
-from datetime import datetime, timezone, timedelta
+import time
+from datetime import datetime, timedelta
+from functools import lru_cache
 
 try:
     from zoneinfo import ZoneInfo
@@ -10,10 +12,37 @@ except ImportError:
 
 ET = ZoneInfo("America/New_York")
 
+# [UTC hour bucket, UTC->ET offset in seconds]. DST switches on a whole
+# UTC hour, so re-resolving the offset once per hour is exact.
+_et_offset = [-1, 0.0]
+
+
+@lru_cache(maxsize=256)
+def iso_utc_from_epoch(ts: int) -> str:
+    """Format a Unix timestamp (seconds) as an ISO 8601 UTC string.
+
+    Builds the string from time.gmtime directly instead of going through
+    datetime.fromtimestamp + strftime.
+    """
+    tm = time.gmtime(ts)
+    return (
+        f"{tm.tm_year:04d}-{tm.tm_mon:02d}-{tm.tm_mday:02d}"
+        f"T{tm.tm_hour:02d}:{tm.tm_min:02d}:{tm.tm_sec:02d}Z"
+    )
+
 
 def now_utc() -> str:
     """Current UTC time as ISO 8601 string."""
-    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    return iso_utc_from_epoch(int(time.time()))
+
+
+@lru_cache(maxsize=4096)
+def parse_iso_utc(s: str) -> datetime:
+    """Parse an ISO 8601 UTC string (trailing "Z" allowed) into an aware datetime.
+
+    Cached: commence/trigger times are re-parsed every cycle.
+    """
+    return datetime.fromisoformat(s.replace("Z", "+00:00"))
 
 
 def now_et() -> datetime:
@@ -21,9 +50,25 @@ def now_et() -> datetime:
     return datetime.now(ET)
 
 
+def _et_offset_seconds(ts: float) -> float:
+    """UTC->ET offset for a Unix timestamp, resolved via tzdata once per hour."""
+    bucket = int(ts // 3600)
+    if bucket != _et_offset[0]:
+        _et_offset[1] = datetime.fromtimestamp(ts, ET).utcoffset().total_seconds()
+        _et_offset[0] = bucket
+    return _et_offset[1]
+
+
+def _et_seconds_of_day(ts: float | None = None) -> int:
+    if ts is None:
+        ts = time.time()
+    return int(ts + _et_offset_seconds(ts)) % 86400
+
+
 def now_et_str() -> str:
     """Current ET time formatted as HH:MM:SS ET."""
-    return now_et().strftime("%H:%M:%S ET")
+    s = _et_seconds_of_day()
+    return f"{s // 3600:02d}:{s // 60 % 60:02d}:{s % 60:02d} ET"
 
 
 def is_active_window(start_hour: int = 10, end_hour: int = 3) -> bool:
@@ -31,17 +76,10 @@ def is_active_window(start_hour: int = 10, end_hour: int = 3) -> bool:
 
     Default window: 10:00 ET -> 03:00 ET (next day).
     """
-    hour = now_et().hour
-    if start_hour <= hour or hour < end_hour:
-        return True
-    return False
+    hour = _et_seconds_of_day() // 3600
+    return (hour - start_hour) % 24 < ((end_hour - start_hour) % 24 or 24)
 
 
 def seconds_until_active(start_hour: int = 10, end_hour: int = 3) -> int:
     """Seconds until the next active window starts."""
-    et_now = now_et()
-    target = et_now.replace(hour=start_hour, minute=0, second=0, microsecond=0)
-    diff = (target - et_now).total_seconds()
-    if diff <= 0:
-        diff += 86400
-    return int(diff)
+    return (start_hour * 3600 - _et_seconds_of_day()) % 86400 or 86400
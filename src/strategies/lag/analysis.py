@@ -7,23 +7,41 @@ Moved from monitor/hi_res_analysis.py, now uses HiResRepo.
 """
 from __future__ import annotations
 
+import math
 import statistics
 from datetime import datetime
 from pathlib import Path
 
-from src.db.connection import get_connection
+from src.db.connection import get_read_connection
 from src.db.hi_res_repo import HiResRepo
 
 
 def analyze_gap_t3s(events: list[dict]) -> dict:
-    with_gap = [e for e in events if e["gap_t3s"] is not None]
+    return _gap_stats([e["gap_t3s"] for e in events if e["gap_t3s"] is not None])
 
-    if not with_gap:
+
+def _gap_stats(gaps: list[float]) -> dict:
+    """Summary statistics and verdict for a list of gap_t3s values."""
+    if not gaps:
         return {"n": 0, "mean": None, "median": None, "actionable_rate": None, "verdict": "Insufficient data"}
 
-    gaps = [e["gap_t3s"] for e in with_gap]
-    actionable = [g for g in gaps if g >= 0.04]
-    actionable_rate = len(actionable) / len(gaps)
+    # One pass: Welford mean/variance, actionable count, min and max.
+    n = 0
+    mean = m2 = 0.0
+    actionable_count = 0
+    lo = hi = gaps[0]
+    for g in gaps:
+        n += 1
+        delta = g - mean
+        mean += delta / n
+        m2 += delta * (g - mean)
+        if g >= 0.04:
+            actionable_count += 1
+        if g < lo:
+            lo = g
+        elif g > hi:
+            hi = g
+    actionable_rate = actionable_count / n
 
     if actionable_rate >= 0.30:
         verdict = "A: Promising - gap_t3s >= 4%p in 30%+ of cases"
@@ -33,55 +51,103 @@ def analyze_gap_t3s(events: list[dict]) -> dict:
         verdict = "B: Not viable - gap_t3s >= 4%p in <10% of cases"
 
     return {
-        "n": len(gaps),
-        "mean": statistics.mean(gaps),
+        "n": n,
+        "mean": mean,
         "median": statistics.median(gaps),
-        "std": statistics.stdev(gaps) if len(gaps) > 1 else 0,
-        "min": min(gaps),
-        "max": max(gaps),
-        "actionable_count": len(actionable),
+        "std": math.sqrt(m2 / (n - 1)) if n > 1 else 0,
+        "min": lo,
+        "max": hi,
+        "actionable_count": actionable_count,
         "actionable_rate": actionable_rate,
         "verdict": verdict,
     }
 
 
+_MARKET_TYPES = ("h2h", "totals", "spreads", "moneyline", "total", "spread")
+_TRIGGER_SOURCES = ("oracle_move", "poly_anomaly")
+
+
+def _bucket_events(events: list[dict]) -> dict:
+    """Walk the events once, collecting the counts and gap_t3s groups the report needs.
+
+    Gap values are kept as lists rather than running sums because the
+    report includes medians. Market/trigger groups appear in the fixed
+    category order, for every category that has events (possibly with an
+    empty gap list).
+    """
+    trigger_counts: dict[str, int] = {}
+    market_counts: dict[str, int] = {}
+    gaps: list[float] = []
+    market_gaps: dict[str, list[float]] = {}
+    trigger_gaps: dict[str, list[float]] = {}
+
+    for e in events:
+        src = e["trigger_source"]
+        mt = e["market_type"]
+        g = e["gap_t3s"]
+
+        key = src or "unknown"
+        trigger_counts[key] = trigger_counts.get(key, 0) + 1
+        key = mt or "unknown"
+        market_counts[key] = market_counts.get(key, 0) + 1
+
+        m_bucket = t_bucket = None
+        if mt in _MARKET_TYPES:
+            m_bucket = market_gaps.get(mt)
+            if m_bucket is None:
+                m_bucket = market_gaps[mt] = []
+        if src in _TRIGGER_SOURCES:
+            t_bucket = trigger_gaps.get(src)
+            if t_bucket is None:
+                t_bucket = trigger_gaps[src] = []
+
+        if g is not None:
+            gaps.append(g)
+            if m_bucket is not None:
+                m_bucket.append(g)
+            if t_bucket is not None:
+                t_bucket.append(g)
+
+    return {
+        "trigger_counts": trigger_counts,
+        "market_counts": market_counts,
+        "gaps": gaps,
+        "market_gaps": {k: market_gaps[k] for k in _MARKET_TYPES if k in market_gaps},
+        "trigger_gaps": {k: trigger_gaps[k] for k in _TRIGGER_SOURCES if k in trigger_gaps},
+    }
+
+
 def analyze_by_market(events: list[dict]) -> dict:
-    results = {}
-    for mtype in ["h2h", "totals", "spreads", "moneyline", "total", "spread"]:
-        mtype_events = [e for e in events if e["market_type"] == mtype]
-        if mtype_events:
-            results[mtype] = analyze_gap_t3s(mtype_events)
-    return results
+    groups = _bucket_events(events)["market_gaps"]
+    return {mtype: _gap_stats(gaps) for mtype, gaps in groups.items()}
 
 
 def analyze_by_trigger(events: list[dict]) -> dict:
-    results = {}
-    for source in ["oracle_move", "poly_anomaly"]:
-        source_events = [e for e in events if e["trigger_source"] == source]
-        if source_events:
-            results[source] = analyze_gap_t3s(source_events)
-    return results
+    groups = _bucket_events(events)["trigger_gaps"]
+    return {source: _gap_stats(gaps) for source, gaps in groups.items()}
 
 
 def analyze_gap_decay(events: list[dict]) -> dict:
-    complete = [
-        e for e in events
-        if all(e.get(f"gap_t{t}") is not None for t in ["0", "3s", "10s", "30s"])
-    ]
-
-    if not complete:
+    # One pass with four running sums over events that have all four gaps.
+    n = 0
+    s0 = s3 = s10 = s30 = 0.0
+    for e in events:
+        g0, g3, g10, g30 = e["gap_t0"], e["gap_t3s"], e["gap_t10s"], e["gap_t30s"]
+        if g0 is None or g3 is None or g10 is None or g30 is None:
+            continue
+        n += 1
+        s0 += g0
+        s3 += g3
+        s10 += g10
+        s30 += g30
+
+    if not n:
         return {"n": 0, "decay_rates": None}
 
-    def mean_gap(evts, field):
-        return statistics.mean(e[field] for e in evts)
-
-    t0 = mean_gap(complete, "gap_t0")
-    t3 = mean_gap(complete, "gap_t3s")
-    t10 = mean_gap(complete, "gap_t10s")
-    t30 = mean_gap(complete, "gap_t30s")
+    t0, t3, t10, t30 = s0 / n, s3 / n, s10 / n, s30 / n
 
     return {
-        "n": len(complete),
+        "n": n,
         "mean_gap_t0": t0,
         "mean_gap_t3s": t3,
         "mean_gap_t10s": t10,
@@ -103,24 +169,16 @@ def print_report(events: list[dict]) -> None:
     print("-" * 50)
     print(f"  Total events:  {len(events)}")
 
-    by_trigger: dict[str, int] = {}
-    for e in events:
-        src = e["trigger_source"] or "unknown"
-        by_trigger[src] = by_trigger.get(src, 0) + 1
-    for src, cnt in by_trigger.items():
+    buckets = _bucket_events(events)
+    for src, cnt in buckets["trigger_counts"].items():
         print(f"    {src}: {cnt}")
-
-    by_market: dict[str, int] = {}
-    for e in events:
-        mt = e["market_type"] or "unknown"
-        by_market[mt] = by_market.get(mt, 0) + 1
-    for mt, cnt in by_market.items():
+    for mt, cnt in buckets["market_counts"].items():
         print(f"    {mt}: {cnt}")
     print()
 
     print("## 2. gap_t3s Analysis (Key Metric)")
     print("-" * 50)
-    analysis = analyze_gap_t3s(events)
+    analysis = _gap_stats(buckets["gaps"])
 
     if analysis["n"] == 0:
         print("  Insufficient data")
@@ -139,16 +197,18 @@ def print_report(events: list[dict]) -> None:
 
     print("## 3. By Market Type")
     print("-" * 50)
-    for mtype, a in analyze_by_market(events).items():
-        if a["n"] > 0:
+    for mtype, gaps in buckets["market_gaps"].items():
+        if gaps:
+            a = _gap_stats(gaps)
             print(f"  [{mtype}] N={a['n']}, Mean={a['mean']*100:.1f}%p, "
                   f"Actionable={a['actionable_rate']*100:.1f}%")
     print()
 
     print("## 4. By Trigger Source")
     print("-" * 50)
-    for src, a in analyze_by_trigger(events).items():
-        if a["n"] > 0:
+    for src, gaps in buckets["trigger_gaps"].items():
+        if gaps:
+            a = _gap_stats(gaps)
             print(f"  [{src}] N={a['n']}, Mean={a['mean']*100:.1f}%p, "
                   f"Actionable={a['actionable_rate']*100:.1f}%")
     print()
@@ -191,7 +251,7 @@ def main(db_path: Path) -> None:
         print(f"DB not found: {db_path}")
         return
 
-    conn = get_connection(db_path)
+    conn = get_read_connection(db_path)
     tables = conn.execute(
         "SELECT name FROM sqlite_master WHERE type='table' AND name='move_events_hi_res'"
     ).fetchone()
@@ -9,11 +9,14 @@ Moved from monitor/anomaly_detector.py (as-is logic, uses config).
 """
 from __future__ import annotations
 
+import bisect
 import time
 import threading
+from array import array
 from typing import Dict, List, Optional, Any, Callable
 from collections import defaultdict
 from dataclasses import dataclass, field
+from functools import lru_cache
 
 from src.config import AnomalyConfig
 
@@ -34,7 +37,26 @@ class AnomalyEvent:
         )
 
 
+@lru_cache(maxsize=1024)
+def _normalize_outcome(outcome: str) -> str:
+    """Map an outcome name onto its yes/no side (other names lower-cased).
+
+    Cached: the same few outcome strings arrive on every tick.
+    """
+    o = outcome.lower()
+    if o in ("yes", "over", "home"):
+        return "yes"
+    elif o in ("no", "under", "away"):
+        return "no"
+    return o
+
+
 class AnomalyDetector:
+    # Aged-out prefix length at which a key's arrays are compacted in place.
+    _COMPACT_AT = 256
+    # State is keyed by game, so each game's updates only contend on its stripe.
+    _LOCK_STRIPES = 16
+
     def __init__(self, config: AnomalyConfig | None = None):
         cfg = config or AnomalyConfig()
         self.price_threshold = cfg.price_change_threshold
@@ -43,7 +65,14 @@ class AnomalyDetector:
         self.yes_no_threshold = cfg.yes_no_deviation_threshold
         self.cooldown_seconds = cfg.pinnacle_cooldown_seconds
 
-        self._price_history: Dict[tuple, List[tuple]] = defaultdict(list)
+        # Per-outcome ticks inside the price window as parallel float64
+        # arrays (timestamps ascending, prices); entries before _head[key]
+        # have aged out but are not yet compacted. _price_baseline holds the
+        # newest aged-out tick, the comparison baseline.
+        self._ts: Dict[tuple, array] = defaultdict(lambda: array("d"))
+        self._px: Dict[tuple, array] = defaultdict(lambda: array("d"))
+        self._head: Dict[tuple, int] = defaultdict(int)
+        self._price_baseline: Dict[tuple, tuple] = {}
         self._orderbook: Dict[tuple, Dict[str, float]] = {}
         self._price_pairs: Dict[tuple, Dict[str, float]] = defaultdict(dict)
         self._pinnacle_cooldown: Dict[str, float] = {}
@@ -56,7 +85,15 @@ class AnomalyDetector:
             "pinnacle_triggers": 0,
             "cooldown_blocks": 0,
         }
-        self._lock = threading.Lock()
+        self._locks = [threading.Lock() for _ in range(self._LOCK_STRIPES)]
+        self._stats_lock = threading.Lock()
+
+    def _lock_for(self, game_id: str) -> threading.Lock:
+        return self._locks[hash(game_id) % self._LOCK_STRIPES]
+
+    def _count(self, stat: str) -> None:
+        with self._stats_lock:
+            self._stats[stat] += 1
 
     def on_anomaly(self, callback: Callable[[AnomalyEvent], None]):
         self._anomaly_callbacks.append(callback)
@@ -74,22 +111,23 @@ class AnomalyDetector:
         key = (game_id, market_type, outcome)
         pair_key = (game_id, market_type)
 
-        with self._lock:
-            self._price_history[key].append((ts, price))
-            self._cleanup_history(key, ts)
+        with self._lock_for(game_id):
+            self._ts[key].append(ts)
+            self._px[key].append(price)
+            self._advance_window(key, ts)
 
-            normalized = self._normalize_outcome(outcome)
+            normalized = _normalize_outcome(outcome)
             self._price_pairs[pair_key][normalized] = price
 
-            anomaly = self._check_price_anomaly(game_id, market_type, key, price, ts)
-            if anomaly:
-                return anomaly
-
-            anomaly = self._check_yes_no_anomaly(game_id, market_type, pair_key, ts)
-            if anomaly:
-                return anomaly
+            anomaly = (
+                self._check_price_anomaly(game_id, market_type, key, price, ts)
+                or self._check_yes_no_anomaly(game_id, market_type, pair_key, ts)
+            )
 
-        return None
+        # Callbacks run outside the lock so they may call back into the detector.
+        if anomaly:
+            self._fire_anomaly(anomaly)
+        return anomaly
 
     def update_orderbook(
         self,
@@ -103,70 +141,66 @@ class AnomalyDetector:
         ts = timestamp or time.time()
         key = (game_id, market_type, outcome)
 
-        with self._lock:
+        with self._lock_for(game_id):
             self._orderbook[key] = {"bid": best_bid, "ask": best_ask}
 
-            if best_bid <= 0.02 or best_ask >= 0.98:
-                return None
+        if best_bid <= 0.02 or best_ask >= 0.98:
+            return None
 
-            spread = best_ask - best_bid
-            if spread >= self.spread_threshold:
-                self._stats["spread_anomalies"] += 1
-                event = AnomalyEvent(
-                    game_id=game_id,
-                    market_type=market_type,
-                    anomaly_type="orderbook_spread",
-                    timestamp=ts,
-                    details={
-                        "outcome": outcome,
-                        "best_bid": best_bid,
-                        "best_ask": best_ask,
-                        "spread": spread,
-                    },
-                )
-                self._fire_anomaly(event)
-                return event
+        spread = best_ask - best_bid
+        if spread >= self.spread_threshold:
+            self._count("spread_anomalies")
+            event = AnomalyEvent(
+                game_id=game_id,
+                market_type=market_type,
+                anomaly_type="orderbook_spread",
+                timestamp=ts,
+                details={
+                    "outcome": outcome,
+                    "best_bid": best_bid,
+                    "best_ask": best_ask,
+                    "spread": spread,
+                },
+            )
+            self._fire_anomaly(event)
+            return event
 
         return None
 
     def should_call_pinnacle(self, game_id: str) -> bool:
-        now = time.time()
-        with self._lock:
-            last_call = self._pinnacle_cooldown.get(game_id, 0)
-            if now - last_call < self.cooldown_seconds:
-                self._stats["cooldown_blocks"] += 1
-                return False
-            return True
+        now = time.monotonic()
+        with self._lock_for(game_id):
+            last_call = self._pinnacle_cooldown.get(game_id)
+        if last_call is not None and now - last_call < self.cooldown_seconds:
+            self._count("cooldown_blocks")
+            return False
+        return True
 
     def mark_pinnacle_called(self, game_id: str) -> None:
-        with self._lock:
-            self._pinnacle_cooldown[game_id] = time.time()
-            self._stats["pinnacle_triggers"] += 1
+        with self._lock_for(game_id):
+            self._pinnacle_cooldown[game_id] = time.monotonic()
+        self._count("pinnacle_triggers")
 
     def get_stats(self) -> Dict[str, Any]:
-        return dict(self._stats)
+        with self._stats_lock:
+            return dict(self._stats)
 
     def _check_price_anomaly(self, game_id, market_type, key, current_price, now):
-        history = self._price_history[key]
-        if len(history) < 2:
-            return None
-
-        cutoff = now - self.price_window
-        old_price = None
-        for ts, price in history:
-            if ts >= cutoff:
-                break
-            old_price = price
-
-        if old_price is None:
-            if len(history) >= 2:
-                old_price = history[0][1]
-            else:
+        # Compare against the newest tick older than the window, unless it
+        # is more than 60s older still; then fall back to the oldest tick
+        # inside the window.
+        baseline = self._price_baseline.get(key)
+        if baseline is not None and baseline[0] >= now - self.price_window - 60:
+            old_price = baseline[1]
+        else:
+            head = self._head[key]
+            if len(self._ts[key]) - head < 2:
                 return None
+            old_price = self._px[key][head]
 
         delta = current_price - old_price
         if abs(delta) >= self.price_threshold:
-            self._stats["price_anomalies"] += 1
+            self._count("price_anomalies")
             event = AnomalyEvent(
                 game_id=game_id,
                 market_type=market_type,
@@ -180,7 +214,6 @@ class AnomalyDetector:
                     "window_seconds": self.price_window,
                 },
             )
-            self._fire_anomaly(event)
             return event
         return None
 
@@ -196,7 +229,7 @@ class AnomalyDetector:
         deviation = abs(1.0 - total)
 
         if deviation >= self.yes_no_threshold:
-            self._stats["yes_no_anomalies"] += 1
+            self._count("yes_no_anomalies")
             event = AnomalyEvent(
                 game_id=game_id,
                 market_type=market_type,
@@ -210,23 +243,23 @@ class AnomalyDetector:
                     "arbitrage_opportunity": total < 1.0 - 0.01,
                 },
             )
-            self._fire_anomaly(event)
             return event
         return None
 
-    def _normalize_outcome(self, outcome: str) -> str:
-        o = outcome.lower()
-        if o in ("yes", "over", "home"):
-            return "yes"
-        elif o in ("no", "under", "away"):
-            return "no"
-        return o
-
-    def _cleanup_history(self, key, now):
-        cutoff = now - self.price_window - 60
-        history = self._price_history[key]
-        while history and history[0][0] < cutoff:
-            history.pop(0)
+    def _advance_window(self, key, now):
+        cutoff = now - self.price_window
+        timestamps = self._ts[key]
+        head = self._head[key]
+        if timestamps[head] >= cutoff:
+            return
+        head = bisect.bisect_left(timestamps, cutoff, head)
+        prices = self._px[key]
+        self._price_baseline[key] = (timestamps[head - 1], prices[head - 1])
+        if head >= self._COMPACT_AT and head * 2 >= len(timestamps):
+            del timestamps[:head]
+            del prices[:head]
+            head = 0
+        self._head[key] = head
 
     def _fire_anomaly(self, event):
         for cb in self._anomaly_callbacks:
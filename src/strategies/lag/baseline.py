@@ -0,0 +1,80 @@
+"""Per-game running baseline of Pinnacle total lines (Welford's algorithm).
+
+Keeps count/mean/M2 per game so a new line can be compared against
+mean +- k*std in O(1), without re-reading snapshot history.
+"""
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+
+
+@dataclass
+class WelfordState:
+    """Running count, mean and sum of squared deviations (M2)."""
+    n: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+
+    def update(self, x: float) -> None:
+        self.n += 1
+        delta = x - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (x - self.mean)
+
+    @property
+    def std(self) -> float:
+        """Sample standard deviation (0.0 until two samples are seen)."""
+        if self.n < 2:
+            return 0.0
+        return math.sqrt(self.m2 / (self.n - 1))
+
+
+class LineBaseline:
+    """Welford state per game_id, with dirty tracking for periodic persistence."""
+
+    def __init__(self, min_samples: int = 20):
+        self.min_samples = min_samples
+        self._states: dict[str, WelfordState] = {}
+        self._dirty: set[str] = set()
+        self.updates_since_flush = 0
+
+    def load(self, rows: list[tuple]) -> None:
+        """Restore state from (game_id, n, mean, m2) rows."""
+        for game_id, n, mean, m2 in rows:
+            self._states[game_id] = WelfordState(n, mean, m2)
+
+    def is_outlier(self, game_id: str, line: float, k: float) -> bool:
+        """True if line lies outside mean +- k*std of the game's baseline so far."""
+        state = self._states.get(game_id)
+        if state is None or state.n < self.min_samples:
+            return False
+        std = state.std
+        return std > 0 and abs(line - state.mean) > k * std
+
+    def update(self, game_id: str, line: float) -> None:
+        state = self._states.get(game_id)
+        if state is None:
+            state = self._states[game_id] = WelfordState()
+        state.update(line)
+        self._dirty.add(game_id)
+        self.updates_since_flush += 1
+
+    def drop(self, game_ids: list[str]) -> None:
+        """Forget the given games' state (e.g. finished games).
+
+        Games with unflushed updates are kept; the next flush rewrites them.
+        """
+        for gid in game_ids:
+            if gid not in self._dirty:
+                self._states.pop(gid, None)
+
+    def drain_dirty(self) -> list[tuple]:
+        """Return (game_id, n, mean, m2) for changed games and reset the counter."""
+        rows = []
+        for gid in self._dirty:
+            s = self._states[gid]
+            rows.append((gid, s.n, s.mean, s.m2))
+        self._dirty.clear()
+        self.updates_since_flush = 0
+        return rows
@@ -7,11 +7,13 @@ Moved from monitor/hi_res_capture.py, now uses HiResRepo.
 """
 from __future__ import annotations
 
+import sched
 import threading
 import time
 from typing import Callable, Dict, List, Optional, Any
 
 from src.config import HiResConfig
+from src.db.connection import write_transaction
 from src.db.hi_res_repo import HiResRepo
 
 
@@ -25,10 +27,20 @@ class HiResCapture:
     ):
         self.repo = repo
         self.config = config or HiResConfig()
-        self._active_captures: Dict[int, List[threading.Thread]] = {}
+        # Pending captures run on one worker thread; _wakeup guards queue
+        # changes so the worker never misses a newly scheduled capture.
+        self._scheduler = sched.scheduler(time.monotonic, time.sleep)
+        self._wakeup = threading.Condition()
+        self._worker: Optional[threading.Thread] = None
+        # Capture rows measured in the current worker pass (worker thread only).
+        self._pending: List[tuple] = []
         self._price_getter: Optional[Callable] = None
         self._orderbook_getter: Optional[Callable] = None
         self._lock = threading.Lock()
+        # Serialises repo transactions from the caller's thread
+        # (record_move_event) and the capture worker. The repo's connection
+        # must not be written by anyone else (see write_transaction).
+        self._db_lock = threading.Lock()
         self._stats = {
             "captures_scheduled": 0,
             "captures_completed": 0,
@@ -68,25 +80,26 @@ class HiResCapture:
         if oracle_new_implied is not None and poly_t0 is not None:
             gap_t0 = abs(oracle_new_implied - poly_t0)
 
-        event_id = self.repo.insert_move_event(
-            game_key=game_key,
-            market_type=market_type,
-            move_ts_unix=move_ts,
-            oracle_prev_implied=oracle_prev_implied,
-            oracle_new_implied=oracle_new_implied,
-            oracle_delta=oracle_delta,
-            poly_t0=poly_t0,
-            gap_t0=gap_t0,
-            poly_line=poly_line,
-            oracle_line=oracle_line,
-            depth_t0=depth_t0,
-            spread_t0=spread_t0,
-            trigger_source=trigger_source,
-            outcome_name=outcome_name,
-        )
-
-        if event_id is not None:
-            self.repo.insert_gap_series(event_id, 0, poly_t0, gap_t0, depth=depth_t0)
+        # Event row and its t0 gap point are committed together.
+        with self._db_lock, write_transaction(self.repo.conn):
+            event_id = self.repo.insert_move_event(
+                game_key=game_key,
+                market_type=market_type,
+                move_ts_unix=move_ts,
+                oracle_prev_implied=oracle_prev_implied,
+                oracle_new_implied=oracle_new_implied,
+                oracle_delta=oracle_delta,
+                poly_t0=poly_t0,
+                gap_t0=gap_t0,
+                poly_line=poly_line,
+                oracle_line=oracle_line,
+                depth_t0=depth_t0,
+                spread_t0=spread_t0,
+                trigger_source=trigger_source,
+                outcome_name=outcome_name,
+            )
+            if event_id is not None:
+                self.repo.insert_gap_series(event_id, 0, poly_t0, gap_t0, depth=depth_t0)
 
         return event_id
 
@@ -102,22 +115,35 @@ class HiResCapture:
         if self._price_getter is None:
             return
 
-        threads = []
-        for offset in self.config.offsets:
-            t = threading.Thread(
-                target=self._capture_at_offset,
-                args=(move_event_id, game_key, market_type, outcome, oracle_implied, offset),
-                daemon=True,
-            )
-            t.start()
-            threads.append(t)
-
         with self._lock:
-            self._active_captures[move_event_id] = threads
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._run_captures, name="hi-res-captures", daemon=True,
+                )
+                self._worker.start()
             self._stats["captures_scheduled"] += len(self.config.offsets)
 
+        with self._wakeup:
+            for offset in self.config.offsets:
+                self._scheduler.enter(
+                    offset, 1, self._capture_at_offset,
+                    (move_event_id, game_key, market_type, outcome, oracle_implied, offset),
+                )
+            self._wakeup.notify()
+
+    def _run_captures(self) -> None:
+        """Worker loop: run due captures, write them together, then sleep until the next is due."""
+        while True:
+            self._scheduler.run(blocking=False)
+            self._flush_captures()
+            with self._wakeup:
+                queue = self._scheduler.queue
+                if not queue:
+                    self._wakeup.wait()
+                else:
+                    self._wakeup.wait(max(0.0, queue[0].time - time.monotonic()))
+
     def _capture_at_offset(self, move_event_id, game_key, market_type, outcome, oracle_implied, offset_sec):
-        time.sleep(offset_sec)
         try:
             poly_price = self._price_getter(game_key, market_type, outcome)
 
@@ -131,10 +157,7 @@ class HiResCapture:
 
             gap = abs(oracle_implied - poly_price)
 
-            self.repo.insert_gap_series(move_event_id, offset_sec, poly_price, gap, bid, ask, depth)
-            self.repo.update_capture(move_event_id, offset_sec, poly_price, gap)
-
-            self._stats["captures_completed"] += 1
+            self._pending.append((move_event_id, offset_sec, poly_price, gap, bid, ask, depth))
 
             if gap >= self.config.actionable_gap:
                 print(f"  [HiRes] t+{offset_sec}s: gap={gap*100:.1f}%p (poly={poly_price:.3f}) **ACTIONABLE**")
@@ -145,5 +168,20 @@ class HiResCapture:
             print(f"[HiResCapture] t+{offset_sec}s capture failed: {e}")
             self._stats["captures_failed"] += 1
 
+    def _flush_captures(self) -> None:
+        """Write every capture measured in this pass in one transaction."""
+        rows = self._pending
+        if not rows:
+            return
+        self._pending = []
+        try:
+            with self._db_lock, write_transaction(self.repo.conn):
+                self.repo.insert_gap_series_many(rows)
+                self.repo.update_capture_many([row[:4] for row in rows])
+            self._stats["captures_completed"] += len(rows)
+        except Exception as e:
+            print(f"[HiResCapture] writing {len(rows)} captures failed: {e}")
+            self._stats["captures_failed"] += len(rows)
+
     def get_stats(self) -> Dict[str, Any]:
         return dict(self._stats)
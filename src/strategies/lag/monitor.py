@@ -9,12 +9,15 @@ API calls, DB, config, and utilities are now in shared modules.
 """
 from __future__ import annotations
 
-import json
+import heapq
+import logging
 import re
 import signal
+import sqlite3
 import sys
 import threading
 import time
+from contextlib import contextmanager
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 
@@ -23,28 +26,35 @@ from src.clients.gamma import GammaClient
 from src.clients.odds import OddsClient
 from src.clients.data_api import DataAPIClient
 from src.clients.websocket import PolyWebSocket, AssetPriceTracker
-from src.db.connection import get_connection
+from src.db.connection import checkpoint, get_connection, optimize
 from src.db.game_mapping_repo import GameMappingRepo
 from src.db.pinnacle_repo import PinnacleRepo
 from src.db.poly_repo import PolyRepo
 from src.db.triggers_repo import TriggersRepo
 from src.db.bot_trades_repo import BotTradesRepo
+from src.db.baselines_repo import BaselinesRepo
 from src.db.hi_res_repo import HiResRepo
 from src.db.paper_trades_repo import PaperTradesRepo
+from src.shared.json_utils import loads
 from src.shared.nba import classify_market, extract_total_line, extract_spread_line
-from src.shared.time_utils import now_utc, now_et, now_et_str, is_active_window, seconds_until_active
+from src.shared.time_utils import (
+    now_utc, now_et, now_et_str, is_active_window, seconds_until_active,
+    iso_utc_from_epoch, parse_iso_utc,
+)
 from src.shared.math_utils import de_vig_implied
 from src.strategies.lag.anomaly import AnomalyDetector, AnomalyEvent
+from src.strategies.lag.baseline import LineBaseline
 from src.strategies.lag.hi_res import HiResCapture
 from src.strategies.lag.paper_trading import PaperTradingEngine
 
-running = True
+log = logging.getLogger(__name__)
+
+_stop = threading.Event()
 
 
 def _signal_handler(sig, frame):
-    global running
     print("\n[STOP] Shutting down...")
-    running = False
+    _stop.set()
 
 
 def _match_team_name(poly_outcome: str, api_outcomes: list) -> int | None:
@@ -66,20 +76,108 @@ def _match_team_name(poly_outcome: str, api_outcomes: list) -> int | None:
     return None
 
 
+def _screen_move(
+    prev: tuple, game: dict, line_outlier: bool,
+    line_threshold: float, implied_threshold: float,
+) -> tuple[str | None, float, float]:
+    """Classify a Pinnacle move from the previous snapshot (pure arithmetic).
+
+    Returns (trigger_type or None, delta_line, delta_under).
+    """
+    prev_line, prev_over_imp, prev_under_imp, _ = prev
+    new_line = game["line"]
+    new_over_imp = game["over_implied"]
+    new_under_imp = game["under_implied"]
+
+    delta_line = new_line - prev_line if (new_line and prev_line) else 0
+    delta_under = (new_under_imp - prev_under_imp) if (new_under_imp and prev_under_imp) else 0
+    delta_over = (new_over_imp - prev_over_imp) if (new_over_imp and prev_over_imp) else 0
+
+    trigger_type = None
+    if abs(delta_line) >= line_threshold or (line_outlier and delta_line):
+        trigger_type = "line_move"
+    if abs(delta_under) >= implied_threshold or abs(delta_over) >= implied_threshold:
+        trigger_type = "both" if trigger_type else "implied_move"
+    return trigger_type, delta_line, delta_under
+
+
+def _group_slugs_by_length(slug_map: dict[str, str]) -> list[tuple[int, dict[str, str]]]:
+    """Bucket {event_slug: game_id} by slug length, longest first.
+
+    Event slugs are almost always "nba-xxx-yyy-YYYY-MM-DD", so this is
+    usually a single bucket.
+    """
+    groups: dict[int, dict[str, str]] = {}
+    for slug, game_id in slug_map.items():
+        groups.setdefault(len(slug), {})[slug] = game_id
+    return sorted(groups.items(), reverse=True)
+
+
+def _match_event_slug(
+    market_slug: str, slug_groups: list[tuple[int, dict[str, str]]],
+) -> str | None:
+    """Return the game_id whose event slug prefixes market_slug, if any."""
+    for length, table in slug_groups:
+        game_id = table.get(market_slug[:length])
+        if game_id:
+            return game_id
+    return None
+
+
+def _wanted_tokens(
+    token_to_game: dict[str, str], market_tokens: dict[str, list[dict]],
+) -> set[str]:
+    """Token IDs to stay subscribed to after a market token refresh.
+
+    Games missing from market_tokens (lookup failed) keep their current
+    tokens; games Gamma answered keep exactly their open-market tokens, so
+    a game whose markets have all closed drops out entirely.
+    """
+    wanted = {tid for tid, gid in token_to_game.items() if gid not in market_tokens}
+    for tokens in market_tokens.values():
+        wanted.update(t["token_id"] for t in tokens)
+    return wanted
+
+
+def _forget_tokens(
+    removed: list[str],
+    token_to_game: dict[str, str],
+    token_to_info: dict[str, dict],
+    outcome_tokens: dict[tuple[str, str, str], str],
+) -> None:
+    """Drop unsubscribed token IDs from the WS lookup maps."""
+    gone = set(removed)
+    for token_id in gone:
+        token_to_game.pop(token_id, None)
+        token_to_info.pop(token_id, None)
+    for key in [k for k, tid in outcome_tokens.items() if tid in gone]:
+        del outcome_tokens[key]
+
+
 class LagMonitor:
     """Main orchestrator for the Pinnacle-Polymarket lag strategy."""
 
     def __init__(self, config: AppConfig):
         self.config = config
+        # Shared by the main loop and the WS callback thread; write blocks
+        # serialize on db_lock via _txn/_batch. In run_ws, hi-res capture
+        # gets a connection of its own (its write_transaction blocks
+        # serialize on the capture's lock) and paper trading another (its
+        # repo calls are single-statement commits). WAL allows the extra
+        # connections; writers wait on the busy timeout.
         self.conn = get_connection(config.db_path, thread_safe=True)
+        self.db_lock = threading.RLock()
+        self._hi_res_conn = None
+        self._paper_conn = None
 
         # Repos
         self.game_repo = GameMappingRepo(self.conn)
+        self.game_repo.warm()
         self.pin_repo = PinnacleRepo(self.conn)
         self.poly_repo = PolyRepo(self.conn)
         self.triggers_repo = TriggersRepo(self.conn)
         self.bot_repo = BotTradesRepo(self.conn)
-        self.hi_res_repo = HiResRepo(self.conn)
+        self.baselines_repo = BaselinesRepo(self.conn)
 
         # Clients
         self.odds_client = OddsClient(config.odds)
@@ -89,6 +187,52 @@ class LagMonitor:
         # State
         self.pinnacle_data: list[dict] = []
         self.pinnacle_data_lock = threading.Lock()
+        self._poly_miss_until: dict[str, float] = {}  # game_id -> monotonic retry time
+        self._batch_depth = 0
+        # (slug map size, length-bucketed index); the map only grows, so its
+        # size says whether the index is stale.
+        self._slug_groups: tuple[int, list] = (-1, [])
+        self.line_baseline = LineBaseline(min_samples=config.lag.baseline_min_samples)
+        self.line_baseline.load(self.baselines_repo.load_all())
+        self._prune_baselines()
+
+    # ── Transactions ──────────────────────────────────────
+
+    @contextmanager
+    def _txn(self):
+        """Commit on exit, unless running inside _batch (which commits once)."""
+        with self.db_lock:
+            if self._batch_depth:
+                yield
+                return
+            try:
+                with self.conn:
+                    yield
+            except BaseException:
+                self._after_rollback()
+                raise
+
+    @contextmanager
+    def _batch(self):
+        """Group several steps' writes into one commit (one WAL sync).
+
+        db_lock is held for the whole block, so do network work before
+        entering it.
+        """
+        with self.db_lock:
+            self._batch_depth += 1
+            try:
+                with self.conn:
+                    yield
+            except BaseException:
+                self._after_rollback()
+                raise
+            finally:
+                self._batch_depth -= 1
+
+    def _after_rollback(self) -> None:
+        """Reload write-through caches that may hold rows the rollback undid."""
+        self.game_repo.invalidate()
 
     # ── Pinnacle fetching ─────────────────────────────────
 
@@ -98,6 +242,11 @@ class LagMonitor:
 
         snap_time = now_utc()
         results = []
+        pin_rows: list[tuple] = []
+        mappings: list[tuple] = []
+        # Local aliases for the per-outcome loop below.
+        add_row = pin_rows.append
+        add_result = results.append
 
         for game in games:
             game_id = game["id"]
@@ -105,7 +254,7 @@ class LagMonitor:
             away = game["away_team"]
             commence = game.get("commence_time", "")
 
-            self.game_repo.upsert(game_id, home, away, commence)
+            mappings.append((game_id, home, away, commence))
 
             for bm in game.get("bookmakers", []):
                 if bm["key"] != "pinnacle":
@@ -114,71 +263,116 @@ class LagMonitor:
                     if market["key"] != "totals":
                         continue
 
-                    over_price = under_price = total_line = None
-                    for outcome in market["outcomes"]:
-                        if outcome["name"] == "Over":
-                            over_price = outcome["price"]
-                            total_line = outcome["point"]
-                        elif outcome["name"] == "Under":
-                            under_price = outcome["price"]
-
-                    if total_line is None:
+                    outs = {o["name"]: o for o in market["outcomes"]}
+                    over = outs.get("Over")
+                    if over is None or over.get("point") is None:
                         continue
+                    under = outs.get("Under")
+
+                    total_line = over["point"]
+                    over_price = over["price"]
+                    under_price = under["price"] if under else None
 
                     over_implied = 1 / over_price if over_price else None
                     under_implied = 1 / under_price if under_price else None
 
-                    self.pin_repo.insert_snapshot(
+                    add_row((
                         game_id, snap_time, total_line,
                         over_price, under_price, over_implied, under_implied,
-                    )
+                    ))
 
-                    results.append({
+                    add_result({
                         "game_id": game_id, "home": home, "away": away,
-                        "line": total_line, "over_price": over_price,
+                        "commence": commence, "line": total_line, "over_price": over_price,
                         "under_price": under_price,
                         "over_implied": over_implied, "under_implied": under_implied,
                     })
 
-        self.game_repo.commit()
-        self.pin_repo.commit()
+        with self._txn():
+            for mapping in mappings:
+                self.game_repo.upsert(*mapping)
+            self.pin_repo.insert_snapshots(pin_rows)
         return results
 
     # ── Polymarket fetching ───────────────────────────────
 
     def fetch_polymarket(self, games: list[dict]) -> int:
-        snap_time = now_utc()
-        found = 0
+        return self._store_polymarket(*self._collect_polymarket(games))
+
+    def _collect_polymarket(self, games: list[dict]) -> tuple[list[str], list[tuple]]:
+        """Network phase of fetch_polymarket: (found game_ids, snapshot rows).
 
+        Touches no DB write, so callers run it before taking db_lock.
+        """
+        cfg = self.config.lag
+        snap_time = now_utc()
+        poly_rows: list[tuple] = []
+        found_ids: list[str] = []
+
+        # Commence times are parsed (parse_iso_utc is cached, so each game's
+        # string is parsed once) rather than compared as strings, which
+        # breaks on fractional seconds or a "+00:00" suffix.
+        now_ts = time.time()
+        earliest = now_ts - cfg.poly_lookback_hours * 3600
+        latest = now_ts + cfg.poly_lookahead_hours * 3600
+        now_mono = time.monotonic()
+
+        pending: list[tuple[str, str]] = []  # (game_id, event slug)
         for game in games:
             game_id = game["game_id"]
             slug = self.game_repo.get_slug(game_id)
             if not slug:
                 continue
 
-            events = self.gamma_client.get_event_by_slug(slug)
-            if not events:
+            # Skip games far in the future or long finished, and games whose
+            # event Gamma recently said it doesn't have (negative-lookup
+            # backoff; failed requests don't start it).
+            commence = game.get("commence")
+            if commence:
+                try:
+                    commence_ts = parse_iso_utc(commence).timestamp()
+                except ValueError:
+                    commence_ts = None
+                if commence_ts is not None and not (earliest <= commence_ts <= latest):
+                    continue
+            if self._poly_miss_until.get(game_id, 0) > now_mono:
                 continue
+            pending.append((game_id, slug))
 
-            self.game_repo.mark_found(game_id)
-            event = events[0]
+        events_by_slug = self.gamma_client.get_events_by_slugs([s for _, s in pending])
+
+        # Local aliases for the per-market loop below.
+        add_row = poly_rows.append
+        _float = float
+        _loads = loads
+        classify = classify_market
+
+        for game_id, slug in pending:
+            if slug not in events_by_slug:
+                self._poly_miss_until[game_id] = now_mono + cfg.poly_miss_backoff
+                continue
+            event = events_by_slug[slug]
+            if event is None:  # request failed; retry on the next tick
+                continue
+            self._poly_miss_until.pop(game_id, None)
+            found_ids.append(game_id)
 
             for m in event.get("markets", []):
+                if m.get("closed", False):
+                    continue
+
                 q = m.get("question") or ""
                 market_slug = m.get("slug", "")
-                market_type = classify_market(q, market_slug)
-
+                market_type = classify(q, market_slug)
                 if market_type in ("player_prop", "other"):
                     continue
-                if m.get("closed", False):
-                    continue
 
                 outcomes = m.get("outcomes", [])
                 prices = m.get("outcomePrices", [])
                 if isinstance(outcomes, str):
-                    outcomes = json.loads(outcomes)
+                    outcomes = _loads(outcomes)
                 if isinstance(prices, str):
-                    prices = json.loads(prices)
+                    prices = _loads(prices)
 
                 line = None
                 if market_type == "total":
@@ -190,29 +384,29 @@ class LagMonitor:
 
                 over_price = under_price = None
                 if market_type == "total":
-                    for i, name in enumerate(outcomes):
-                        p = float(prices[i]) if i < len(prices) else None
-                        if p is None:
-                            continue
+                    for name, p_raw in zip(outcomes, prices):
                         if "over" in name.lower():
-                            over_price = p
+                            over_price = _float(p_raw)
                         else:
-                            under_price = p
+                            under_price = _float(p_raw)
                 else:
-                    price1 = float(prices[0]) if len(prices) > 0 else None
-                    price2 = float(prices[1]) if len(prices) > 1 else None
-                    over_price = price1
-                    under_price = price2
+                    if prices:
+                        over_price = _float(prices[0])
+                    if len(prices) > 1:
+                        under_price = _float(prices[1])
 
-                self.poly_repo.insert_snapshot(
+                add_row((
                     game_id, market_slug, snap_time, line,
                     over_price, under_price, market_type,
-                )
-                found += 1
+                ))
+
+        return found_ids, poly_rows
 
-        self.game_repo.commit()
-        self.poly_repo.commit()
-        return found
+    def _store_polymarket(self, found_ids: list[str], poly_rows: list[tuple]) -> int:
+        with self._txn():
+            self.game_repo.mark_found_many(found_ids)
+            self.poly_repo.insert_snapshots(poly_rows)
+        return len(poly_rows)
 
     # ── Move detection ────────────────────────────────────
 
@@ -220,31 +414,45 @@ class LagMonitor:
                      price_getter=None) -> list[dict]:
         cfg = self.config.lag
         triggers = []
+        trigger_rows: list[tuple] = []
+        trigger_time = now_utc()
+        prevs = self.pin_repo.get_previous_many([g["game_id"] for g in current])
+        baseline = self.line_baseline
 
+        # Pass 1: arithmetic-only screen over every game; no I/O.
+        moved = []
         for game in current:
             game_id = game["game_id"]
-            prev = self.pin_repo.get_previous(game_id)
+            prev = prevs.get(game_id)
+            # The baseline only sees line changes (plus a game's first
+            # line): repeated polls of an unchanged line would shrink its
+            # std toward 0. Compare before folding the new line in.
+            line_outlier = False
+            line = game["line"]
+            if line is not None and (not prev or line != prev[0]):
+                if cfg.line_zscore_threshold > 0:
+                    line_outlier = baseline.is_outlier(
+                        game_id, line, cfg.line_zscore_threshold,
+                    )
+                baseline.update(game_id, line)
+
             if not prev:
                 continue
+            trigger_type, delta_line, delta_under = _screen_move(
+                prev, game, line_outlier,
+                cfg.line_move_threshold, cfg.implied_move_threshold,
+            )
+            if trigger_type:
+                moved.append((game, prev, trigger_type, delta_line, delta_under))
 
-            prev_line, prev_over_imp, prev_under_imp, prev_time = prev
+        # Pass 2: Poly lookups and hi-res capture only for games that moved.
+        for game, prev, trigger_type, delta_line, delta_under in moved:
+            game_id = game["game_id"]
+            prev_line, prev_over_imp, prev_under_imp, _ = prev
             new_line = game["line"]
             new_over_imp = game["over_implied"]
             new_under_imp = game["under_implied"]
 
-            delta_line = new_line - prev_line if (new_line and prev_line) else 0
-            delta_under = (new_under_imp - prev_under_imp) if (new_under_imp and prev_under_imp) else 0
-            delta_over = (new_over_imp - prev_over_imp) if (new_over_imp and prev_over_imp) else 0
-
-            trigger_type = None
-            if abs(delta_line) >= cfg.line_move_threshold:
-                trigger_type = "line_move"
-            if abs(delta_under) >= cfg.implied_move_threshold or abs(delta_over) >= cfg.implied_move_threshold:
-                trigger_type = "both" if trigger_type else "implied_move"
-
-            if not trigger_type:
-                continue
-
             poly_over = poly_under = poly_line = None
             if price_getter:
                 poly_over = price_getter(game_id, "total", "Over")
@@ -259,15 +467,13 @@ class LagMonitor:
             poly_gap_under = (new_under_imp - poly_under) if (new_under_imp and poly_under) else None
             poly_gap_over = (new_over_imp - poly_over) if (new_over_imp and poly_over) else None
 
-            trigger_time = now_utc()
-
-            self.triggers_repo.insert_trigger(
+            trigger_rows.append((
                 game_id, trigger_time, trigger_type,
                 prev_line, prev_over_imp, prev_under_imp,
                 new_line, new_over_imp, new_under_imp,
                 delta_line, delta_under,
                 poly_over, poly_under, poly_gap_under, poly_gap_over,
-            )
+            ))
 
             if hi_res_capture and poly_under is not None:
                 move_event_id = hi_res_capture.record_move_event(
@@ -290,81 +496,81 @@ class LagMonitor:
                 "poly_gap_under": poly_gap_under, "poly_gap_over": poly_gap_over,
             })
 
-        self.triggers_repo.commit()
+        with self._txn():
+            self.triggers_repo.insert_triggers(trigger_rows)
+            if baseline.updates_since_flush >= cfg.baseline_persist_every:
+                self.baselines_repo.upsert_many(baseline.drain_dirty(), trigger_time)
         return triggers
 
     # ── Bot trades ────────────────────────────────────────
 
     def check_bot_trades(self) -> int:
-        trades = self.data_client.get_recent_activity(self.config.bot_address)
+        # Only ask for trades since the newest one already stored; the
+        # INSERT OR IGNORE on tx_hash absorbs the overlapping second.
+        since = self.bot_repo.get_latest_trade_ts()
+        trades = self.data_client.get_recent_activity(self.config.bot_address, since=since)
         if not trades:
             return 0
 
-        slug_map = self.game_repo.get_slug_to_game_id_map()
-        count = 0
+        with self.db_lock:  # the WS thread may upsert into the live map
+            slug_map = self.game_repo.get_slug_to_game_id_map()
+            if len(slug_map) != self._slug_groups[0]:
+                self._slug_groups = (len(slug_map), _group_slugs_by_length(slug_map))
+        slug_groups = self._slug_groups[1]
+        trade_rows: list[tuple] = []
+        # Local aliases for the per-trade loop below.
+        add_row = trade_rows.append
+        iso_from_ts = iso_utc_from_epoch
+        _float = float
 
         for t in trades:
             slug = t.get("slug", "")
             ts_raw = t.get("timestamp", "")
             if isinstance(ts_raw, (int, float)) or (isinstance(ts_raw, str) and ts_raw.isdigit()):
-                ts_str = datetime.fromtimestamp(int(ts_raw), tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+                ts_str = iso_from_ts(int(ts_raw))
             else:
                 ts_str = str(ts_raw)
 
             tx_hash = t.get("transactionHash", "") or f"{slug}_{ts_str}_{t.get('price','')}"
 
-            matched_game_id = None
-            for event_slug, game_id in slug_map.items():
-                if slug.startswith(event_slug):
-                    matched_game_id = game_id
-                    break
+            matched_game_id = _match_event_slug(slug, slug_groups)
 
-            self.bot_repo.insert_trade(
+            add_row((
                 ts_str, matched_game_id, slug,
                 t.get("conditionId", ""),
                 t.get("outcome", t.get("title", "")),
                 t.get("side", ""),
-                float(t.get("price", 0) or 0),
-                float(t.get("size", 0) or 0),
+                _float(t.get("price", 0) or 0),
+                _float(t.get("size", 0) or 0),
                 tx_hash,
-            )
-            count += 1
+            ))
 
-        self.bot_repo.commit()
-        return count
+        with self._txn():
+            return self.bot_repo.insert_trades(trade_rows)
 
     # ── Gap convergence tracking ──────────────────────────
 
     def track_gap_convergence(self) -> None:
-        open_triggers = self.triggers_repo.get_open_triggers()
-        for tr in open_triggers:
-            tr_id, game_id, tr_line, tr_under_imp, tr_over_imp, tr_time = tr
-
-            poly_snap = self.poly_repo.get_closest_poly_snap(game_id, tr_line)
-            if not poly_snap or poly_snap[1] is None:
-                continue
-
-            poly_under = poly_snap[1]
-            gap_under = abs(tr_under_imp - poly_under) if tr_under_imp else None
-
-            if gap_under is not None and gap_under <= 0.01:
-                closed_time = now_utc()
-                tr_dt = datetime.fromisoformat(tr_time.replace("Z", "+00:00"))
-                closed_dt = datetime.fromisoformat(closed_time.replace("Z", "+00:00"))
-                lag = int((closed_dt - tr_dt).total_seconds())
-                self.triggers_repo.update_gap_closed(tr_id, closed_time, lag)
-
-        self.triggers_repo.commit()
+        with self._txn():
+            self.triggers_repo.close_converged(now_utc())
 
     # ── Token subscription for WebSocket mode ─────────────
 
     def fetch_market_tokens(self) -> dict[str, list[dict]]:
+        """Open-market tokens per game: {game_id: tokens}.
+
+        Games Gamma answered for are always present (an empty list means no
+        open markets); games whose lookup failed are left out.
+        """
         result: dict[str, list[dict]] = {}
         rows = self.game_repo.get_all_slugs()
+        tokens_by_slug = self.gamma_client.get_market_tokens_many(
+            [poly_slug for _, poly_slug in rows], classify_fn=classify_market,
+        )
 
         for game_id, poly_slug in rows:
-            tokens = self.gamma_client.get_market_tokens(poly_slug, classify_fn=classify_market)
-            if tokens:
+            tokens = tokens_by_slug.get(poly_slug)
+            if tokens is not None:
                 for t in tokens:
                     t["game_id"] = game_id
                 result[game_id] = tokens
@@ -374,7 +580,6 @@ class LagMonitor:
     # ── REST polling mode ─────────────────────────────────
 
     def run_rest(self) -> None:
-        global running
         signal.signal(signal.SIGINT, _signal_handler)
         cfg = self.config.lag
 
@@ -386,22 +591,24 @@ class LagMonitor:
         print(f"Polymarket interval: {cfg.poly_interval}s")
         print(f"{'='*60}\n")
 
+        # Interval bookkeeping uses the monotonic clock so NTP/wall-clock
+        # steps can't skip or double-fire a cycle.
         pinnacle_interval = cfg.normal_interval
-        last_trigger_time = 0
-        last_pinnacle_time = 0
+        last_trigger_time = float("-inf")
+        last_pinnacle_time = float("-inf")
+        last_checkpoint_time = time.monotonic()
 
-        while running:
+        while not _stop.is_set():
             if not is_active_window(cfg.active_start_hour, cfg.active_end_hour):
                 wait = seconds_until_active(cfg.active_start_hour, cfg.active_end_hour)
                 wake_et = (now_et() + timedelta(seconds=wait)).strftime("%H:%M ET")
                 print(f"\n[SLEEP] Inactive window. Resuming at {wake_et}")
-                for _ in range(wait):
-                    if not running:
-                        break
-                    time.sleep(1)
+                if _stop.wait(wait):
+                    break
+                self._prune_baselines()
                 continue
 
-            now = time.time()
+            now = time.monotonic()
 
             if (now - last_trigger_time) > cfg.trigger_cooldown:
                 pinnacle_interval = cfg.normal_interval
@@ -413,9 +620,11 @@ class LagMonitor:
                     self.pinnacle_data = self.fetch_pinnacle()
 
                     print("[2/3] Polymarket collection...")
-                    poly_count = self.fetch_polymarket(self.pinnacle_data)
-
-                    triggers = self.detect_moves(self.pinnacle_data)
+                    poly = self._collect_polymarket(self.pinnacle_data)
+                    with self._batch():
+                        poly_count = self._store_polymarket(*poly)
+                        triggers = self.detect_moves(self.pinnacle_data)
+                        self.track_gap_convergence()
                     if triggers:
                         pinnacle_interval = cfg.trigger_interval
                         last_trigger_time = now
@@ -423,7 +632,6 @@ class LagMonitor:
                     print("[3/3] Bot trade check...")
                     bot_count = self.check_bot_trades()
 
-                    self.track_gap_convergence()
                     self._print_status(self.pinnacle_data, poly_count, triggers, bot_count)
                     last_pinnacle_time = now
 
@@ -432,25 +640,28 @@ class LagMonitor:
 
             elif self.pinnacle_data:
                 try:
-                    poly_count = self.fetch_polymarket(self.pinnacle_data)
-                    self.track_gap_convergence()
+                    poly = self._collect_polymarket(self.pinnacle_data)
+                    with self._batch():
+                        poly_count = self._store_polymarket(*poly)
+                        self.track_gap_convergence()
                     if poly_count > 0:
                         print(f"  [{now_et_str()}] Poly sub-poll: {poly_count} lines updated")
                 except Exception as e:
                     print(f"  [WARN] Poly sub-poll error: {e}")
 
-            for _ in range(cfg.poly_interval):
-                if not running:
-                    break
-                time.sleep(1)
+            if (now - last_checkpoint_time) >= cfg.status_interval:
+                self._checkpoint()
+                last_checkpoint_time = now
 
-        self.conn.close()
+            if _stop.wait(cfg.poly_interval):
+                break
+
+        self.close()
         print("[DONE] Monitor stopped")
 
     # ── WebSocket mode ────────────────────────────────────
 
     def run_ws(self) -> None:
-        global running
         signal.signal(signal.SIGINT, _signal_handler)
         cfg = self.config.lag
 
@@ -466,31 +677,49 @@ class LagMonitor:
 
         token_to_game: dict[str, str] = {}
         token_to_info: dict[str, dict] = {}
+        # (game_id, market_type, outcome.lower()) -> token_id; first token wins,
+        # matching the old first-match scan over token_to_info.
+        outcome_tokens: dict[tuple[str, str, str], str] = {}
+
+        def register_token(game_id: str, t: dict) -> None:
+            token_id = t["token_id"]
+            token_to_game[token_id] = game_id
+            token_to_info[token_id] = {
+                "game_id": game_id, "market_type": t["market_type"],
+                "outcome": t["outcome"], "market_slug": t["market_slug"],
+            }
+            outcome_tokens.setdefault(
+                (game_id, t["market_type"], t["outcome"].lower()), token_id,
+            )
 
-        hi_res_capture = HiResCapture(self.hi_res_repo, self.config.hi_res)
+        self._hi_res_conn = get_connection(self.config.db_path, thread_safe=True)
+        hi_res_capture = HiResCapture(HiResRepo(self._hi_res_conn), self.config.hi_res)
         print(f"Forward Test v2: Hi-Res gap capture enabled (t+3s, t+10s, t+30s)")
 
         # Paper trading setup
-        paper_repo = PaperTradesRepo(self.conn)
+        self._paper_conn = get_connection(self.config.db_path, thread_safe=True)
+        paper_repo = PaperTradesRepo(self._paper_conn)
         book_cache: dict[str, tuple[float, float]] = {}  # token_id -> (bid, ask)
 
-        ws_stats = {"price_updates": 0, "anomalies_detected": 0, "pinnacle_calls": 0, "hi_res_events": 0}
+        ws_stats = {"price_updates": 0, "anomalies_detected": 0, "pinnacle_calls": 0, "hi_res_events": 0,
+                    "debounced": 0}
 
         def get_poly_price(game_id, market_type, outcome):
-            for token_id, info in token_to_info.items():
-                if info["game_id"] == game_id and info["market_type"] == market_type and info["outcome"].lower() == outcome.lower():
-                    price = price_tracker.get_current_price(token_id)
-                    # Debug: log if price seems extreme
-                    if price is not None and (price < 0.10 or price > 0.90):
-                        print(f"  [Debug] get_poly_price: {outcome}@{game_id[:8]} = {price:.3f} (token={token_id[:8]})")
-                    return price
-            return None
+            token_id = outcome_tokens.get((game_id, market_type, outcome.lower()))
+            if token_id is None:
+                return None
+            price = price_tracker.get_current_price(token_id)
+            # Debug: log if price seems extreme (args only formatted when enabled)
+            if price is not None and (price < 0.10 or price > 0.90):
+                log.debug("get_poly_price: %s@%s = %.3f (token=%s)",
+                          outcome, game_id[:8], price, token_id[:8])
+            return price
 
         def get_poly_book(game_id, market_type, outcome):
-            for token_id, info in token_to_info.items():
-                if info["game_id"] == game_id and info["market_type"] == market_type and info["outcome"].lower() == outcome.lower():
-                    return book_cache.get(token_id, (None, None))
-            return (None, None)
+            token_id = outcome_tokens.get((game_id, market_type, outcome.lower()))
+            if token_id is None:
+                return (None, None)
+            return book_cache.get(token_id, (None, None))
 
         def get_token_price(token_id):
             """Direct price lookup by token_id."""
@@ -523,6 +752,11 @@ class LagMonitor:
         hi_res_capture.set_price_getter(get_poly_price)
         hi_res_capture.set_orderbook_getter(lambda *a: (None, None, None))
 
+        # asset_id -> (monotonic ts, price) of the last tick sent to the detector
+        last_detected: dict[str, tuple[float, float]] = {}
+        debounce_s = self.config.anomaly.debounce_seconds
+        debounce_dp = self.config.anomaly.debounce_price_delta
+
         def on_price_change(asset_id, data):
             ws_stats["price_updates"] += 1
             info = token_to_info.get(asset_id)
@@ -533,6 +767,16 @@ class LagMonitor:
                 return
             price = float(price)
             price_tracker.record(asset_id, price)
+
+            # Debounce: near-identical ticks shortly after the last one
+            # don't need another detector pass.
+            now_mono = time.monotonic()
+            last = last_detected.get(asset_id)
+            if last and now_mono - last[0] < debounce_s and abs(price - last[1]) < debounce_dp:
+                ws_stats["debounced"] += 1
+                return
+            last_detected[asset_id] = (now_mono, price)
+
             event = detector.update_price(info["game_id"], info["market_type"], info["outcome"], price)
             if event:
                 # Add token_id to event details for precise price lookup
@@ -557,7 +801,7 @@ class LagMonitor:
 
         # Cache for oracle implied (for paper trading without Pinnacle call)
         oracle_cache: dict[str, dict[str, float]] = {}  # game_id -> {outcome: implied}
-        oracle_cache_ts: dict[str, float] = {}  # game_id -> last_updated unix timestamp
+        oracle_cache_ts: dict[str, float] = {}  # game_id -> last_updated (monotonic)
         ORACLE_MAX_AGE = 300  # 5 minutes — stale cache not used for paper trading
 
         def update_oracle_cache(game_id: str, outcome: str, implied: float):
@@ -565,7 +809,7 @@ class LagMonitor:
             if game_id not in oracle_cache:
                 oracle_cache[game_id] = {}
             oracle_cache[game_id][outcome] = implied
-            oracle_cache_ts[game_id] = time.time()
+            oracle_cache_ts[game_id] = time.monotonic()
 
         def get_cached_oracle_implied(game_id: str, outcome: str) -> tuple[float | None, bool]:
             """Lookup oracle implied with fuzzy team name matching.
@@ -576,7 +820,7 @@ class LagMonitor:
             if not game_data:
                 return None, False
 
-            cache_age = time.time() - oracle_cache_ts.get(game_id, 0)
+            cache_age = time.monotonic() - oracle_cache_ts[game_id]
             is_fresh = cache_age <= ORACLE_MAX_AGE
 
             # Direct match first
@@ -618,7 +862,7 @@ class LagMonitor:
                         token_id=token_id,
                     )
                 elif cached_implied and not is_fresh:
-                    age = int(time.time() - oracle_cache_ts.get(game_id, 0))
+                    age = int(time.monotonic() - oracle_cache_ts[game_id])
                     print(f"  [Paper] SKIP {outcome}: oracle stale ({age}s old > {ORACLE_MAX_AGE}s)")
                 elif game_id not in oracle_cache:
                     print(f"  [Paper] game_id {game_id[:8]}... not in oracle_cache ({len(oracle_cache)} games cached)")
@@ -700,39 +944,39 @@ class LagMonitor:
                 h2h_games, _ = self.odds_client.get_odds(markets="h2h")
                 h2h_count = 0
                 h2h_games_added = 0
-                for game in h2h_games:
-                    game_id = game["id"]
-                    home = game.get("home_team", "")
-                    away = game.get("away_team", "")
-                    commence = game.get("commence_time", "")
-
-                    # CRITICAL: Also add h2h games to game_mapping for token subscription!
-                    existing_slug = self.game_repo.get_slug(game_id)
-                    if not existing_slug:
-                        self.game_repo.upsert(game_id, home, away, commence)
-                        h2h_games_added += 1
-
-                    # Update commence cache
-                    if commence:
-                        commence_cache[game_id] = commence
-
-                    for bm in game.get("bookmakers", []):
-                        if bm["key"] != "pinnacle":
-                            continue
-                        for mkt in bm.get("markets", []):
-                            if mkt["key"] != "h2h":
-                                continue
-                            outcomes = mkt.get("outcomes", [])
-                            if len(outcomes) < 2:
+                with self._txn():
+                    for game in h2h_games:
+                        game_id = game["id"]
+                        home = game.get("home_team", "")
+                        away = game.get("away_team", "")
+                        commence = game.get("commence_time", "")
+
+                        # CRITICAL: Also add h2h games to game_mapping for token subscription!
+                        existing_slug = self.game_repo.get_slug(game_id)
+                        if not existing_slug:
+                            self.game_repo.upsert(game_id, home, away, commence)
+                            h2h_games_added += 1
+
+                        # Update commence cache
+                        if commence:
+                            commence_cache[game_id] = commence
+
+                        for bm in game.get("bookmakers", []):
+                            if bm["key"] != "pinnacle":
                                 continue
-                            for oc in outcomes:
-                                name = oc.get("name", "")
-                                odds = oc.get("price", 2.0)
-                                other_odds = outcomes[1]["price"] if oc == outcomes[0] else outcomes[0]["price"]
-                                fair, _ = de_vig_implied(odds, other_odds)
-                                update_oracle_cache(game_id, name, fair)
-                                h2h_count += 1
-                self.game_repo.commit()
+                            for mkt in bm.get("markets", []):
+                                if mkt["key"] != "h2h":
+                                    continue
+                                outcomes = mkt.get("outcomes", [])
+                                if len(outcomes) < 2:
+                                    continue
+                                for oc in outcomes:
+                                    name = oc.get("name", "")
+                                    odds = oc.get("price", 2.0)
+                                    other_odds = outcomes[1]["price"] if oc == outcomes[0] else outcomes[0]["price"]
+                                    fair, _ = de_vig_implied(odds, other_odds)
+                                    update_oracle_cache(game_id, name, fair)
+                                    h2h_count += 1
                 print(f"  {h2h_count} h2h outcomes cached for {len(oracle_cache)} games")
                 if h2h_games_added > 0:
                     print(f"  {h2h_games_added} new h2h games added to game_mapping")
@@ -744,108 +988,167 @@ class LagMonitor:
             all_token_ids = []
             for game_id, tokens in market_tokens.items():
                 for t in tokens:
-                    token_id = t["token_id"]
-                    all_token_ids.append(token_id)
-                    token_to_game[token_id] = game_id
-                    token_to_info[token_id] = {
-                        "game_id": game_id, "market_type": t["market_type"],
-                        "outcome": t["outcome"], "market_slug": t["market_slug"],
-                    }
-
-            print(f"  {len(all_token_ids)} tokens across {len(market_tokens)} games")
+                    all_token_ids.append(t["token_id"])
+                    register_token(game_id, t)
+
+            n_games = sum(1 for tokens in market_tokens.values() if tokens)
+            print(f"  {len(all_token_ids)} tokens across {n_games} games")
             if all_token_ids:
                 ws.subscribe(all_token_ids)
                 print(f"[Init] WebSocket subscription complete")
 
         def refresh():
-            nonlocal token_to_game, token_to_info
             market_tokens = self.fetch_market_tokens()
-            new_tokens = []
+            wanted = _wanted_tokens(token_to_game, market_tokens)
             for game_id, tokens in market_tokens.items():
                 for t in tokens:
-                    token_id = t["token_id"]
-                    if token_id not in token_to_game:
-                        new_tokens.append(token_id)
-                        token_to_game[token_id] = game_id
-                        token_to_info[token_id] = {
-                            "game_id": game_id, "market_type": t["market_type"],
-                            "outcome": t["outcome"], "market_slug": t["market_slug"],
-                        }
-            if new_tokens:
-                ws.subscribe(new_tokens)
-                print(f"[{now_et_str()}] New token subscriptions: {len(new_tokens)}")
+                    if t["token_id"] not in token_to_game:
+                        register_token(game_id, t)
+            added, removed = ws.refresh_subscriptions(wanted)
+            _forget_tokens(removed, token_to_game, token_to_info, outcome_tokens)
+            if added:
+                print(f"[{now_et_str()}] New token subscriptions: {len(added)}")
+            if removed:
+                print(f"[{now_et_str()}] Unsubscribed closed markets: {len(removed)} tokens")
 
         ws.on_connect(lambda: print(f"[{now_et_str()}] WebSocket connected"))
         ws.on_disconnect(lambda: print(f"[{now_et_str()}] WebSocket disconnected, reconnecting..."))
-        ws.on_error(lambda e: print(f"[{now_et_str()}] WebSocket error: {e}"))
+        ws.on_error(lambda e: log.warning("WebSocket error: %s", e))
         ws.on_price_change(on_price_change)
         ws.on_book_update(on_book_update)
 
         initialize()
         ws.run_forever(background=True)
 
-        last_refresh = time.time()
-        last_bot_check = time.time()
+        def do_refresh():
+            try:
+                refresh()
+            except Exception as e:
+                print(f"[WARN] Refresh failed: {e}")
+
+        def do_bot_check():
+            try:
+                bot_count = self.check_bot_trades()
+                if bot_count > 0:
+                    print(f"[{now_et_str()}] Bot trades recorded: {bot_count}")
+            except Exception as e:
+                print(f"[WARN] Bot check failed: {e}")
+
+        def do_gap_check():
+            with self.pinnacle_data_lock:
+                if self.pinnacle_data:
+                    self.track_gap_convergence()
+
+        def do_status():
+            ws_st = ws.get_stats()
+            hi_res_str = f" | HiRes: {ws_stats.get('hi_res_events', 0)} events"
+            pt_status = paper_trading.get_status()
+            pt_str = f" | Paper: {pt_status['engine_stats']['entries']} trades"
+            drop_str = f" ({ws_st.dropped_messages} dropped)" if ws_st.dropped_messages else ""
+            print(f"[{now_et_str()}] WS: {ws_st.messages_received} msgs{drop_str}, "
+                  f"{ws_stats['price_updates']} prices | "
+                  f"Anomalies: {ws_stats['anomalies_detected']} | "
+                  f"Pinnacle: {ws_stats['pinnacle_calls']} calls{hi_res_str}{pt_str}")
+
+        # (interval, first-run delay, job). The loop sleeps until the earliest
+        # deadline in the heap instead of waking every second.
+        periodic = [
+            (cfg.refresh_interval, cfg.refresh_interval, do_refresh),
+            (cfg.bot_check_interval, cfg.bot_check_interval, do_bot_check),
+            (cfg.gap_check_interval, 0, do_gap_check),
+            (cfg.status_interval, cfg.status_interval, do_status),
+            (cfg.status_interval, cfg.status_interval, self._checkpoint),
+        ]
+
+        def schedule() -> list[tuple]:
+            now = time.monotonic()
+            heap = [(now + delay, i, interval, fn)
+                    for i, (interval, delay, fn) in enumerate(periodic)]
+            heapq.heapify(heap)
+            return heap
+
+        jobs = schedule()
 
         print(f"\n[{now_et_str()}] Main loop started...\n")
 
-        while running:
+        while not _stop.is_set():
             if not is_active_window(cfg.active_start_hour, cfg.active_end_hour):
                 wait = seconds_until_active(cfg.active_start_hour, cfg.active_end_hour)
                 wake_et = (now_et() + timedelta(seconds=wait)).strftime("%H:%M ET")
                 print(f"\n[SLEEP] Inactive. Resuming at {wake_et}")
                 ws.stop()
-                for _ in range(wait):
-                    if not running:
-                        break
-                    time.sleep(1)
-                if running:
-                    ws.run_forever(background=True)
-                    initialize()
+                if _stop.wait(wait):
+                    break
+                ws.run_forever(background=True)
+                self._prune_baselines()
+                initialize()
+                jobs = schedule()
                 continue
 
-            now_ts = time.time()
+            now = time.monotonic()
+            while jobs[0][0] <= now:
+                due, i, interval, fn = heapq.heappop(jobs)
+                fn()
+                # Fixed-rate, but skip missed slots rather than replaying them.
+                next_due = due + interval
+                if next_due <= now:
+                    next_due = now + interval
+                heapq.heappush(jobs, (next_due, i, interval, fn))
 
-            if now_ts - last_refresh >= cfg.refresh_interval:
-                try:
-                    refresh()
-                except Exception as e:
-                    print(f"[WARN] Refresh failed: {e}")
-                last_refresh = now_ts
-
-            if now_ts - last_bot_check >= cfg.bot_check_interval:
-                try:
-                    bot_count = self.check_bot_trades()
-                    if bot_count > 0:
-                        print(f"[{now_et_str()}] Bot trades recorded: {bot_count}")
-                except Exception as e:
-                    print(f"[WARN] Bot check failed: {e}")
-                last_bot_check = now_ts
-
-            with self.pinnacle_data_lock:
-                if self.pinnacle_data:
-                    self.track_gap_convergence()
-
-            if int(now_ts) % cfg.status_interval == 0:
-                ws_st = ws.get_stats()
-                hi_res_str = f" | HiRes: {ws_stats.get('hi_res_events', 0)} events"
-                pt_status = paper_trading.get_status()
-                pt_str = f" | Paper: {pt_status['engine_stats']['entries']} trades"
-                print(f"[{now_et_str()}] WS: {ws_st['messages_received']} msgs, "
-                      f"{ws_stats['price_updates']} prices | "
-                      f"Anomalies: {ws_stats['anomalies_detected']} | "
-                      f"Pinnacle: {ws_stats['pinnacle_calls']} calls{hi_res_str}{pt_str}")
-
-            time.sleep(1)
+            _stop.wait(max(0.0, jobs[0][0] - time.monotonic()))
 
         paper_trading.stop()
         paper_trading.print_summary()
         ws.stop()
-        self.conn.close()
+        self.close()
         print("[DONE] Monitor stopped")
 
     # ── Helper functions ─────────────────────────────────
 
+    def _prune_baselines(self) -> None:
+        """Forget line baselines of games not updated within the retention
+        window (finished games), in the table and in memory. A failure is
+        reported and left for the next run."""
+        hours = self.config.lag.baseline_retention_hours
+        cutoff = iso_utc_from_epoch(int(time.time()) - hours * 3600)
+        try:
+            with self._txn():
+                stale = self.baselines_repo.delete_stale(cutoff)
+        except sqlite3.Error as e:
+            print(f"[WARN] Baseline pruning failed: {e}")
+            return
+        self.line_baseline.drop(stale)
+
+    def _checkpoint(self) -> None:
+        """Refresh planner stats and truncate the WAL; run on the status
+        cadence by both loops. Failures (e.g. the write lock held past the
+        busy timeout) are reported and retried on the next run."""
+        try:
+            with self.db_lock:
+                optimize(self.conn)
+                if not checkpoint(self.conn):
+                    log.debug("WAL checkpoint incomplete (database busy)")
+        except Exception as e:
+            print(f"[WARN] DB maintenance failed: {e}")
+
+    def close(self) -> None:
+        """Flush the line baseline, then close pooled HTTP clients and the DB connection."""
+        rows = self.line_baseline.drain_dirty()
+        if rows:
+            with self._txn():
+                self.baselines_repo.upsert_many(rows, now_utc())
+        self.odds_client.close()
+        self.gamma_client.close()
+        self.data_client.close()
+        for conn in (self._hi_res_conn, self._paper_conn):
+            if conn is not None:
+                conn.close()
+        try:
+            optimize(self.conn)
+        except sqlite3.Error as e:
+            print(f"[WARN] PRAGMA optimize failed: {e}")
+        self.conn.close()
+
     def _get_oracle_implied(self, oracle_data: dict, outcome: str) -> float | None:
         """Extract oracle implied probability for moneyline outcome."""
         for bm in oracle_data.get("bookmakers", []):
@@ -11,7 +11,7 @@ from typing import Callable, Optional
 MAX_GAME_DURATION_MINUTES = 150
 
 from src.db.paper_trades_repo import PaperTradesRepo
-from src.shared.time_utils import now_et_str
+from src.shared.time_utils import now_et_str, parse_iso_utc
 
 
 @dataclass
@@ -21,7 +21,7 @@ class OpenPosition:
     game_id: str
     market_type: str
     outcome: str
-    entry_time: float  # unix timestamp
+    entry_time: float  # time.monotonic() at entry
     entry_price: float
     entry_bid: float
     hold_seconds: int = 30
@@ -119,7 +119,7 @@ class PaperTradingEngine:
             commence_str = self.commence_getter(game_id)
             if commence_str:
                 try:
-                    commence_dt = datetime.fromisoformat(commence_str.replace("Z", "+00:00"))
+                    commence_dt = parse_iso_utc(commence_str)
                     now_utc = datetime.now(timezone.utc)
                     elapsed = now_utc - commence_dt
                     if elapsed > timedelta(minutes=MAX_GAME_DURATION_MINUTES):
@@ -133,7 +133,7 @@ class PaperTradingEngine:
 
         # Check cooldown
         key = f"{game_id}:{outcome}"
-        now = time.time()
+        now = time.monotonic()
         if key in self.cooldowns and (now - self.cooldowns[key]) < self.cooldown_seconds:
             return None
 
@@ -241,7 +241,7 @@ class PaperTradingEngine:
 
     def _check_exits(self):
         """Check and close positions that have reached hold time."""
-        now = time.time()
+        now = time.monotonic()
         to_close = []
 
         with self._lock:
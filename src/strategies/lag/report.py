@@ -13,12 +13,15 @@ try:
 except ImportError:
     from backports.zoneinfo import ZoneInfo
 
-from src.db.connection import get_row_connection
+from src.db.connection import get_read_connection
 
 
 def report(db_path: Path) -> None:
     """Print analysis report from collected snapshots/triggers/bot trades."""
-    conn = get_row_connection(db_path)
+    if not db_path.exists():
+        print(f"DB not found: {db_path}")
+        return
+    conn = get_read_connection(db_path, rows=True)
     et = ZoneInfo("America/New_York")
     now_utc = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M UTC")
     now_et = datetime.now(et).strftime("%Y-%m-%d %H:%M ET")
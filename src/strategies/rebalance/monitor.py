@@ -9,8 +9,8 @@ from __future__ import annotations
 
 import logging
 import signal
+import threading
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict
@@ -55,28 +55,26 @@ class RebalanceMonitor:
 
         updated = 0
         failed = 0
-        t0 = time.time()
-
-        def fetch_one(tid):
-            price = self.clob.get_price(tid, side="sell")
-            return (tid, price)
-
-        with ThreadPoolExecutor(max_workers=workers) as pool:
-            futures = {pool.submit(fetch_one, tid): tid for tid in token_ids}
-            for fut in as_completed(futures):
-                tid, best_ask = fut.result()
+        t0 = time.monotonic()
+
+        chunk = 5000
+        for start in range(0, n_total, chunk):
+            prices = self.clob.get_prices(
+                token_ids[start : start + chunk], side="sell", max_workers=workers,
+            )
+            for tid, best_ask in prices.items():
                 if best_ask is not None:
                     self.tracker.update_best_ask(tid, best_ask)
                     updated += 1
                 else:
                     failed += 1
 
-                done = updated + failed
-                if done % 5000 == 0 and done > 0:
-                    elapsed = time.time() - t0
-                    log.info(f"  CLOB progress: {done}/{n_total} ({elapsed:.0f}s)")
+            done = updated + failed
+            if done < n_total:
+                elapsed = time.monotonic() - t0
+                log.info(f"  CLOB progress: {done}/{n_total} ({elapsed:.0f}s)")
 
-        elapsed = time.time() - t0
+        elapsed = time.monotonic() - t0
         log.info(f"CLOB seeding complete: {updated} updated, {failed} failed ({elapsed:.0f}s)")
 
     def print_status(self, ws: PolyWebSocket) -> None:
@@ -89,9 +87,9 @@ class RebalanceMonitor:
         conn = "OK" if ws.is_connected() else "DOWN"
 
         print(f"\n{'='*72}")
-        print(f"[{now_str}] WS:{conn} msgs={ws_s['messages_received']} "
-              f"prices={ws_s['price_updates']} books={ws_s['book_updates']} "
-              f"reconn={ws_s['reconnects']} err={ws_s['errors']}")
+        print(f"[{now_str}] WS:{conn} msgs={ws_s.messages_received} "
+              f"prices={ws_s.price_updates} books={ws_s.book_updates} "
+              f"reconn={ws_s.reconnects} err={ws_s.errors}")
         print(f"Tracker: {self.tracker.n_events} events, {self.tracker.n_tokens} tokens | "
               f"updates={t_s['book_updates']} opps={t_s['opportunities_found']} "
               f"strong={t_s['strong_opportunities']}")
@@ -156,24 +154,23 @@ class RebalanceMonitor:
         ws.run_forever(background=True)
 
         # 4. Signal handling
-        shutdown = False
+        shutdown = threading.Event()
 
         def _signal_handler(sig, frame):
-            nonlocal shutdown
             log.info("Shutdown signal received...")
-            shutdown = True
+            shutdown.set()
 
         signal.signal(signal.SIGINT, _signal_handler)
         signal.signal(signal.SIGTERM, _signal_handler)
 
         # 5. Main loop
         cfg = self.config.rebalance
-        last_refresh = time.time()
-        last_status = time.time()
+        last_refresh = time.monotonic()
+        last_status = last_refresh
         log.info("Main loop started (Ctrl+C to stop)")
 
-        while not shutdown:
-            now = time.time()
+        while not shutdown.is_set():
+            now = time.monotonic()
 
             if now - last_refresh >= cfg.refresh_interval:
                 try:
@@ -192,8 +189,13 @@ class RebalanceMonitor:
                     log.error(f"Status print failed: {e}")
                 last_status = now
 
-            time.sleep(1)
+            # Sleep until the next job is due; a signal wakes us at once.
+            next_due = min(last_refresh + cfg.refresh_interval,
+                           last_status + cfg.status_interval)
+            shutdown.wait(max(0.0, next_due - time.monotonic()))
 
         log.info("Stopping WebSocket...")
         ws.stop()
+        self.clob.close()
+        self.gamma.close()
         log.info("Monitor stopped")
@@ -4,12 +4,12 @@ Extracted from rebalance_monitor.py: event classification and tracker registrati
 """
 from __future__ import annotations
 
-import json
 import logging
 from typing import Dict, List
 
 from src.clients.gamma import GammaClient
 from src.config import RebalanceConfig
+from src.shared.json_utils import loads
 from src.strategies.rebalance.tracker import RebalanceTracker
 
 log = logging.getLogger("rebalance")
@@ -53,10 +53,10 @@ def extract_yes_tokens(event: Dict) -> List[Dict]:
             continue
         outcomes = m.get("outcomes", [])
         if isinstance(outcomes, str):
-            outcomes = json.loads(outcomes)
+            outcomes = loads(outcomes)
         clob_token_ids = m.get("clobTokenIds", [])
         if isinstance(clob_token_ids, str):
-            clob_token_ids = json.loads(clob_token_ids)
+            clob_token_ids = loads(clob_token_ids)
 
         if clob_token_ids and outcomes:
             question = m.get("question", "")
@@ -78,39 +78,40 @@ def scan_and_register(
     Returns list of newly registered token IDs.
     """
     log.info("Scanning Gamma API events...")
-    all_events = gamma.get_all_active_events()
-    log.info(f"Total active events: {len(all_events)}")
 
     existing_tokens = set(tracker.registered_token_ids)
     new_token_ids: List[str] = []
     n_new_events = 0
+    n_nba_markets = 0
+    n_total = 0
 
-    # Multi-outcome negativeRisk events
-    for event in all_events:
-        if not is_negative_risk_event(event):
-            continue
-        if not is_sports_event(event):
-            continue
+    # Single pass over the paged stream so each page is processed while the
+    # next one is still being fetched.
+    for event in gamma.iter_active_events():
+        n_total += 1
 
-        event_id = str(event.get("id", ""))
-        title = event.get("title", "?")
-        tokens = extract_yes_tokens(event)
+        # Multi-outcome negativeRisk events
+        if is_negative_risk_event(event):
+            if not is_sports_event(event):
+                continue
 
-        if len(tokens) < config.min_markets:
-            continue
-        if any(t["token_id"] in existing_tokens for t in tokens):
-            continue
+            event_id = str(event.get("id", ""))
+            title = event.get("title", "?")
+            tokens = extract_yes_tokens(event)
 
-        tracker.register_event(event_id, title, tokens)
-        n_new_events += 1
-        for t in tokens:
-            new_token_ids.append(t["token_id"])
+            if len(tokens) < config.min_markets:
+                continue
+            if any(t["token_id"] in existing_tokens for t in tokens):
+                continue
 
-    # NBA binary markets (YES+NO pairs)
-    existing_tokens = set(tracker.registered_token_ids)
-    n_nba_markets = 0
+            tracker.register_event(event_id, title, tokens)
+            n_new_events += 1
+            for t in tokens:
+                new_token_ids.append(t["token_id"])
+                existing_tokens.add(t["token_id"])
+            continue
 
-    for event in all_events:
+        # NBA binary markets (YES+NO pairs)
         if not is_nba_game_event(event):
             continue
 
@@ -122,10 +123,10 @@ def scan_and_register(
 
             outcomes = m.get("outcomes", [])
             if isinstance(outcomes, str):
-                outcomes = json.loads(outcomes)
+                outcomes = loads(outcomes)
             clob_token_ids = m.get("clobTokenIds", [])
             if isinstance(clob_token_ids, str):
-                clob_token_ids = json.loads(clob_token_ids)
+                clob_token_ids = loads(clob_token_ids)
 
             if len(clob_token_ids) < 2:
                 continue
@@ -152,6 +153,7 @@ def scan_and_register(
             existing_tokens.add(yes_tid)
             existing_tokens.add(no_tid)
 
+    log.info(f"Total active events: {n_total}")
     log.info(
         f"Scan complete: {n_new_events} multi-outcome + {n_nba_markets} NBA binary | "
         f"Total {tracker.n_events} events, {tracker.n_tokens} tokens"
@@ -155,7 +155,7 @@ class RebalanceTracker:
         if total >= self.threshold:
             return None
 
-        now = time.time()
+        now = time.monotonic()
         prev = self._alert_cooldown.get(event_id)
         if prev:
             prev_time, prev_sum = prev
@@ -0,0 +1,24 @@
+"""Tests for the CLOB API client."""
+from __future__ import annotations
+
+import json
+
+import httpx
+
+from src.clients.clob import CLOBClient
+
+
+def test_get_prices_fans_out_and_keeps_failures_as_none():
+    def handler(request: httpx.Request) -> httpx.Response:
+        tid = request.url.params["token_id"]
+        if tid == "bad":
+            return httpx.Response(500)
+        return httpx.Response(200, content=json.dumps({"price": f"0.{tid}"}))
+
+    client = CLOBClient()
+    client._client = httpx.Client(transport=httpx.MockTransport(handler))
+
+    prices = client.get_prices(["1", "bad", "25"], max_workers=3)
+
+    assert list(prices) == ["1", "bad", "25"]
+    assert prices == {"1": 0.1, "bad": None, "25": 0.25}
@@ -0,0 +1,121 @@
+"""Tests for the Gamma API client."""
+from __future__ import annotations
+
+import json
+
+import httpx
+
+from src.clients.gamma import GammaClient
+from src.config import GammaConfig
+
+
+def _client_with(handler) -> GammaClient:
+    client = GammaClient(GammaConfig(slug_batch_size=2))
+    client._client = httpx.Client(transport=httpx.MockTransport(handler))
+    return client
+
+
+def test_get_events_by_slugs_batches_requests():
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        slugs = request.url.params.get_list("slug")
+        calls.append(slugs)
+        return httpx.Response(200, content=json.dumps([{"slug": s} for s in slugs]))
+
+    client = _client_with(handler)
+    events = client.get_events_by_slugs(["a", "b", "c"])
+
+    assert sorted(calls) == [["a", "b"], ["c"]]
+    assert set(events) == {"a", "b", "c"}
+
+
+def test_get_events_by_slugs_marks_failed_chunks():
+    def handler(request: httpx.Request) -> httpx.Response:
+        slugs = request.url.params.get_list("slug")
+        if "c" in slugs:
+            return httpx.Response(503)
+        return httpx.Response(200, content=json.dumps([{"slug": "a"}]))
+
+    client = _client_with(handler)
+    events = client.get_events_by_slugs(["a", "b", "c"])
+
+    # "b" was looked up and is absent; "c"'s request failed.
+    assert events == {"a": {"slug": "a"}, "c": None}
+
+
+def test_get_events_by_slugs_treats_error_object_as_failure():
+    client = _client_with(
+        lambda request: httpx.Response(200, content=json.dumps({"error": "bad request"}))
+    )
+    assert client.get_events_by_slugs(["a", "b"]) == {"a": None, "b": None}
+
+
+def test_get_market_tokens_many():
+    event = {
+        "slug": "nba-bos-mia-2026-01-27",
+        "markets": [{
+            "question": "Celtics vs. Heat",
+            "slug": "nba-bos-mia-2026-01-27",
+            "clobTokenIds": '["t1", "t2"]',
+            "outcomes": '["Celtics", "Heat"]',
+        }],
+    }
+    client = _client_with(lambda request: httpx.Response(200, content=json.dumps([event])))
+
+    tokens = client.get_market_tokens_many(["nba-bos-mia-2026-01-27"])
+
+    assert [t["token_id"] for t in tokens["nba-bos-mia-2026-01-27"]] == ["t1", "t2"]
+    assert tokens["nba-bos-mia-2026-01-27"][1]["outcome"] == "Heat"
+
+
+def test_get_market_tokens_many_separates_misses_from_failures():
+    event = {
+        "slug": "nba-bos-mia-2026-01-27",
+        "markets": [{"slug": "nba-bos-mia-2026-01-27", "clobTokenIds": '["t1"]'}],
+    }
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        slugs = request.url.params.get_list("slug")
+        if "nba-down" in slugs:
+            return httpx.Response(500)
+        return httpx.Response(200, content=json.dumps(
+            [event] if event["slug"] in slugs else []
+        ))
+
+    client = _client_with(handler)
+    tokens = client.get_market_tokens_many(["nba-bos-mia-2026-01-27", "nba-nope", "nba-down"])
+
+    assert [t["token_id"] for t in tokens["nba-bos-mia-2026-01-27"]] == ["t1"]
+    assert tokens["nba-nope"] == []
+    assert "nba-down" not in tokens
+
+
+def test_iter_active_events_pages_until_short_page():
+    offsets = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        offset = int(request.url.params["offset"])
+        offsets.append(offset)
+        n = 2 if offset < 4 else 1
+        return httpx.Response(200, content=json.dumps(
+            [{"id": offset + i} for i in range(n)]
+        ))
+
+    client = GammaClient(GammaConfig(fetch_limit=2))
+    client._client = httpx.Client(transport=httpx.MockTransport(handler))
+
+    assert [e["id"] for e in client.iter_active_events()] == [0, 1, 2, 3, 4]
+    assert offsets == [0, 2, 4]
+
+
+def test_active_events_retry_after_429():
+    responses = [
+        httpx.Response(429, headers={"Retry-After": "0"}),
+        httpx.Response(200, content=json.dumps([{"id": 1}])),
+    ]
+    client = GammaClient(GammaConfig(fetch_limit=2))
+    client._client = httpx.Client(transport=httpx.MockTransport(lambda r: responses.pop(0)))
+
+    assert client.get_all_active_events() == [{"id": 1}]
+    assert responses == []
@@ -0,0 +1,172 @@
+"""Tests for the WebSocket price tracker."""
+from __future__ import annotations
+
+import threading
+import time
+
+from src.clients.websocket import AssetPriceTracker, PolyWebSocket
+from src.config import WebSocketConfig
+from src.shared.json_utils import loads
+
+
+def test_price_delta_uses_last_price_before_window():
+    tracker = AssetPriceTracker(window_seconds=300)
+    now = time.monotonic()
+    tracker.record("a", 0.40, timestamp=now - 340)
+    tracker.record("a", 0.45, timestamp=now - 320)
+    tracker.record("a", 0.50, timestamp=now - 100)
+    tracker.record("a", 0.58, timestamp=now - 1)
+
+    assert tracker.get_current_price("a") == 0.58
+    assert abs(tracker.get_price_delta("a") - 0.13) < 1e-9
+    assert abs(tracker.get_price_delta("a", lookback_seconds=60) - 0.08) < 1e-9
+
+
+def test_old_entries_are_evicted():
+    tracker = AssetPriceTracker(window_seconds=10)
+    now = time.monotonic()
+    tracker.record("a", 0.40, timestamp=now - 500)
+    tracker.record("a", 0.50, timestamp=now)
+
+    assert tracker.get_current_price("a") == 0.50
+    assert tracker.get_price_delta("a") is None
+    assert tracker.get_current_price("missing") is None
+
+
+def test_history_is_compacted_and_prices_clamped():
+    tracker = AssetPriceTracker(window_seconds=10)
+    now = time.monotonic()
+    for i in range(1000):
+        tracker.record("a", 0.5 + i / 10000, timestamp=now - 1000 + i)
+    tracker.record("a", 1.7, timestamp=now)
+
+    assert len(tracker._px["a"]) - tracker._head["a"] <= 71
+    assert len(tracker._px["a"]) < 1000
+    assert tracker.get_current_price("a") == 1.0
+    assert 0.40 < tracker.get_price_delta("a") < 0.41
+
+
+class _FakeWS:
+    def __init__(self):
+        self.sent = []
+
+    def send(self, msg):
+        self.sent.append(msg)
+
+
+def test_subscribe_sends_single_frame_and_splits_by_size():
+    ws = PolyWebSocket(WebSocketConfig(subscribe_max_bytes=200))
+    ws.ws = _FakeWS()
+
+    ws._send_subscribe(["a", "b", "c"])
+    assert [loads(m)["assets_ids"] for m in ws.ws.sent] == [["a", "b", "c"]]
+
+    ws.ws.sent.clear()
+    ids = [f"token-{i:04d}" for i in range(40)]
+    ws._send_subscribe(ids)
+    assert len(ws.ws.sent) > 1
+    assert all(len(m) <= 200 for m in ws.ws.sent)
+    assert [i for m in ws.ws.sent for i in loads(m)["assets_ids"]] == ids
+
+
+def test_on_open_resubscribes_once():
+    ws = PolyWebSocket()
+    ws._subscribed_assets = {"a"}
+    ws._pending_subscribe = {"b"}
+    fake = _FakeWS()
+    ws.ws = fake
+    ws._on_open(fake)
+
+    assert len(fake.sent) == 1
+    assert sorted(loads(fake.sent[0])["assets_ids"]) == ["a", "b"]
+    assert ws._subscribed_assets == {"a", "b"}
+    assert not ws._pending_subscribe
+
+
+def test_batch_price_changes_update_cache_and_stats():
+    ws = PolyWebSocket()
+    seen = []
+    ws.on_price_change(lambda aid, change: seen.append(aid))
+
+    ws._handle_batch_price_changes({"price_changes": [
+        {"asset_id": "a", "price": "0.5"},
+        {"asset_id": "b", "best_ask": "0.25"},
+        {"best_ask": "0.9"},
+        {"asset_id": "a", "price": "0.5"},
+    ]})
+
+    assert ws.get_cached_price("a") == 0.5
+    assert ws.get_cached_price("b") == 0.25
+    assert seen == ["a", "b", "a"]
+    assert ws.get_stats().price_updates == 3
+
+
+def test_subscribe_dedupes_and_unsubscribe_clears_pending():
+    ws = PolyWebSocket()
+    ws.subscribe(["a", "b", "a"])
+    ws.subscribe(["b", "c"])
+    assert ws._pending_subscribe == {"a", "b", "c"}
+
+    ws.unsubscribe(["b"])
+    assert ws._pending_subscribe == {"a", "c"}
+
+
+def test_reader_enqueues_and_drops_oldest_when_full():
+    ws = PolyWebSocket(WebSocketConfig(dispatch_queue_size=2))
+    for p in ("0.1", "0.2", "0.3"):
+        ws._on_message(None, '{"price_changes":[{"asset_id":"a","price":"%s"}]}' % p)
+
+    assert ws.get_stats().messages_received == 3
+    assert ws.get_stats().dropped_messages == 1
+    assert ws.queue_depth() == 2
+    assert ws.get_cached_price("a") is None
+
+    ws.stop()
+    ws._dispatch_loop()
+    assert ws.get_cached_price("a") == 0.3
+
+
+def test_stop_with_full_queue_ends_worker_and_restart_starts_a_new_one():
+    ws = PolyWebSocket(WebSocketConfig(dispatch_queue_size=2))
+    ws._run_loop = lambda: None
+    busy, release = threading.Event(), threading.Event()
+
+    def slow_callback(asset_id, data):
+        busy.set()
+        release.wait(2.0)
+
+    ws.on_price_change(slow_callback)
+    ws.run_forever(background=False)
+    old = ws._worker
+    frame = '{"price_changes":[{"asset_id":"a","price":"%s"}]}'
+    ws._on_message(None, frame % "0.1")
+    assert busy.wait(2.0)
+    for p in ("0.2", "0.3", "0.4"):
+        ws._on_message(None, frame % p)
+    assert ws.get_stats().dropped_messages == 1
+
+    ws.stop()
+    release.set()
+    ws.run_forever(background=False)
+    assert not old.is_alive()
+    assert ws._worker is not old and ws._worker.is_alive()
+    assert ws.get_cached_price("a") == 0.4
+
+    ws.stop()
+    ws._worker.join(2.0)
+    assert not ws._worker.is_alive()
+
+
+def test_refresh_subscriptions_sends_only_the_delta():
+    ws = PolyWebSocket()
+    ws._connected = True
+    ws.ws = _FakeWS()
+    ws._subscribed_assets = {"a", "b"}
+
+    assert ws.refresh_subscriptions({"a", "b"}) == ([], [])
+    assert ws.ws.sent == []
+
+    added, removed = ws.refresh_subscriptions({"a", "c"})
+    assert (added, removed) == (["c"], ["b"])
+    assert [loads(m)["assets_ids"] for m in ws.ws.sent] == [["c"], ["b"]]
+    assert ws._subscribed_assets == {"a", "c"}
@@ -1,12 +1,21 @@
 """Tests for DB repository modules."""
 from __future__ import annotations
 
+import sqlite3
+
+import pytest
+
+from src.db.connection import (
+    checkpoint, get_connection, get_read_connection, optimize, write_transaction,
+)
 from src.db.pinnacle_repo import PinnacleRepo
 from src.db.poly_repo import PolyRepo
 from src.db.triggers_repo import TriggersRepo
 from src.db.bot_trades_repo import BotTradesRepo
 from src.db.hi_res_repo import HiResRepo
 from src.db.game_mapping_repo import GameMappingRepo
+from src.db.baselines_repo import BaselinesRepo
+from src.db.paper_trades_repo import PaperTradesRepo
 
 
 class TestPinnacleRepo:
@@ -20,6 +29,17 @@ class TestPinnacleRepo:
         assert prev is not None
         assert prev[0] == 230.5  # total_line
 
+    def test_get_previous_many(self, mem_conn):
+        repo = PinnacleRepo(mem_conn)
+        repo.insert_snapshot("g1", "2026-01-01T00:00:00Z", 230.5, 1.95, 1.90, 0.513, 0.526)
+        repo.insert_snapshot("g1", "2026-01-01T01:00:00Z", 231.0, 1.88, 1.98, 0.532, 0.505)
+        repo.insert_snapshot("g2", "2026-01-01T00:00:00Z", 220.0, 1.95, 1.90, 0.513, 0.526)
+        repo.commit()
+
+        prevs = repo.get_previous_many(["g1", "g2", "g3"])
+        assert set(prevs) == {"g1"}
+        assert tuple(prevs["g1"]) == tuple(repo.get_previous("g1"))
+
     def test_duplicate_ignored(self, mem_conn):
         repo = PinnacleRepo(mem_conn)
         repo.insert_snapshot("g1", "2026-01-01T00:00:00Z", 230.5, 1.95, 1.90, 0.513, 0.526)
@@ -32,6 +52,19 @@ class TestPinnacleRepo:
         assert row[0] == 230.5  # original preserved
 
 
+    def test_insert_snapshots_batch(self, mem_conn):
+        repo = PinnacleRepo(mem_conn)
+        repo.insert_snapshots([
+            ("g1", "2026-01-01T00:00:00Z", 230.5, 1.95, 1.90, 0.513, 0.526),
+            ("g1", "2026-01-01T01:00:00Z", 231.0, 1.88, 1.98, 0.532, 0.505),
+            ("g1", "2026-01-01T01:00:00Z", 999.0, 1.0, 1.0, 0.5, 0.5),
+        ])
+        repo.commit()
+
+        count = mem_conn.execute("SELECT COUNT(*) FROM pinnacle_snapshots").fetchone()[0]
+        assert count == 2
+
+
 class TestPolyRepo:
     def test_insert_and_closest(self, mem_conn):
         repo = PolyRepo(mem_conn)
@@ -43,6 +76,27 @@ class TestPolyRepo:
         assert closest is not None
         assert closest[2] == 230.5
 
+    def test_closest_far_from_target(self, mem_conn):
+        repo = PolyRepo(mem_conn)
+        repo.insert_snapshot("g1", "slug-220pt5", "2026-01-01T00:00:00Z", 220.5, 0.52, 0.48)
+        repo.insert_snapshot("g1", "slug-240pt5", "2026-01-01T00:00:00Z", 240.5, 0.55, 0.45)
+        repo.commit()
+
+        closest = repo.get_closest_poly_snap("g1", 232.0)
+        assert closest is not None
+        assert closest[2] == 240.5
+
+    def test_closest_prefers_newest_snapshot_on_ties(self, mem_conn):
+        repo = PolyRepo(mem_conn)
+        repo.insert_snapshot("g1", "slug-230pt0", "2026-01-01T00:00:00Z", 230.0, 0.50, 0.50)
+        repo.insert_snapshot("g1", "slug-232pt0", "2026-01-01T00:01:00Z", 232.0, 0.40, 0.60)
+        repo.insert_snapshot("g1", "slug-232pt0", "2026-01-01T00:00:00Z", 232.0, 0.45, 0.55)
+        repo.commit()
+
+        assert repo.get_closest_poly_snap("g1", 231.0) == (0.40, 0.60, 232.0)
+        assert repo.get_closest_poly_snap("g1", 229.0) == (0.50, 0.50, 230.0)
+        assert repo.get_closest_poly_snap("g1", 231.0, market_type="spread") is None
+
 
 class TestTriggersRepo:
     def test_insert_and_close(self, mem_conn):
@@ -65,6 +119,47 @@ class TestTriggersRepo:
         assert len(open_triggers) == 0
 
 
+    def test_close_converged(self, mem_conn):
+        repo = TriggersRepo(mem_conn)
+        poly = PolyRepo(mem_conn)
+        for game_id in ("g1", "g2"):
+            repo.insert_trigger(
+                game_id, "2026-01-01T01:00:00Z", "line_move",
+                230.5, 0.5, 0.5, 232.0, 0.48, 0.52,
+                1.5, 0.02, 0.49, 0.51, 0.01, -0.01,
+            )
+        poly.insert_snapshot("g1", "g1-232pt5", "2026-01-01T01:01:00Z", 232.5, 0.49, 0.515)
+        poly.insert_snapshot("g1", "g1-240pt5", "2026-01-01T01:02:00Z", 240.5, 0.80, 0.20)
+        poly.insert_snapshot("g2", "g2-232pt0", "2026-01-01T01:01:00Z", 232.0, 0.55, 0.45)
+
+        closed = repo.close_converged("2026-01-01T01:05:00Z")
+        repo.commit()
+
+        assert closed == 1
+        row = mem_conn.execute(
+            "SELECT gap_closed_time, lag_seconds FROM triggers WHERE game_id = 'g1'"
+        ).fetchone()
+        assert row == ("2026-01-01T01:05:00Z", 300)
+        assert [r[1] for r in repo.get_open_triggers()] == ["g2"]
+
+    def test_close_converged_uses_latest_snapshot_at_closest_line(self, mem_conn):
+        repo = TriggersRepo(mem_conn)
+        poly = PolyRepo(mem_conn)
+        repo.insert_trigger(
+            "g1", "2026-01-01T01:00:00Z", "line_move",
+            230.5, 0.5, 0.5, 232.0, 0.48, 0.52,
+            1.5, 0.02, 0.49, 0.51, 0.01, -0.01,
+        )
+        # Converged earlier, then moved away again at the same line.
+        poly.insert_snapshot("g1", "g1-232pt0", "2026-01-01T01:01:00Z", 232.0, 0.48, 0.52)
+        poly.insert_snapshot("g1", "g1-232pt0", "2026-01-01T01:02:00Z", 232.0, 0.40, 0.60)
+
+        assert repo.close_converged("2026-01-01T01:05:00Z") == 0
+
+        poly.insert_snapshot("g1", "g1-232pt0", "2026-01-01T01:03:00Z", 232.0, 0.475, 0.525)
+        assert repo.close_converged("2026-01-01T01:05:00Z") == 1
+
+
 class TestBotTradesRepo:
     def test_insert(self, mem_conn):
         repo = BotTradesRepo(mem_conn)
@@ -77,6 +172,16 @@ class TestBotTradesRepo:
         count = mem_conn.execute("SELECT COUNT(*) FROM bot_trades").fetchone()[0]
         assert count == 1
 
+    def test_get_latest_trade_ts(self, mem_conn):
+        repo = BotTradesRepo(mem_conn)
+        assert repo.get_latest_trade_ts() is None
+
+        repo.insert_trades([
+            ("2026-01-01T00:05:00Z", "g1", "slug-1", "cond1", "Over", "BUY", 0.55, 10.0, "0x1"),
+            ("2026-01-01T00:01:00Z", "g1", "slug-1", "cond1", "Over", "BUY", 0.55, 10.0, "0x2"),
+        ])
+        assert repo.get_latest_trade_ts() == 1767225900
+
     def test_duplicate_tx_hash_ignored(self, mem_conn):
         repo = BotTradesRepo(mem_conn)
         repo.insert_trade(
@@ -92,6 +197,12 @@ class TestBotTradesRepo:
         count = mem_conn.execute("SELECT COUNT(*) FROM bot_trades").fetchone()[0]
         assert count == 1
 
+    def test_insert_trades_counts_new_rows(self, mem_conn):
+        repo = BotTradesRepo(mem_conn)
+        row = ("2026-01-01T00:00:00Z", "g1", "slug-1", "cond1", "Over", "BUY", 0.55, 10.0)
+        assert repo.insert_trades([row + ("0x1",)]) == 1
+        assert repo.insert_trades([row + ("0x1",), row + ("0x2",)]) == 1
+
 
 class TestHiResRepo:
     def test_insert_and_update(self, mem_conn):
@@ -110,6 +221,36 @@ class TestHiResRepo:
         assert len(events) == 1
         assert events[0]["gap_t0"] == 0.07
 
+    def test_batched_captures(self, mem_conn):
+        repo = HiResRepo(mem_conn)
+        ids = [
+            repo.insert_move_event(f"g{i}", "totals", 1700000000 + i, 0.50, 0.55, 0.05, 0.48, 0.07)
+            for i in range(2)
+        ]
+        repo.update_capture_many([
+            (ids[0], 3, 0.50, 0.05), (ids[1], 3, 0.52, 0.03), (ids[0], 10, 0.53, 0.02),
+        ])
+        repo.insert_gap_series_many([
+            (ids[0], 3, 0.50, 0.05, None, None, None),
+            (ids[1], 3, 0.52, 0.03, None, None, None),
+        ])
+        repo.commit()
+
+        events = {e["id"]: e for e in repo.load_all_events()}
+        assert events[ids[0]]["gap_t3s"] == 0.05
+        assert events[ids[0]]["gap_t10s"] == 0.02
+        assert events[ids[1]]["poly_t3s"] == 0.52
+        assert mem_conn.execute("SELECT COUNT(*) FROM gap_series_hi_res").fetchone()[0] == 2
+
+    def test_columnar(self, mem_conn):
+        repo = HiResRepo(mem_conn)
+        assert repo.load_all_events_columnar()["gap_t0"] == ()
+        repo.insert_move_event("g2", "totals", 1700000002, 0.50, 0.55, 0.05, 0.48, 0.07)
+        repo.insert_move_event("g1", "spreads", 1700000001, 0.50, 0.55, 0.05, 0.45, 0.10)
+        cols = repo.load_all_events_columnar()
+        assert cols["game_key"] == ("g1", "g2")
+        assert cols["gap_t0"] == (0.10, 0.07)
+
 
 class TestGameMappingRepo:
     def test_upsert_and_get(self, mem_conn):
@@ -128,3 +269,173 @@ class TestGameMappingRepo:
         slugs = repo.get_all_slugs()
         assert len(slugs) == 1
         assert slugs[0][0] == "g1"
+
+    def test_slug_cache_tracks_upserts(self, mem_conn):
+        repo = GameMappingRepo(mem_conn)
+        repo.upsert("g1", "Boston Celtics", "Miami Heat", "2026-01-27T23:00:00Z")
+        assert repo.get_slug_to_game_id_map() == {"nba-mia-bos-2026-01-27": "g1"}
+
+        repo.upsert("g2", "Unknown Team", "Miami Heat", "2026-01-27T23:00:00Z")
+        repo.upsert("g3", "Washington Wizards", "Portland Trail Blazers", "2026-01-27T00:00:00Z")
+        assert repo.get_slug("g2") is None
+        assert repo.get_slug("g3") == "nba-por-was-2026-01-26"
+        assert "" not in repo.get_slug_to_game_id_map()
+        assert sorted(repo.get_all_slugs()) == [
+            ("g1", "nba-mia-bos-2026-01-27"), ("g3", "nba-por-was-2026-01-26"),
+        ]
+
+    def test_slug_cache_loads_existing_rows(self, mem_conn):
+        GameMappingRepo(mem_conn).upsert(
+            "g1", "Boston Celtics", "Miami Heat", "2026-01-27T23:00:00Z",
+        )
+        repo = GameMappingRepo(mem_conn)
+        repo.warm()
+        assert repo.get_slug("g1") == "nba-mia-bos-2026-01-27"
+        assert repo.get_slug_to_game_id_map() == {"nba-mia-bos-2026-01-27": "g1"}
+
+    def test_upsert_keeps_row_inserted_elsewhere(self, mem_conn):
+        repo = GameMappingRepo(mem_conn)
+        repo.warm()
+        mem_conn.execute(
+            "INSERT INTO game_mapping (odds_api_id, home_team, away_team, commence_time, "
+            "poly_event_slug) VALUES ('g1', 'Boston Celtics', 'Miami Heat', "
+            "'2026-01-27T23:00:00Z', 'nba-mia-bos-custom')"
+        )
+        repo.upsert("g1", "Boston Celtics", "Miami Heat", "2026-01-27T23:00:00Z")
+        assert repo.get_slug("g1") == "nba-mia-bos-custom"
+
+    def test_mark_found_skips_already_found(self, mem_conn):
+        repo = GameMappingRepo(mem_conn)
+        repo.upsert("g1", "Boston Celtics", "Miami Heat", "2026-01-27T23:00:00Z")
+        repo.mark_found_many(["g1"])
+        mem_conn.execute("UPDATE game_mapping SET poly_event_found = 0")
+
+        repo.mark_found_many(["g1"])  # cached as found: no write
+        assert mem_conn.execute("SELECT poly_event_found FROM game_mapping").fetchone()[0] == 0
+
+        mem_conn.execute("UPDATE game_mapping SET poly_event_found = 1")
+        fresh = GameMappingRepo(mem_conn)
+        fresh.mark_found_many(["g1"])
+        assert "g1" in fresh._found_ids
+
+
+class TestBaselinesRepo:
+    def test_upsert_and_load(self, mem_conn):
+        repo = BaselinesRepo(mem_conn)
+        repo.upsert_many([("g1", 2, 230.75, 0.125)], "2026-01-01T00:00:00Z")
+        repo.upsert_many([("g1", 3, 231.0, 0.5)], "2026-01-01T01:00:00Z")
+        assert repo.load_all() == [("g1", 3, 231.0, 0.5)]
+
+    def test_delete_stale(self, mem_conn):
+        repo = BaselinesRepo(mem_conn)
+        repo.upsert_many([("old", 2, 230.0, 0.5)], "2026-01-01T00:00:00Z")
+        repo.upsert_many([("new", 2, 220.0, 0.5)], "2026-01-03T00:00:00Z")
+        assert repo.delete_stale("2026-01-02T00:00:00Z") == ["old"]
+        assert [row[0] for row in repo.load_all()] == ["new"]
+
+
+class TestPaperTradesRepo:
+    def test_stats_window(self, mem_conn):
+        repo = PaperTradesRepo(mem_conn)
+        recent = repo.open_position("g1", "totals", "Over", "oracle_move", 0.05, 0.50, 0.49)
+        old = repo.open_position("g2", "totals", "Under", "oracle_move", 0.05, 0.40, 0.39)
+        repo.close_position(recent, 0.55, 0.56)
+        repo.close_position(old, 0.45, 0.46)
+        mem_conn.execute(
+            "UPDATE paper_trades SET signal_time = strftime('%Y-%m-%dT%H:%M:%SZ', 'now', '-25 hours') "
+            "WHERE id = ?",
+            (old,),
+        )
+        assert repo.get_stats(hours=24)["total"] == 1
+        assert repo.get_stats(hours=48)["total"] == 2
+
+
+class TestGetConnection:
+    def test_schema_script_runs_only_when_stale(self, tmp_path):
+        db_path = tmp_path / "t.db"
+        conn = get_connection(db_path)
+        conn.execute("DROP INDEX idx_bot_trades_time")
+        conn.close()
+
+        def has_index(c):
+            return c.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'idx_bot_trades_time'"
+            ).fetchone() is not None
+
+        conn = get_connection(db_path)
+        assert not has_index(conn)  # version stamp current: script skipped
+        conn.execute("PRAGMA user_version = 0")
+        conn.close()
+
+        conn = get_connection(db_path)
+        assert has_index(conn)
+        conn.close()
+
+
+class TestOptimize:
+    def test_analyzes_tables_once_they_have_data(self, tmp_path):
+        conn = get_connection(tmp_path / "t.db")
+        repo = PinnacleRepo(conn)
+        for i in range(200):
+            repo.insert_snapshot(f"g{i % 10}", f"2026-01-01T00:00:{i:03d}Z", 230.5, 1.95, 1.90, 0.513, 0.526)
+        conn.commit()
+        repo.get_previous("g1")
+
+        optimize(conn)
+        tables = {r[0] for r in conn.execute("SELECT tbl FROM sqlite_stat1")}
+        assert "pinnacle_snapshots" in tables
+        conn.close()
+
+
+class TestCheckpoint:
+    def test_truncates_wal(self, tmp_path):
+        db_path = tmp_path / "t.db"
+        conn = get_connection(db_path)
+        BaselinesRepo(conn).upsert_many([("g1", 1, 230.0, 0.0)], "2026-01-01T00:00:00Z")
+        conn.commit()
+        wal = tmp_path / "t.db-wal"
+        assert wal.stat().st_size > 0
+        assert checkpoint(conn)
+        assert wal.stat().st_size == 0
+        conn.close()
+
+
+class TestWriteTransaction:
+    def test_commits_and_rolls_back(self, tmp_path):
+        conn = get_connection(tmp_path / "t.db")
+        repo = BaselinesRepo(conn)
+        with write_transaction(conn):
+            assert conn.in_transaction
+            repo.upsert_many([("g1", 1, 230.0, 0.0)], "2026-01-01T00:00:00Z")
+        assert not conn.in_transaction
+
+        with pytest.raises(RuntimeError):
+            with write_transaction(conn):
+                repo.upsert_many([("g2", 1, 220.0, 0.0)], "2026-01-01T00:00:00Z")
+                raise RuntimeError("boom")
+        assert [row[0] for row in repo.load_all()] == ["g1"]
+
+        # A transaction opened elsewhere on the connection is not joined.
+        repo.upsert_many([("g3", 1, 210.0, 0.0)], "2026-01-01T00:00:00Z")
+        with pytest.raises(sqlite3.OperationalError):
+            with write_transaction(conn):
+                pass
+        assert conn.in_transaction
+        conn.rollback()
+        conn.close()
+
+
+class TestReadConnection:
+    def test_sees_committed_rows_and_rejects_writes(self, tmp_path):
+        db_path = tmp_path / "t.db"
+        writer = get_connection(db_path)
+        GameMappingRepo(writer).upsert("g1", "Boston Celtics", "Miami Heat", "2026-01-27T23:00:00Z")
+        writer.commit()
+
+        reader = get_read_connection(db_path, rows=True)
+        row = reader.execute("SELECT odds_api_id FROM game_mapping").fetchone()
+        assert row["odds_api_id"] == "g1"
+        with pytest.raises(sqlite3.OperationalError):
+            reader.execute("DELETE FROM game_mapping")
+        reader.close()
+        writer.close()
@@ -39,8 +39,15 @@ def test_extract_total_line_none():
     assert extract_total_line("no line here") is None
 
 
+def test_extract_total_line_ignores_spread_pt():
+    # "pt" present but only a one-digit line: falls through to None.
+    assert extract_total_line("nba-spread-home-8pt5") is None
+
+
 def test_extract_spread_line():
     assert extract_spread_line("home-8pt5") == 8.5
+    assert extract_spread_line("spread -3.5") == 3.5
+    assert extract_spread_line("moneyline") == 0.0
 
 
 def test_make_poly_slug():
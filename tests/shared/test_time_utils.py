@@ -0,0 +1,45 @@
+"""Tests for shared time utilities."""
+from datetime import datetime, timezone
+
+from src.shared.time_utils import iso_utc_from_epoch, now_utc, parse_iso_utc
+
+
+def test_iso_utc_from_epoch_matches_strftime():
+    for ts in (0, 1709164800, 1769472000, 1769558399):
+        expected = datetime.fromtimestamp(ts, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        assert iso_utc_from_epoch(ts) == expected
+
+
+def test_now_utc_parses_back():
+    assert parse_iso_utc(now_utc()).tzinfo is not None
+
+
+def test_is_active_window_wraps_midnight(monkeypatch):
+    import src.shared.time_utils as tu
+
+    # 2026-01-27 is EST (UTC-5): 15:00 UTC = 10:00 ET, 08:00 UTC = 03:00 ET.
+    for utc_hour, expected in ((15, True), (4, True), (7, True), (8, False), (14, False)):
+        ts = datetime(2026, 1, 27, utc_hour, 0, tzinfo=timezone.utc).timestamp()
+        monkeypatch.setattr(tu.time, "time", lambda ts=ts: ts)
+        assert tu.is_active_window(10, 3) is expected
+
+
+def test_now_et_str_tracks_dst(monkeypatch):
+    import src.shared.time_utils as tu
+
+    summer = datetime(2026, 7, 1, 16, 30, 5, tzinfo=timezone.utc).timestamp()
+    monkeypatch.setattr(tu.time, "time", lambda: summer)
+    assert tu.now_et_str() == "12:30:05 ET"
+
+
+def test_seconds_until_active(monkeypatch):
+    import src.shared.time_utils as tu
+
+    # 2026-01-27 08:00 UTC = 03:00 ET (EST); 2026-07-01 13:59:30 UTC = 09:59:30 ET (EDT).
+    for ts, expected in (
+        (datetime(2026, 1, 27, 8, 0, tzinfo=timezone.utc).timestamp(), 7 * 3600),
+        (datetime(2026, 7, 1, 13, 59, 30, tzinfo=timezone.utc).timestamp(), 30),
+        (datetime(2026, 7, 1, 14, 0, tzinfo=timezone.utc).timestamp(), 86400),
+    ):
+        monkeypatch.setattr(tu.time, "time", lambda ts=ts: ts)
+        assert tu.seconds_until_active(10, 3) == expected
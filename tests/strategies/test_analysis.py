@@ -0,0 +1,57 @@
+"""Tests for the Forward Test v2 analysis helpers."""
+import pytest
+
+from src.strategies.lag.analysis import (
+    analyze_by_market,
+    analyze_by_trigger,
+    analyze_gap_decay,
+    analyze_gap_t3s,
+)
+
+
+def _event(gap_t3s, market_type="totals", trigger_source="oracle_move", decay=None):
+    gap_t0, gap_t10s, gap_t30s = decay or (None, None, None)
+    return {
+        "gap_t0": gap_t0, "gap_t3s": gap_t3s, "gap_t10s": gap_t10s, "gap_t30s": gap_t30s,
+        "market_type": market_type, "trigger_source": trigger_source,
+    }
+
+
+EVENTS = [
+    _event(0.05, decay=(0.10, 0.02, 0.01)),
+    _event(0.01, "spreads", decay=(0.05, 0.01, 0.00)),
+    _event(0.03, "spreads", "poly_anomaly"),
+    _event(None, "h2h", "poly_anomaly"),
+    _event(0.06, "other"),
+]
+
+
+def test_gap_t3s_stats():
+    a = analyze_gap_t3s(EVENTS)
+    assert a["n"] == 4
+    assert a["mean"] == pytest.approx(0.0375)
+    assert a["median"] == pytest.approx(0.04)
+    assert (a["min"], a["max"]) == (0.01, 0.06)
+    assert a["actionable_count"] == 2
+    assert a["verdict"].startswith("A:")
+    assert analyze_gap_t3s([_event(None)])["n"] == 0
+
+
+def test_group_breakdowns():
+    by_market = analyze_by_market(EVENTS)
+    assert list(by_market) == ["h2h", "totals", "spreads"]
+    assert by_market["h2h"]["n"] == 0
+    assert by_market["spreads"]["n"] == 2
+    assert by_market["spreads"]["mean"] == pytest.approx(0.02)
+
+    by_trigger = analyze_by_trigger(EVENTS)
+    assert {k: v["n"] for k, v in by_trigger.items()} == {"oracle_move": 3, "poly_anomaly": 1}
+
+
+def test_gap_decay():
+    d = analyze_gap_decay(EVENTS)
+    assert d["n"] == 2
+    assert d["mean_gap_t0"] == pytest.approx(0.075)
+    assert d["mean_gap_t3s"] == pytest.approx(0.03)
+    assert d["decay_t0_to_t3s"] == pytest.approx(0.6)
+    assert analyze_gap_decay([_event(0.05)]) == {"n": 0, "decay_rates": None}
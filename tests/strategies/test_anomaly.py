@@ -1,6 +1,6 @@
 """Tests for anomaly detection."""
 import time
-from src.strategies.lag.anomaly import AnomalyDetector, AnomalyConfig
+from src.strategies.lag.anomaly import AnomalyDetector, AnomalyConfig, TriggerManager
 
 
 def test_price_change_triggers_anomaly():
@@ -49,3 +49,35 @@ def test_pinnacle_cooldown():
     assert detector.should_call_pinnacle("g1") is True
     detector.mark_pinnacle_called("g1")
     assert detector.should_call_pinnacle("g1") is False
+
+
+def test_price_history_pruned_past_window():
+    detector = AnomalyDetector(AnomalyConfig(price_window_seconds=300))
+    for i in range(10):
+        detector.update_price("g1", "total", "Over", 0.50, timestamp=1000.0 + i * 100)
+    key = ("g1", "total", "Over")
+    # Ticks older than the window before the last tick (1900) have aged out.
+    assert list(detector._ts[key][detector._head[key]:]) == [1600.0, 1700.0, 1800.0, 1900.0]
+    assert detector._price_baseline[key] == (1500.0, 0.50)
+
+
+def test_price_change_compares_against_aged_out_tick():
+    detector = AnomalyDetector(AnomalyConfig(price_change_threshold=0.05, price_window_seconds=300))
+    detector.update_price("g1", "total", "Over", 0.50, timestamp=1000.0)
+    detector.update_price("g1", "total", "Over", 0.57, timestamp=1100.0)
+    event = detector.update_price("g1", "total", "Over", 0.58, timestamp=1350.0)
+    assert event is not None and event.details["old_price"] == 0.50
+
+    # A baseline more than 60s older than the window is ignored.
+    assert detector.update_price("g1", "total", "Over", 0.70, timestamp=3000.0) is None
+
+
+def test_callback_can_reenter_detector():
+    detector = AnomalyDetector(AnomalyConfig(bid_ask_spread_threshold=0.05))
+    calls = []
+    manager = TriggerManager(detector, pinnacle_callback=calls.append)
+    detector.on_anomaly(manager.process_anomaly)
+
+    assert detector.update_orderbook("g1", "total", "Over", 0.40, 0.50) is not None
+    assert calls == ["g1"]
+    assert detector.get_stats()["pinnacle_triggers"] == 1
@@ -0,0 +1,45 @@
+"""Tests for the Welford line baseline."""
+import statistics
+
+from src.strategies.lag.baseline import LineBaseline, WelfordState
+
+
+def test_welford_matches_statistics():
+    values = [230.5, 231.0, 229.5, 232.0, 230.0]
+    state = WelfordState()
+    for v in values:
+        state.update(v)
+    assert state.n == 5
+    assert abs(state.mean - statistics.mean(values)) < 1e-9
+    assert abs(state.std - statistics.stdev(values)) < 1e-9
+
+
+def test_outlier_needs_min_samples():
+    baseline = LineBaseline(min_samples=4)
+    for v in (230.0, 230.5, 230.0):
+        baseline.update("g1", v)
+    assert not baseline.is_outlier("g1", 240.0, k=3.0)
+
+    baseline.update("g1", 230.5)
+    assert baseline.is_outlier("g1", 240.0, k=3.0)
+    assert not baseline.is_outlier("g1", 230.5, k=3.0)
+
+
+def test_drain_dirty_resets_counter():
+    baseline = LineBaseline()
+    baseline.update("g1", 230.0)
+    baseline.update("g1", 231.0)
+    assert baseline.updates_since_flush == 2
+    rows = baseline.drain_dirty()
+    assert rows == [("g1", 2, 230.5, 0.5)]
+    assert baseline.updates_since_flush == 0
+    assert baseline.drain_dirty() == []
+
+
+def test_drop_keeps_unflushed_games():
+    baseline = LineBaseline(min_samples=1)
+    baseline.load([("g1", 2, 230.0, 0.5), ("g2", 2, 220.0, 0.5)])
+    baseline.update("g2", 221.0)
+    baseline.drop(["g1", "g2"])
+    assert [row[0] for row in baseline.drain_dirty()] == ["g2"]
+    assert not baseline.is_outlier("g1", 300.0, k=3.0)
@@ -0,0 +1,50 @@
+"""Tests for hi-res gap capture scheduling."""
+import threading
+
+import pytest
+
+from src.config import HiResConfig
+from src.db.hi_res_repo import HiResRepo
+from src.strategies.lag.hi_res import HiResCapture
+
+
+def test_captures_run_in_offset_order_on_one_worker(mem_conn):
+    capture = HiResCapture(HiResRepo(mem_conn), HiResConfig(offsets=(0.1, 0.05)))
+    capture.set_price_getter(lambda *a: 0.5)
+    done = threading.Event()
+    calls = []
+
+    def fake_capture(move_event_id, game_key, market_type, outcome, oracle_implied, offset_sec):
+        calls.append((move_event_id, offset_sec, threading.current_thread().name))
+        if len(calls) == 4:
+            done.set()
+
+    capture._capture_at_offset = fake_capture
+    threads_before = threading.active_count()
+    capture.schedule_captures(1, "g1", "totals", "Over", 0.55)
+    capture.schedule_captures(2, "g2", "totals", "Over", 0.55)
+    assert threading.active_count() == threads_before + 1
+
+    assert done.wait(2.0)
+    assert [(eid, off) for eid, off, _ in calls] == [(1, 0.05), (2, 0.05), (1, 0.1), (2, 0.1)]
+    assert {name for _, _, name in calls} == {"hi-res-captures"}
+    assert capture.get_stats()["captures_scheduled"] == 4
+
+
+def test_due_captures_written_in_one_flush(mem_conn):
+    repo = HiResRepo(mem_conn)
+    capture = HiResCapture(repo)
+    capture.set_price_getter(lambda *a: 0.50)
+    ids = [repo.insert_move_event(f"g{i}", "totals", 1700000000 + i, 0.5, 0.55, 0.05, 0.48, 0.07) for i in range(2)]
+    mem_conn.commit()
+
+    capture._capture_at_offset(ids[0], "g0", "totals", "Over", 0.55, 3)
+    capture._capture_at_offset(ids[1], "g1", "totals", "Over", 0.53, 3)
+    assert mem_conn.execute("SELECT COUNT(*) FROM gap_series_hi_res").fetchone()[0] == 0
+
+    capture._flush_captures()
+    events = {e["id"]: e for e in repo.load_all_events()}
+    assert events[ids[0]]["gap_t3s"] == pytest.approx(0.05)
+    assert events[ids[1]]["gap_t3s"] == pytest.approx(0.03)
+    assert mem_conn.execute("SELECT COUNT(*) FROM gap_series_hi_res").fetchone()[0] == 2
+    assert capture.get_stats()["captures_completed"] == 2
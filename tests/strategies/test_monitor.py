@@ -0,0 +1,129 @@
+"""Tests for the lag monitor: polling, move detection, DB upkeep and WS tokens."""
+import sqlite3
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.clients.websocket import PolyWebSocket
+from src.config import AppConfig, LagConfig, OddsAPIConfig
+from src.strategies.lag.monitor import LagMonitor, _forget_tokens, _wanted_tokens
+
+
+def _token(token_id, outcome):
+    return {"token_id": token_id, "market_type": "total",
+            "outcome": outcome, "market_slug": "nba-bos-mia-2026-01-27-total"}
+
+
+def test_refresh_drops_game_whose_markets_all_closed():
+    token_to_game = {"t1": "g1", "t2": "g1", "t3": "g2"}
+    token_to_info = {tid: {"game_id": gid} for tid, gid in token_to_game.items()}
+    outcome_tokens = {("g1", "total", "over"): "t1", ("g1", "total", "under"): "t2",
+                      ("g2", "total", "over"): "t3"}
+    ws = PolyWebSocket()
+    ws.subscribe(list(token_to_game))
+
+    def refresh(market_tokens):
+        wanted = _wanted_tokens(token_to_game, market_tokens)
+        _, removed = ws.refresh_subscriptions(wanted)
+        _forget_tokens(removed, token_to_game, token_to_info, outcome_tokens)
+        return sorted(removed)
+
+    # g1 loses one market; g2's lookup failed, so its token is kept.
+    assert refresh({"g1": [_token("t1", "Over")]}) == ["t2"]
+    assert ws._pending_subscribe == {"t1", "t3"}
+
+    # g1 has no open markets left; the unsubscribed t2 doesn't come back.
+    assert refresh({"g1": []}) == ["t1"]
+    assert ws._pending_subscribe == {"t3"}
+    assert token_to_game == {"t3": "g2"}
+    assert set(token_to_info) == {"t3"}
+    assert outcome_tokens == {("g2", "total", "over"): "t3"}
+
+
+def test_poly_window_parses_commence_times(tmp_path):
+    monitor = LagMonitor(AppConfig(odds=OddsAPIConfig(), db_path=tmp_path / "t.db"))
+    now = datetime.now(timezone.utc)
+    games = {
+        # Inside the window, not in now_utc's fixed-width "Z" format.
+        "soon": (now + timedelta(hours=1)).isoformat(timespec="microseconds"),
+        "started": (now - timedelta(hours=1)).isoformat(),
+        "next_week": (now + timedelta(days=7)).isoformat(),
+        # 8h ago, but its local digits read as 3h ago.
+        "finished": (now - timedelta(hours=8)).astimezone(timezone(timedelta(hours=5))).isoformat(),
+    }
+    teams = [("Boston Celtics", "Miami Heat"), ("Utah Jazz", "Denver Nuggets"),
+             ("Chicago Bulls", "Detroit Pistons"), ("Orlando Magic", "Atlanta Hawks")]
+    for (game_id, commence), (home, away) in zip(games.items(), teams):
+        monitor.game_repo.upsert(game_id, home, away, commence)
+    requested = []
+    monitor.gamma_client.get_events_by_slugs = lambda slugs: requested.extend(slugs) or {}
+
+    monitor._collect_polymarket(
+        [{"game_id": gid, "commence": commence} for gid, commence in games.items()]
+    )
+
+    slug_to_game = monitor.game_repo.get_slug_to_game_id_map()
+    assert sorted(slug_to_game[s] for s in requested) == ["soon", "started"]
+    monitor.close()
+
+
+def test_baseline_outlier_needs_a_line_change(tmp_path):
+    config = AppConfig(
+        odds=OddsAPIConfig(), db_path=tmp_path / "t.db",
+        lag=LagConfig(line_zscore_threshold=3.0, baseline_min_samples=3),
+    )
+    monitor = LagMonitor(config)
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    fired = []
+    for i, line in enumerate([220.5] * 30 + [221.0] * 4):
+        ts = (start + timedelta(minutes=i)).strftime("%Y-%m-%dT%H:%M:%SZ")
+        monitor.pin_repo.insert_snapshot("g1", ts, line, 1.9, 1.9, 0.5, 0.5)
+        game = {"game_id": "g1", "home": "H", "away": "A", "line": line,
+                "over_implied": 0.5, "under_implied": 0.5}
+        fired += [(i, t["delta_line"]) for t in monitor.detect_moves([game])]
+
+    # Unchanged polls never reach the baseline or fire a zero-delta trigger.
+    assert all(delta for _, delta in fired)
+    assert monitor.line_baseline._states["g1"].n == 2
+    monitor.close()
+
+
+def test_rolled_back_game_writes_leave_no_cached_state(tmp_path):
+    monitor = LagMonitor(AppConfig(odds=OddsAPIConfig(), db_path=tmp_path / "t.db"))
+    repo = monitor.game_repo
+    args = ("g1", "Boston Celtics", "Miami Heat", "2026-01-27T23:00:00Z")
+
+    with pytest.raises(RuntimeError):
+        with monitor._txn():
+            repo.upsert(*args)
+            raise RuntimeError("boom")
+    assert repo.get_slug("g1") is None
+    with monitor._txn():
+        repo.upsert(*args)
+    assert repo.get_slug("g1") == "nba-mia-bos-2026-01-27"
+
+    with pytest.raises(RuntimeError):
+        with monitor._batch():
+            with monitor._txn():
+                repo.mark_found_many(["g1"])
+            raise RuntimeError("boom")
+    with monitor._txn():
+        repo.mark_found_many(["g1"])
+    found = monitor.conn.execute(
+        "SELECT poly_event_found FROM game_mapping WHERE odds_api_id = 'g1'"
+    ).fetchone()
+    assert found == (1,)
+    monitor.close()
+
+
+def test_checkpoint_failure_does_not_escape(tmp_path, monkeypatch, capsys):
+    monitor = LagMonitor(AppConfig(odds=OddsAPIConfig(), db_path=tmp_path / "t.db"))
+
+    def locked(conn):
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr("src.strategies.lag.monitor.optimize", locked)
+    monitor._checkpoint()
+    assert "database is locked" in capsys.readouterr().out
+    monkeypatch.undo()
+    monitor.close()